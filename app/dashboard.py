@@ -1,6 +1,7 @@
 # app/dashboard.py
 
 import gradio as gr
+import os
 import json
 from datetime import datetime
 
@@ -22,9 +23,22 @@ except ImportError as e:
     print("Lütfen projenin bir paket olarak doğru kurulduğundan emin olun.")
     raise
 
+# --- 🧾 LLM Muhasebesi: bu dashboard sürecinin tüm LLM çağrıları tek oturumda, özet periyodik olarak diske ---
+from utils.llm_accounting import accounting_scope, get_accountant, DEFAULT_EXPORT_PATH
+
+DASHBOARD_SESSION = datetime.now().strftime("dashboard-%Y%m%d-%H%M%S")
+get_accountant().start_periodic_export(os.getenv("LLM_ACCOUNTING_EXPORT", DEFAULT_EXPORT_PATH),
+                                       float(os.getenv("LLM_ACCOUNTING_INTERVAL", "60")))
+
+# --- 🎯 Cevap Önbelleği: aynı komut + aynı çalışma alanı durumu -> kayıtlı cevap (ANSWER_CACHE=off ile kapatılır) ---
+# Yan etkili / zamana bağlı çağrılar (terminal, kod çalıştırma, saat, GPU) use_cache=False ile geçer
+from utils.answer_cache import cached_agent, flag_answer
+
 # --- Tek Seferlik GraphAgent Başlatma ---
 print("GraphAgent nesnesi oluşturuluyor...")
-graph_agent = GraphAgent()
+# Dosya yazan / kod çalıştıran adımlar içeren cevaplar saklanmaz - tekrar istenince gerçekten yeniden çalışsın
+graph_agent = cached_agent(GraphAgent(), namespace="dashboard-graph-agent",
+                           unsafe_tools={"python_executor", "file_creator"})
 print("GraphAgent akış şeması derleniyor...")
 # GraphAgent.__init__ içinde zaten build_graph() çağrılıyor, tekrar çağırmaya gerek yok
 print("GraphAgent tamamen hazır ve operasyonel.")
@@ -50,10 +64,14 @@ def run_agent_interaction(user_message: str, history: list, logs: str):
     try:
         # 3. GraphAgent'ı doğrudan çağır - tek satırda tüm işlem!
         print(f"GraphAgent'a gönderiliyor: {user_message}")
-        final_state = graph_agent.run(user_message)
+        with accounting_scope(session=DASHBOARD_SESSION, component="GraphAgent"):
+            final_state = graph_agent.run(user_message)
         
-        # 4. Ajanın nihai cevabını al ve eski formatta ekle
+        # 4. Ajanın nihai cevabını al ve eski formatta ekle (önbellekten geldiyse işaretli)
         agent_response = final_state.get('result', 'Ajan bir cevap üretemedi.')
+        cache_info = final_state.get('answer_cache') or {}
+        if cache_info.get('hit'):
+            agent_response = flag_answer(agent_response, cache_info)
         history[-1][1] = agent_response  # Son mesajın bot kısmını doldur
         
         # 5. Intermediate steps'i logla (GraphAgent'ın düşünce süreci)
@@ -124,7 +142,7 @@ def load_file_content(filename):
 
 def get_debug_logs():
     """Get current debug logs"""
-    return "🔧 Debug logs will appear here when agent runs..."
+    return "🔧 Debug logs will appear here when agent runs...\n" + get_accountant().summary_line(session=DASHBOARD_SESSION)
 
 def create_gpu_pod():
     """GPU Pod oluşturma fonksiyonu"""
@@ -190,8 +208,8 @@ def execute_terminal_command(command: str, current_output: str):
         # Add command to terminal
         new_output = current_output + f"atölyeşefi@workspace:~$ {command}\n"
         
-        # Execute via GraphAgent
-        result = graph_agent.run(command)
+        # Execute via GraphAgent (terminal komutu yan etkili - önbellek yok)
+        result = graph_agent.run(command, use_cache=False)
         final_result = result.get("result", "Command execution failed")
         
         new_output += f"{final_result}\n"
@@ -640,17 +658,23 @@ Kısa cevap ver."""
 
         # Use ChatGroq directly for simple chat (bypass GraphAgent code execution)
         try:
-            from langchain_groq import ChatGroq
             from config import settings
+            from utils.llm_cache import cached_llm
+            from utils.llm_scheduler import scheduled_llm
+            from utils.llm_registry import get_registry
             
-            chat_llm = ChatGroq(
+            # Önbellek sadece LLM_CACHE_MAX_TEMPERATURE>=0.7 ise devreye girer (demo tekrarları için)
+            # Havuzdaki istemci - her mesajda yeni ChatGroq/HTTP bağlantısı kurulmaz
+            chat_llm = cached_llm(scheduled_llm(get_registry().client(
+                "groq",
+                model=settings.AGENT_MODEL_NAME,
                 temperature=0.7,
-                model_name=settings.AGENT_MODEL_NAME,
-                groq_api_key=settings.GROQ_API_KEY,
+                api_key=settings.GROQ_API_KEY,
                 max_tokens=500
-            )
+            ), provider="groq"))
             
-            response = chat_llm.invoke(context_prompt)
+            with accounting_scope(session=DASHBOARD_SESSION, component="DashboardChat"):
+                response = chat_llm.invoke(context_prompt)
             ai_response = response.content.strip()
             
         except Exception as e:
@@ -766,10 +790,13 @@ Sadece düzeltilmiş Python kodunu döndür."""
     except Exception as e:
         return f"# AI Debug Error: {str(e)}\n{current_code}"
 
-def execute_quick_command(command: str):
-    """Quick command'ları GraphAgent ile çalıştırır"""
+def execute_quick_command(command: str, use_cache: bool = True):
+    """Quick command'ları GraphAgent ile çalıştırır - tekrarlanan komut önbellekten (🎯)"""
     try:
-        result = graph_agent.run(command)
+        result = graph_agent.run(command, use_cache=use_cache)
+        cache_info = result.get("answer_cache") or {}
+        if cache_info.get("hit"):
+            return flag_answer(result.get("result", "Sonuç alınamadı"), cache_info)
         return result.get("result", "Sonuç alınamadı")
     except Exception as e:
         return f"❌ **Hata:** {str(e)}"
@@ -784,15 +811,15 @@ def quick_calculate():
 
 def quick_current_time():
     """Şimdiki zamanı göster"""
-    return execute_quick_command("şimdiki zamanı göster")
+    return execute_quick_command("şimdiki zamanı göster", use_cache=False)
 
 def quick_gpu_environment():
     """GPU ortamı hazırla"""
-    return execute_quick_command("16GB VRAM'li GPU ortamı hazırla")
+    return execute_quick_command("16GB VRAM'li GPU ortamı hazırla", use_cache=False)
 
 def quick_gpu_status():
     """GPU durumu kontrol et"""
-    return execute_quick_command("GPU durumunu kontrol et")
+    return execute_quick_command("GPU durumunu kontrol et", use_cache=False)
 
 # --- VS Code-Style Workspace Functions ---
 # Global file storage for VS Code-like workspace
@@ -875,8 +902,8 @@ def execute_code_in_terminal(code: str, current_output: str, status_html: str):
         new_output += f"[{timestamp}] 🚀 Executing via Modal.com serverless...\n"
         new_output += "\n"
         
-        # Execute via GraphAgent
-        result = graph_agent.run(f"Bu Python kodunu çalıştır:\n```python\n{code}\n```")
+        # Execute via GraphAgent (kod çalıştırma yan etkili - önbellek yok)
+        result = graph_agent.run(f"Bu Python kodunu çalıştır:\n```python\n{code}\n```", use_cache=False)
         
         # Parse and format result
         final_result = result.get('result', 'Kod çalıştırılamadı.')
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+📦 BATCH RUNNER - JSONL Görev Dosyası için Toplu ReAct Çalıştırıcı
+Tek süreçte, sınırlı sayıda eşzamanlı ReactAgent oturumu ile görevleri çalıştırır;
+her sonuç biter bitmez çıktı JSONL'ine yazılır. Yarıda kalan bir parti aynı
+komutla yeniden başlatıldığında tamamlanmış görev kimlikleri atlanır.
+
+Kullanım:
+    python batch_runner.py gorevler.jsonl -o sonuclar.jsonl -c 4 --max-iterations 10
+    python batch_runner.py gorevler.jsonl --stub senaryo.jsonl --stub-latency 0.3   # ağsız benchmark
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from contextlib import nullcontext
+from typing import Dict, Any, List, Set
+
+from utils.stub_llm_server import StubLLMServer, add_behaviour_arguments, behaviour_from_args
+
+# Bu durumlar tamamlanmış sayılır - resume sırasında tekrar çalıştırılmaz ("error" yeniden denenir)
+DONE_STATUSES = {"completed", "incomplete"}
+
+
+def load_tasks(path: str) -> List[Dict[str, Any]]:
+    """
+    Görev dosyasını oku. Desteklenen alanlar:
+        kimlik: task_id | request_id | id   (yoksa satır numarası)
+        metin : task | prompt | title + body
+    """
+    tasks = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            task_id = str(record.get("task_id") or record.get("request_id") or record.get("id") or f"line-{line_number}")
+            text = record.get("task") or record.get("prompt")
+            if not text:
+                text = "\n\n".join(part for part in (record.get("title"), record.get("body")) if part)
+            if not text:
+                print(f"⚠️ Satır {line_number}: görev metni yok, atlanıyor")
+                continue
+            tasks.append({"task_id": task_id, "task": text})
+    return tasks
+
+
+def load_done_ids(output_path: str) -> Set[str]:
+    """Çıktı dosyasında tamamlanmış görünen görev kimlikleri (yarım son satır yok sayılır)"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") in DONE_STATUSES:
+                done.add(record.get("task_id"))
+    return done
+
+
+def task_status(result: str) -> str:
+    """Döngü sonucundan durum: completed | incomplete | error"""
+    from core_agent_react import MAX_ITERATIONS_MESSAGE, API_ERROR_ANSWER, TASK_STOPPED_MESSAGE
+
+    if result == MAX_ITERATIONS_MESSAGE or TASK_STOPPED_MESSAGE in result:
+        return "incomplete"
+    if API_ERROR_ANSWER in result:
+        return "error"
+    return "completed"
+
+
+async def run_batch(tasks_path: str, output_path: str, concurrency: int = 4, max_iterations: int = 10,
+                    agent_options: Dict[str, Any] = None) -> Dict[str, int]:
+    """
+    Görevleri çalıştır ve sonuçları output_path'e akıt.
+
+    Returns:
+        {"total", "skipped", "completed", "incomplete", "error"}
+    """
+    from core_agent_react import ReactAgent
+    from utils.llm_scheduler import get_scheduler, PRIORITY_BATCH
+    from utils.llm_accounting import accounting_scope, get_accountant, DEFAULT_EXPORT_PATH
+    from utils.answer_cache import get_answer_cache
+
+    tasks = load_tasks(tasks_path)
+    done_ids = load_done_ids(output_path)
+    pending = [task for task in tasks if task["task_id"] not in done_ids]
+    summary = {"total": len(tasks), "skipped": len(tasks) - len(pending), "completed": 0, "incomplete": 0, "error": 0}
+
+    print(f"📦 {len(tasks)} görev bulundu, {summary['skipped']} tanesi zaten tamamlanmış, "
+          f"{len(pending)} görev {concurrency} eşzamanlı oturumla çalışacak")
+    if not pending:
+        return summary
+
+    # Toplu görevler etkileşimli sohbetin arkasında sıraya girer (🚦 planlayıcı önceliği)
+    agent = ReactAgent(**{"priority": PRIORITY_BATCH, **(agent_options or {})})
+    semaphore = asyncio.Semaphore(concurrency)
+    # 🧾 Bu partinin tüm LLM çağrıları tek oturumda, görev kimliğiyle etiketlenir
+    session = f"batch-{os.path.splitext(os.path.basename(tasks_path))[0]}-{time.strftime('%Y%m%d-%H%M%S')}"
+    write_lock = asyncio.Lock()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    async def write_record(record: Dict[str, Any]):
+        async with write_lock:
+            with open(output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    async def run_one(task: Dict[str, Any]):
+        async with semaphore:
+            started_at = time.time()
+            start = time.perf_counter()
+            record = {"task_id": task["task_id"], "started_at": started_at}
+            try:
+                with accounting_scope(session=session, task=task["task_id"]):
+                    result, report = await agent.arun_react_loop(task["task"], max_iterations=max_iterations,
+                                                                 return_report=True)
+                tool_runs = report["tool_runs"]
+                record.update(status=task_status(result), result=result, iterations=report["iterations"],
+                              checkpoint_id=report["task_id"], phases=report["phases"],
+                              tool_runs={key: tool_runs[key] for key in ("finished", "cancelled", "timed_out")},
+                              answer_cache=report["answer_cache"])
+            except Exception as e:
+                record.update(status="error", error=f"{type(e).__name__}: {e}", iterations=None)
+            record["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            usage = get_accountant().totals(session=session, task=task["task_id"])
+            record["llm"] = {key: usage[key] for key in ("calls", "prompt_tokens", "completion_tokens",
+                                                         "retries", "errors", "latency_total_ms")}
+            record["finished_at"] = time.time()
+            summary[record["status"]] += 1
+            await write_record(record)
+            cached = " 🎯 (önbellekten)" if (record.get("answer_cache") or {}).get("hit") else ""
+            print(f"📦 [{task['task_id']}] {record['status']} - {record['latency_ms']:.0f} ms{cached}")
+
+    try:
+        await asyncio.gather(*(run_one(task) for task in pending))
+    finally:
+        agent.close()
+        print(get_scheduler().report())
+        print(get_answer_cache().report())
+        accountant = get_accountant()
+        print(accountant.summary_line(session=session))
+        for component, usage in accountant.query(("component", "provider"), session=session).items():
+            print(f"🧾   {component}: {usage['calls']} çağrı, {usage['total_tokens']} token, "
+                  f"p50 {usage['latency_p50_ms']:.0f} ms")
+        accountant.export(DEFAULT_EXPORT_PATH)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL görev dosyasını ReactAgent ile toplu çalıştır")
+    parser.add_argument("tasks", help="Görev dosyası (JSONL)")
+    parser.add_argument("-o", "--output", default=os.path.join("logs", "batch_results.jsonl"),
+                        help="Sonuç dosyası (JSONL, ekleme modunda yazılır)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Eşzamanlı görev sayısı")
+    parser.add_argument("--max-iterations", type=int, default=10, help="Görev başına maksimum adım")
+    parser.add_argument("--native-tools", action="store_true", help="Yerel function-calling modu")
+    parser.add_argument("--task-timeout", type=float, default=None,
+                        help="Görev başına süre bütçesi (sn) - dolunca araçlar durdurulur")
+    parser.add_argument("--tools", default=None,
+                        help="Virgülle ayrılmış etkin araçlar - sistem prompt'u yalnızca bunları anlatır (varsayılan: hepsi)")
+    parser.add_argument("--system-prompt-budget", type=int, default=None,
+                        help="Sistem prompt'u token bütçesi - aşılırsa örnek bölümleri çıkarılır")
+    parser.add_argument("--no-answer-cache", action="store_true",
+                        help="Tekrarlanan görevler için kayıtlı final cevabı kullanma (her görev çalışsın)")
+    parser.add_argument("--stub", nargs="?", const="", default=None, metavar="SENARYO",
+                        help="🧪 Yerel stub LLM sunucusuna karşı çalış (isteğe bağlı senaryo JSONL)")
+    add_behaviour_arguments(parser, prefix="stub-")
+    args = parser.parse_args()
+
+    stub = (StubLLMServer(behaviour_from_args(args, args.stub or None, prefix="stub-"))
+            if args.stub is not None else nullcontext())
+    start = time.perf_counter()
+    with stub:
+        if args.stub is not None:
+            print(f"🧪 Stub LLM sunucusu: {stub.url}")
+        summary = asyncio.run(run_batch(args.tasks, args.output, concurrency=args.concurrency,
+                                        max_iterations=args.max_iterations,
+                                        agent_options={"use_native_tools": args.native_tools,
+                                                       "task_timeout": args.task_timeout,
+                                                       "enabled_tools": args.tools.split(",") if args.tools else None,
+                                                       "system_prompt_budget": args.system_prompt_budget,
+                                                       # Benchmark her seferinde sunucuya gitsin
+                                                       "llm_cache": args.stub is None,
+                                                       "answer_cache": args.stub is None and not args.no_answer_cache}))
+    elapsed = time.perf_counter() - start
+    executed = summary["total"] - summary["skipped"]
+    print(f"\n📊 Parti özeti: {summary}")
+    print(f"⏱️ Toplam süre {elapsed:.2f} sn ({executed / elapsed:.2f} görev/sn)")
+    if args.stub is not None:
+        print(f"🧪 Stub sunucu: {json.dumps(stub.behaviour.report(), ensure_ascii=False)}")
+    return 0 if summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,49 +6,38 @@ Basit, kırılmaz, şeffaf. Sadece bir işi mükemmel yapar.
 PRENSIP: Her adım görünür, her hata açık, hiçbir abartı yok.
 """
 
-import os
 import sys
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
-# 1. ADIM: Kırılmaz LLM Bağlantısı
+# 1. ADIM: Kırılmaz LLM Bağlantısı (lazy - import sırasında ağ çağrısı yok)
+from utils.lazy_llm import LazyLLM
+from utils.llm_cache import cached_llm, get_llm_cache
+from utils.llm_registry import get_registry
+from utils.llm_scheduler import scheduled_llm, get_scheduler
+
 print("🌱 Core Agent başlatılıyor...")
-print("1️⃣ LLM bağlantısı test ediliyor...")
+print("1️⃣ LLM istemcisi hazırlanıyor (ilk kullanımda bağlanacak)...")
 
 try:
-    from langchain_groq import ChatGroq
     from langchain_core.tools import tool
     from langchain_core.messages import HumanMessage
     from dotenv import load_dotenv
     
     load_dotenv()
     
-    # API key kontrolü
-    groq_api_key = os.getenv('GROQ_API_KEY')
-    if not groq_api_key:
-        print("❌ GROQ_API_KEY bulunamadı!")
-        print("💡 .env dosyasında GROQ_API_KEY=your_key_here ekleyin")
-        sys.exit(1)
-    
-    # LLM'i başlat
-    llm = ChatGroq(
-        model="llama3-70b-8192",
-        temperature=0.1,
-        groq_api_key=groq_api_key
-    )
-    
-    # Test et
-    test_response = llm.invoke([HumanMessage(content="merhaba")])
-    print("✅ LLM bağlantısı başarılı!")
-    
 except ImportError as e:
     print(f"❌ Kütüphane eksik: {e}")
     print("💡 Kurun: pip install langchain-groq python-dotenv")
     sys.exit(1)
-except Exception as e:
-    print(f"❌ LLM bağlantı hatası: {e}")
-    print("💡 API anahtarınızı kontrol edin")
-    sys.exit(1)
+
+
+# Aynı prompt tekrarlanırsa cevap önbellekten gelir (🗄️ LLM_CACHE=off ile kapatılır)
+# 🚦 Önbellek kaçırırsa istek süreç geneli planlayıcıdan (hız sınırı kovaları) geçer
+# 🏊 İstemci süreç genelindeki havuzdan gelir (ilk çağrıda bir kez oluşturulur, bağlantılar paylaşılır)
+llm = cached_llm(scheduled_llm(get_registry().client("groq", model="llama3-70b-8192", temperature=0.1,
+                                                     name="core-llm"), provider="groq"))
+print("✅ LLM istemcisi hazır (lazy)")
 
 # 2. ADIM: İki Profesyonel Araç Tanımla  
 print("2️⃣ Araçlar tanımlanıyor...")
@@ -209,7 +198,8 @@ print("3️⃣ LLM'e araç bağlanıyor...")
 try:
     # İki aracı LLM'e bağla
     tools = [list_files_recursive, get_git_status]
-    llm_with_tools = llm.bind_tools(tools)
+    # bind_tools da ilk kullanıma kadar ertelenir
+    llm_with_tools = LazyLLM(lambda: llm.bind_tools(tools), name="core-llm-tools")
     print("✅ Araçlar başarıyla bağlandı!")
 except Exception as e:
     print(f"❌ Araç bağlama hatası: {e}")
@@ -363,7 +353,16 @@ def main():
     """
     show_welcome()
     
+    # --no-llm-cache: her prompt için modeli gerçekten çağır (önbellek bypass)
+    if "--no-llm-cache" in sys.argv:
+        get_llm_cache().enabled = False
+    
+    # Kullanıcı yazarken bağlantıyı arka planda ısıt (--no-warmup ile kapatılabilir)
+    if "--no-warmup" not in sys.argv:
+        llm.warm_up(background=True)
+    
     print("\n🚀 Core Agent hazır!")
+    print(f"⏱️ İlk prompt'a kadar geçen süre: {llm.mark_first_prompt():.0f} ms")
     
     while True:
         try:
@@ -391,6 +390,10 @@ def main():
         except Exception as e:
             print(f"\n❌ Beklenmeyen hata: {e}")
             print("🔄 Devam ediyor...")
+    
+    print(get_llm_cache().report())
+    print(get_scheduler().report())
+    print(get_registry().summary_line())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
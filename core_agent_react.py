@@ -9,47 +9,42 @@ import sys
 import json
 import re
 import time
+import asyncio
+import threading
+import contextvars
+from contextlib import nullcontext
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
-# 1. ADIM: Kırılmaz LLM Bağlantısı
+# 1. ADIM: Kırılmaz LLM Bağlantısı (lazy - import sırasında ağ çağrısı yok)
+from utils.lazy_llm import LazyLLM
+from utils.llm_cache import cached_llm, get_llm_cache
+from utils.llm_registry import get_registry
+from utils.llm_scheduler import (scheduled_llm, get_scheduler, request_priority, backoff_delay,
+                                 retry_after_seconds, PRIORITY_INTERACTIVE)
+
 print("🧠 Core Agent ReAct başlatılıyor...")
-print("1️⃣ LLM bağlantısı test ediliyor...")
+print("1️⃣ LLM istemcisi hazırlanıyor (ilk kullanımda bağlanacak)...")
 
 try:
-    from langchain_groq import ChatGroq
     from langchain_core.tools import tool
-    from langchain_core.messages import HumanMessage, SystemMessage
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
     from dotenv import load_dotenv
     
     load_dotenv()
     
-    # API key kontrolü
-    groq_api_key = os.getenv('GROQ_API_KEY')
-    if not groq_api_key:
-        print("❌ GROQ_API_KEY bulunamadı!")
-        print("💡 .env dosyasında GROQ_API_KEY=your_key_here ekleyin")
-        sys.exit(1)
-    
-    # LLM'i başlat
-    llm = ChatGroq(
-        model="llama3-70b-8192",
-        temperature=0.1,
-        groq_api_key=groq_api_key
-    )
-    
-    # Test et
-    test_response = llm.invoke([HumanMessage(content="test")])
-    print("✅ LLM bağlantısı başarılı!")
-    
 except ImportError as e:
     print(f"❌ Kütüphane eksik: {e}")
     print("💡 Kurun: pip install langchain-groq python-dotenv")
     sys.exit(1)
-except Exception as e:
-    print(f"❌ LLM bağlantı hatası: {e}")
-    print("💡 API anahtarınızı kontrol edin")
-    sys.exit(1)
+
+
+# Aynı prompt tekrarlanırsa cevap önbellekten gelir (🗄️ LLM_CACHE=off ile kapatılır)
+# 🚦 Önbellek kaçırırsa istek süreç geneli planlayıcıdan (hız sınırı kovaları) geçer
+# 🏊 İstemci süreç genelindeki havuzdan gelir (ilk çağrıda bir kez oluşturulur, bağlantılar paylaşılır)
+llm = cached_llm(scheduled_llm(get_registry().client("groq", model="llama3-70b-8192", temperature=0.1,
+                                                     name="react-llm"), provider="groq"))
+print("✅ LLM istemcisi hazır (lazy)")
 
 # 2. ADIM: Profesyonel Araçları Tanımla
 print("2️⃣ Araçlar tanımlanıyor...")
@@ -59,6 +54,53 @@ from tools.code_intelligence import get_file_imports
 from tools.code_quality import analyze_code_quality
 from tools.secure_executor import run_code_in_sandbox
 from tools.git_operations_simple import git_create_branch, git_commit_changes
+from utils.python_worker import PersistentPythonWorker
+from utils.history_manager import MessageHistoryManager
+from utils.stream_parser import StreamingActionParser
+from utils.tool_cache import ToolResultCache
+from utils.checkpoint import TaskCheckpoint, DEFAULT_CHECKPOINT_DIR, new_task_id
+from utils.stall_detector import StallDetector
+from utils.prefetcher import ToolPredictor
+from utils.tracing import TaskTrace, DEFAULT_TRACE_PATH, maybe_span
+from utils.observation_store import ObservationStore
+from utils.deadline import Deadline, ToolCancelled, use_deadline, current_deadline, budget
+from utils.llm_accounting import accounting_scope, current_scope
+from utils.prompt_builder import PromptSection, SystemPromptBuilder
+from utils.answer_cache import get_answer_cache, flag_answer
+
+# Büyük araç çıktıları için içerik-adresli depo (read_observation aracı ve ReactAgent paylaşır)
+observation_store = ObservationStore()
+
+def _scan_files(directory_path: str = ".") -> Optional[list]:
+    """Dizindeki tüm dosyaların sıralı göreli yolları - dizin yoksa None"""
+    target_path = Path(directory_path)
+    if not target_path.exists():
+        return None
+    
+    files = []
+    for file_path in target_path.rglob("*"):
+        if file_path.is_file():
+            relative_path = file_path.relative_to(target_path)
+            files.append(str(relative_path))
+    return sorted(files)
+
+def _format_file_list(directory_path: str, files: Optional[list], limit: Optional[int] = 20) -> str:
+    """list_files_recursive gözlem metni - ilk `limit` dosya (None: tamamı, büyükse gözlem deposu kısaltır)"""
+    if files is None:
+        return f"❌ Dizin bulunamadı: {directory_path}"
+    
+    if not files:
+        return f"📁 Dizin boş: {directory_path}"
+    
+    shown = files if limit is None else files[:limit]
+    result = f"📁 {directory_path} dizinindeki dosyalar ({len(files)} adet):\n"
+    for file in shown:
+        result += f"  📄 {file}\n"
+    
+    if len(files) > len(shown):
+        result += f"  ... ve {len(files) - len(shown)} dosya daha\n"
+    
+    return result
 
 @tool
 def list_files_recursive(directory_path: str = ".") -> str:
@@ -66,27 +108,7 @@ def list_files_recursive(directory_path: str = ".") -> str:
     Verilen dizindeki tüm dosyaları recursive olarak listeler.
     """
     try:
-        target_path = Path(directory_path)
-        if not target_path.exists():
-            return f"❌ Dizin bulunamadı: {directory_path}"
-        
-        files = []
-        for file_path in target_path.rglob("*"):
-            if file_path.is_file():
-                relative_path = file_path.relative_to(target_path)
-                files.append(str(relative_path))
-        
-        if not files:
-            return f"📁 Dizin boş: {directory_path}"
-        
-        result = f"📁 {directory_path} dizinindeki dosyalar ({len(files)} adet):\n"
-        for file in sorted(files)[:20]:  # İlk 20 dosya
-            result += f"  📄 {file}\n"
-        
-        if len(files) > 20:
-            result += f"  ... ve {len(files) - 20} dosya daha\n"
-        
-        return result
+        return _format_file_list(directory_path, _scan_files(directory_path))
         
     except Exception as e:
         return f"❌ Dosya listeleme hatası: {e}"
@@ -218,27 +240,68 @@ def execute_local_python(code: str) -> str:
     return "Bu araç execute_tool metodunda handle ediliyor"
 
 # 5. ADIM: Final Answer Aracı (ReAct Döngüsünü Sonlandırmak İçin)
+@tool
+def read_observation(handle: str, start_line: int = 1, end_line: int = 80) -> str:
+    """
+    Diske alınmış büyük bir gözlemin (handle=obs_...) belirtilen satır aralığını döndürür.
+    """
+    try:
+        start_line = int(start_line)
+        end_line = int(end_line)
+        # Tek okumada en fazla 200 satır - okunan aralık da prompt'u şişirmesin
+        end_line = min(end_line, start_line + 199)
+        return observation_store.read_lines(handle, start_line, end_line)
+    except FileNotFoundError:
+        return f"❌ Gözlem bulunamadı: {handle}"
+    except ValueError as e:
+        return f"❌ {e}"
+
+FINAL_ANSWER_PREFIX = "✅ GÖREV TAMAMLANDI: "
+
 @tool
 def final_answer(answer: str) -> str:
     """
     Görev tamamlandığında final cevabı döndürür.
     """
-    return f"✅ GÖREV TAMAMLANDI: {answer}"
+    return f"{FINAL_ANSWER_PREFIX}{answer}"
 
 # Araçları listele
-tools = [list_files_recursive, get_git_status, get_file_imports, analyze_code_quality, run_code_in_sandbox, git_create_branch, git_commit_changes, write_file, execute_local_python, final_answer]
+tools = [list_files_recursive, get_git_status, get_file_imports, analyze_code_quality, run_code_in_sandbox, git_create_branch, git_commit_changes, write_file, execute_local_python, read_observation, final_answer]
 tool_names = [tool.name for tool in tools]
 
+# Yan etkisiz okuma araçları - aynı adımda paralel çalışabilir.
+# write_file, git_commit_changes vb. her zaman sırayla (tek başına) çalışır.
+PARALLEL_SAFE_TOOLS = {"list_files_recursive", "get_git_status", "get_file_imports", "analyze_code_quality", "read_observation"}
+
+# Okuma araçlarının sonuçları görev içinde önbelleklenir (♻️);
+# bu araçlardan biri çalışınca dosya sistemi değişmiş sayılır ve önbellek temizlenir.
+MEMOIZABLE_TOOLS = PARALLEL_SAFE_TOOLS
+FS_MUTATING_TOOLS = {"write_file", "git_commit_changes", "git_create_branch", "execute_local_python"}
+
+# 🎯 Bu araçlardan birini kullanan görevin final cevabı önbelleğe yazılmaz: cevabı tekrar vermek
+# yan etkiyi (commit, dal) tekrarlamaz, kod çıktısı da zamana/rastgeleliğe bağlı olabilir.
+# write_file sorun değil - kayıt görev sonrası çalışma alanı durumuyla anahtarlanır.
+ANSWER_UNCACHEABLE_TOOLS = {"git_commit_changes", "git_create_branch", "execute_local_python", "run_code_in_sandbox"}
+
+# Bu araçların gözlemleri diske alınmaz (read_observation zaten sınırlı aralık döndürür)
+UNSPILLED_TOOLS = {"read_observation", "final_answer"}
+
 print("✅ Araçlar hazır:", tool_names)
 
 # 4. ADIM: YENİ SİSTEM PROMPT'U - ReAct Architecture
-REACT_SYSTEM_PROMPT = """🏆 ALTIN KURAL #1 (EN ÖNEMLİ): HER ŞEY SİCİLE GEÇMELİ - MUTLAK!
+# Prompt bölümlere ayrıldı: yerel function-calling modunda JSON format kuralları gönderilmez.
+# 🧩 Bölümler araçlara bağlıdır - ajan yalnızca etkin araçlarının bölümlerini (bütçe içinde) gönderir.
+# Temel kurallar (her iki modda ortak)
+_PROMPT_CORE_RULES = """🏆 ALTIN KURAL #1 (EN ÖNEMLİ): HER ŞEY SİCİLE GEÇMELİ - MUTLAK!
 Herhangi bir araçtan (Gözlem) veri aldığında, bu veriyi MUTLAKA hafızaya (scratchpad) kaydet. Tüm sonuçlar, dosya listeleri, git durumları, analizler scratchpad'de saklanmalıdır. Sonraki adımlarda bu verileri kullanarak işlem yap.
 
 🏆 ALTIN KURAL #2: TÜM CEVAPLARIN TÜRKÇE OLMALI - MUTLAK!
 'Thought' adımların dahil, tüm düşünce sürecin ve nihai cevapların MUTLAKA Türkçe olmalıdır. Bu kuralı asla ihlal etme. İngilizce düşünme yasak!
 
-🏆 ALTIN KURAL #3 (KRİTİK): FINAL ANSWER JSON KURALI - MUTLAK!
+"""
+
+# Metin-JSON modu: final_answer JSON kuralları
+_PROMPT_FINAL_ANSWER_JSON_RULES = """🏆 ALTIN KURAL #3 (KRİTİK): FINAL ANSWER JSON KURALI - MUTLAK!
 Görevi başarıyla tamamladığında 'final_answer' aracını kullanmalısın. Bu aracı kullanırken 'answer' alanının içeriği, **kesinlikle** tek bir metin bloğu (string) olmalıdır. Metni oluştururken Python'daki gibi `+` operatörleri veya başka birleştirme yöntemleri KULLANMA. Tüm metni, Markdown formatında, tek bir seferde oluştur.
 
 **DOĞRU KULLANIM ÖRNEĞİ:**
@@ -274,27 +337,42 @@ Görevi başarıyla tamamladığında 'final_answer' aracını kullanmalısın.
 
 **ÖNEMLİ:** Final Answer'daki "answer" değeri tek satırda, tüm line break'ler `\\n` ile escape edilmiş şekilde yazılmalıdır.
 
-**SCRATCHPAD HAFIZA SİSTEMİ:**
+"""
+
+# Hafıza anahtarları (ortak)
+_PROMPT_SCRATCHPAD_KEYS = """**SCRATCHPAD HAFIZA SİSTEMİ:**
 - `scratchpad['last_file_list']` - Son dosya listesi (list_files_recursive'den)
 - `scratchpad['last_git_status']` - Son git durumu (get_git_status'dan)  
 - `scratchpad['last_code_quality']` - Son kod kalitesi analizi
 - `scratchpad['last_file_imports']` - Son bağımlılık analizi
 - `scratchpad['project_files']` - Proje dosyalarının tam listesi
+- `scratchpad['observation_files']` - Diske alınan büyük gözlemlerin dosya yolları (handle -> yol)
+
+"""
 
-Sen, 'Atolye Şefi' adında uzman bir AI mühendisisin. Karmaşık görevleri çözmek için ÖNCE adım adım bir plan oluşturursun, sonra bu planı uygularsın.
+# Ajan kimliği - ardından etkin araçların listesi gelir (ortak)
+_PROMPT_IDENTITY = """Sen, 'Atolye Şefi' adında uzman bir AI mühendisisin. Karmaşık görevleri çözmek için ÖNCE adım adım bir plan oluşturursun, sonra bu planı uygularsın.
 
 KULLANABİLECEĞİN ARAÇLAR:
-- list_files_recursive(directory_path): Verilen dizindeki tüm dosyaları recursive olarak listeler
-- get_git_status(directory_path): Git repository durumunu kontrol eder ve formatlanmış rapor döndürür
-- get_file_imports(query): Bir Python dosyasının bağımlılıklarını analiz eder - AKILLI: dağınık sorguları anlayabilir
-- analyze_code_quality(query): Python dosyalarının kod kalitesini analiz eder - AKILLI: dağınık sorguları anlayabilir
-- run_code_in_sandbox(code, language): Kodu güvenli Docker sandbox'ında çalıştırır - TAM GÜVENLİ: izole ortam
-- git_create_branch(branch_name): Yeni git branch oluşturur ve o branch'e geçer
-- git_commit_changes(message): Değişiklikleri stage'e ekler ve commit eder
-- write_file(file_path, content): Belirtilen dosya yoluna içerik yazar
-- execute_local_python(code): Basit Python kodlarını çalıştırır - VERİ İŞLEME için kullanılır
-- Final Answer: Görevi başarıyla tamamladığında kullanırsın
+"""
 
+# Araç başına tek satırlık açıklama - listede sadece etkin araçlar yer alır
+_TOOL_PROMPT_LINES = {
+    "list_files_recursive": "- list_files_recursive(directory_path): Verilen dizindeki tüm dosyaları recursive olarak listeler\n",
+    "get_git_status": "- get_git_status(directory_path): Git repository durumunu kontrol eder ve formatlanmış rapor döndürür\n",
+    "get_file_imports": "- get_file_imports(query): Bir Python dosyasının bağımlılıklarını analiz eder - AKILLI: dağınık sorguları anlayabilir\n",
+    "analyze_code_quality": "- analyze_code_quality(query): Python dosyalarının kod kalitesini analiz eder - AKILLI: dağınık sorguları anlayabilir\n",
+    "run_code_in_sandbox": "- run_code_in_sandbox(code, language): Kodu güvenli Docker sandbox'ında çalıştırır - TAM GÜVENLİ: izole ortam\n",
+    "git_create_branch": "- git_create_branch(branch_name): Yeni git branch oluşturur ve o branch'e geçer\n",
+    "git_commit_changes": "- git_commit_changes(message): Değişiklikleri stage'e ekler ve commit eder\n",
+    "write_file": "- write_file(file_path, content): Belirtilen dosya yoluna içerik yazar\n",
+    "execute_local_python": "- execute_local_python(code): Basit Python kodlarını çalıştırır - VERİ İŞLEME için kullanılır\n",
+    "read_observation": "- read_observation(handle, start_line, end_line): Diske alınmış büyük gözlemin (obs_...) satır aralığını okur\n",
+    "final_answer": "- Final Answer: Görevi başarıyla tamamladığında kullanırsın\n",
+}
+
+# Plan-and-execute kuralları (ortak)
+_PROMPT_PLANNING_RULES = """
 🧠 STRATEJİK KURALLAR - PLAN-AND-EXECUTE:
 
 📋 KURAL 1: ÖNCE PLANLA
@@ -309,10 +387,16 @@ Plandaki tüm adımlar tamamlandığında VE elindeki bilgi kullanıcının orij
 ⚠️ KURAL 4: SONSUZ DÖNGÜ ÖNLEMESİ
 ASLA aynı aracı aynı argümanlarla tekrar çağırma. Her gözlemden sonra "Bu gözlem planımın hangi adımını tamamlıyor?" ve "Sıradaki adım ne?" sorularını sor.
 
-🎯 KURAL 5: HEDEFLİ ANALİZ KURALI
+"""
+
+# analyze_code_quality: hedefli analiz kuralı
+_PROMPT_TARGETED_ANALYSIS = """🎯 KURAL 5: HEDEFLİ ANALİZ KURALI
 Eğer kullanıcı 'kod kalitesini kontrol et' gibi genel istekler yaparsa ve belirli dosya belirtmezse, ASLA tüm projeyi tarama. Bunun yerine kullanıcıya 'Hangi dosyanın kod kalitesini analiz etmemi istiyorsun?' diye sor. analyze_code_quality aracı sadece belirli dosyalar için kullanılmalıdır.
 
-📊 KURAL 6 (GÜÇLENDİRİLMİŞ): VERİYİ AKTAR VE İŞLE - KRİTİK!
+"""
+
+# execute_local_python: gözlem verisini koda aktarma ve scratchpad kullanımı
+_PROMPT_DATA_FLOW = """📊 KURAL 6 (GÜÇLENDİRİLMİŞ): VERİYİ AKTAR VE İŞLE - KRİTİK!
 Bir araçtan (Gözlem) bir sonuç (özellikle bir liste veya metin bloğu) aldığında, bu sonucu bir sonraki Düşünce adımında planını yapmak için kullanmalısın. Eğer bu veriyi filtrelemen veya işlemen gerekiyorsa, bir sonraki Eylem'in execute_local_python olmalıdır. 
 
 **EN ÖNEMLİSİ:** execute_local_python aracını çağırırken, bir önceki Gözlem'deki veriyi doğrudan Python kodunun içine bir değişken olarak yerleştirmelisin.
@@ -340,7 +424,10 @@ Bir görevi planlarken, özellikle dosya listesi, git durumu gibi veri gerektiğ
 execute_local_python("files = scratchpad['last_file_list']\npy_files = [f for f in files if '.py' in f]\nprint(len(py_files))")
 ```
 
-CEVAP FORMATIN ŞU ŞEKİLDE OLMALIDIR:
+"""
+
+# Metin-JSON modu: Thought/Action cevap formatı
+_PROMPT_TEXT_ACTION_FORMAT = """CEVAP FORMATIN ŞU ŞEKİLDE OLMALIDIR:
 
 Thought: (Burada ne yapmayı planladığını, görevi nasıl anladığını açıklarsın. Gözlem aldıysan: "Bu gözlem görevimi karşılıyor mu?" sorusunu cevapla.)
 Action: 
@@ -351,7 +438,10 @@ Action:
 }
 ```
 
-STRATEJİK ÖRNEKLER:
+"""
+
+# Metin-JSON modu örnekleri - bütçe aşılırsa önce bunlar çıkarılır (en büyük senaryo ilk)
+_PROMPT_EXAMPLE_GREETING = """STRATEJİK ÖRNEKLER:
 
 🔹 BASİT GÖREV (Tek Adım):
 Kullanıcı: merhaba
@@ -365,7 +455,9 @@ Action:
 }
 ```
 
-🔹 KARMAŞIK GÖREV (Çok Adım):
+"""
+
+_PROMPT_EXAMPLE_DEPENDENCIES = """🔹 KARMAŞIK GÖREV (Çok Adım):
 Kullanıcı: Projedeki git aracının bağımlılıkları nelerdir?
 
 Thought: Kullanıcı benden bir aracın bağımlılıklarını bulmamı istiyor. Bu çok adımlı bir görev, önce plan yapmalıyım:
@@ -400,7 +492,9 @@ Action:
 
 Bu örnek, agent'a hem akıllı araç kullanımını hem de veri işleme adımını öğretir.
 
-🔹 ÖRNEK SENARYO (OTOMATİK HAFIZA SİSTEMİ) - ALTIN STANDART:
+"""
+
+_PROMPT_EXAMPLE_MEMORY = """🔹 ÖRNEK SENARYO (OTOMATİK HAFIZA SİSTEMİ) - ALTIN STANDART:
 
 Kullanıcı: Bu projede kaç tane Python dosyası var?
 
@@ -427,24 +521,155 @@ Action: { "tool": "final_answer", "tool_input": {"answer": "Bu projede **8 tane*
 
 **BU ÖRNEK, OTOMATİK HAFIZA SİSTEMİNIN NASIL ÇALIŞTIĞINI ÖĞRETİR.**
 
-🚨 KRİTİK HAFIZA KURALI:
+"""
+
+# Metin-JSON modu: tek adımda birden fazla bağımsız eylem
+_PROMPT_MULTI_ACTION_FORMAT = """⚡ ÇOKLU EYLEM: Birbirinden BAĞIMSIZ okuma araçlarını (list_files_recursive, get_git_status, get_file_imports, analyze_code_quality, read_observation) tek adımda bir JSON listesi olarak gönderebilirsin. Gözlemler aynı sırayla tek mesajda gelir. Yazma araçları (write_file, git_commit_changes) listede sırayla çalıştırılır.
+```json
+[
+    {"tool": "get_git_status", "tool_input": {"directory_path": "."}},
+    {"tool": "list_files_recursive", "tool_input": {"directory_path": "."}}
+]
+```
+
+"""
+
+# Hafıza okuma kuralı (ortak)
+_PROMPT_MEMORY_WARNING = """🚨 KRİTİK HAFIZA KURALI:
 execute_local_python kullanırken MUTLAKA `scratchpad['key']` formatında veri oku:
 ✅ DOĞRU: `file_list = scratchpad['last_file_list']`
 ❌ YANLIŞ: `file_list = file_list` (tanımsız değişken)
 
-🔧 JSON KURALLAR: execute_local_python için:
+"""
+
+# Metin-JSON modu: execute_local_python JSON kuralları
+_PROMPT_JSON_CODE_RULES = """🔧 JSON KURALLAR: execute_local_python için:
 ✅ DOĞRU: TEK SATIRLI kod + TEK TIRNAK kullan
 ✅ ÖRNEK: `"code": "py_files = [f for f in scratchpad['last_file_list'] if f.endswith('.py')]; print(py_files[:3])"`
 ❌ YANLIŞ: Multi-line kod veya çift tırnak (JSON parse sorunu yapar)
 
-ÖNEMLİ: Karmaşık görevlerde ÖNCE plan yap, sonra adım adım uygula. Her gözlemden sonra hangi adımda olduğunu belirt."""
+"""
+
+# Kapanış (ortak)
+_PROMPT_CLOSING = """ÖNEMLİ: Karmaşık görevlerde ÖNCE plan yap, sonra adım adım uygula. Her gözlemden sonra hangi adımda olduğunu belirt."""
+
+# Yerel function-calling modu: araç çağrıları yapısal gelir, JSON formatı öğretmeye gerek yok
+_PROMPT_NATIVE_TOOL_FORMAT = """ARAÇ ÇAĞIRMA FORMATI (YEREL FUNCTION-CALLING):
+Araçları sana bağlanan fonksiyon şemaları üzerinden doğrudan çağır - JSON bloğu yazma. Her adımda önce kısa bir Thought metni yaz, ardından araç çağrısını yap. Birbirinden bağımsız okuma araçlarını aynı adımda birlikte çağırabilirsin. Görev tamamlandığında final_answer aracını 'answer' parametresiyle çağır.
+
+"""
+
+# 🧩 Bölümler tanım sırasıyla birleşir (sabit önek); araca bağlı bölümler yalnızca o araç etkinse eklenir
+_TEXT = ("text",)
+_NATIVE = ("native",)
+PROMPT_SECTIONS = (
+    [PromptSection("core_rules", _PROMPT_CORE_RULES),
+     PromptSection("final_answer_json", _PROMPT_FINAL_ANSWER_JSON_RULES, modes=_TEXT),
+     PromptSection("scratchpad_keys", _PROMPT_SCRATCHPAD_KEYS),
+     PromptSection("identity", _PROMPT_IDENTITY)]
+    + [PromptSection(f"tool:{name}", line, tools=frozenset({name})) for name, line in _TOOL_PROMPT_LINES.items()]
+    + [PromptSection("planning_rules", _PROMPT_PLANNING_RULES),
+       PromptSection("targeted_analysis", _PROMPT_TARGETED_ANALYSIS, tools=frozenset({"analyze_code_quality"})),
+       PromptSection("data_flow", _PROMPT_DATA_FLOW, tools=frozenset({"execute_local_python"})),
+       PromptSection("text_action_format", _PROMPT_TEXT_ACTION_FORMAT, modes=_TEXT),
+       PromptSection("example_greeting", _PROMPT_EXAMPLE_GREETING, modes=_TEXT, priority=2),
+       PromptSection("example_dependencies", _PROMPT_EXAMPLE_DEPENDENCIES, modes=_TEXT, priority=1,
+                     all_tools=frozenset({"list_files_recursive", "get_file_imports"})),
+       PromptSection("example_memory", _PROMPT_EXAMPLE_MEMORY, modes=_TEXT, priority=0,
+                     all_tools=frozenset({"list_files_recursive", "execute_local_python"})),
+       PromptSection("native_tool_format", _PROMPT_NATIVE_TOOL_FORMAT, modes=_NATIVE),
+       PromptSection("multi_action", _PROMPT_MULTI_ACTION_FORMAT, modes=_TEXT,
+                     tools=frozenset(PARALLEL_SAFE_TOOLS), min_tools=2),
+       PromptSection("memory_warning", _PROMPT_MEMORY_WARNING, tools=frozenset({"execute_local_python"})),
+       PromptSection("json_code_rules", _PROMPT_JSON_CODE_RULES, modes=_TEXT,
+                     tools=frozenset({"execute_local_python"})),
+       PromptSection("closing", _PROMPT_CLOSING)]
+)
+PROMPT_BUILDER = SystemPromptBuilder(PROMPT_SECTIONS, tool_names)
+
+# Tüm araçlar etkin, bütçesiz - eski sabitlerle birebir aynı metin
+REACT_SYSTEM_PROMPT = PROMPT_BUILDER.build("text").text
+REACT_NATIVE_SYSTEM_PROMPT = PROMPT_BUILDER.build("native").text
+
+# Döngüyü sonlandırma işareti (final cevap olmadan)
+_STOP_LOOP = object()
+
+# Final cevap olmadan biten görevlerin sonucu (toplu çalıştırıcı durum tespitinde kullanır)
+MAX_ITERATIONS_MESSAGE = "⚠️ Maksimum iterasyon sayısına ulaşıldı. Görev tamamlanamadı."
+TASK_STOPPED_MESSAGE = "⏹️ Görev durduruldu"
+# ❌ öneki: başarısız cevap - cevap önbelleğine yazılmaz
+UNPARSEABLE_RESPONSE_ANSWER = "❌ Görev tamamlanamadı - LLM response belirsiz"
+API_ERROR_ANSWER = ("❌ AI beynime (Groq API) ulaşırken bir sorun yaşıyorum. Lütfen birkaç dakika sonra tekrar deneyin. "
+                    "Sorun devam ederse sistem yöneticisine bildirin.")
 
 # 5. ADIM: ReAct Döngüsü Ana Sınıfı
 class ReactAgent:
-    def __init__(self):
-        self.llm = llm
-        self.tools = {tool.name: tool for tool in tools}
+    def __init__(self, use_native_tools: bool = False, history_token_budget: int = 6000,
+                 keep_last_observations: int = 3, max_parallel_tools: int = 4, stream: bool = False,
+                 checkpoint_dir: Optional[str] = DEFAULT_CHECKPOINT_DIR, detect_stalls: bool = True,
+                 prefetch: bool = False, prefetch_stats_path: Optional[str] = os.path.join("logs", "prefetch_stats.json"),
+                 trace_path: Optional[str] = DEFAULT_TRACE_PATH, spill_observations: bool = True,
+                 task_timeout: Optional[float] = None, llm_cache: bool = True,
+                 priority: int = PRIORITY_INTERACTIVE, enabled_tools: Optional[List[str]] = None,
+                 system_prompt_budget: Optional[int] = None, answer_cache: bool = True):
+        # llm_cache=False: bu ajanın çağrıları önbelleği atlar (bypass), diğerleri etkilenmez
+        self.llm = llm if llm_cache else llm.uncached()
+        # 🧩 Etkin araçlar (None: hepsi, final_answer her zaman) - sistem prompt'u yalnızca bunların bölümleriyle
+        # derlenir; system_prompt_budget aşılırsa örnek bölümleri çıkarılır
+        if enabled_tools is not None:
+            unknown = set(enabled_tools) - set(tool_names)
+            if unknown:
+                raise ValueError(f"Bilinmeyen araç(lar): {', '.join(sorted(unknown))}")
+        active_tools = [tool for tool in tools
+                        if enabled_tools is None or tool.name in enabled_tools or tool.name == "final_answer"]
+        self.tools = {tool.name: tool for tool in active_tools}
+        # Opt-in: araç çağrılarını bind_tools ile yapısal al, metin-JSON parse sadece fallback
+        self.use_native_tools = use_native_tools
+        self.llm_with_tools = (LazyLLM(lambda: self.llm.bind_tools(active_tools), name="react-llm-tools")
+                               if use_native_tools else None)
+        self.system_prompt = PROMPT_BUILDER.build("native" if use_native_tools else "text", self.tools,
+                                                  system_prompt_budget)
+        if enabled_tools is not None or system_prompt_budget is not None:
+            print(self.system_prompt.summary_line())
+        # 🎯 Aynı görev + aynı çalışma alanı durumu: final cevap önbellekten (False: bu ajan için kapalı)
+        self.answer_cache = answer_cache
+        self.answer_namespace = (f"react:{'native' if use_native_tools else 'text'}:"
+                                 f"{','.join(sorted(self.tools))}:{system_prompt_budget}")
+        self.last_answer_cache = None
         self.conversation_history = []
+        self.python_worker = None  # execute_local_python için sıcak worker (lazy)
+        # Token bütçeli geçmiş: eski gözlemler scratchpad anahtarına işaret eden özetlere dönüşür
+        self.history = MessageHistoryManager(token_budget=history_token_budget,
+                                             keep_last_observations=keep_last_observations)
+        self.last_history_report = ""
+        self.tool_cache = ToolResultCache()  # son senkron görevin araç önbelleği (hit/miss sayaçları)
+        # Çökmeye dayanıklı görev kaydı (None: kapalı) - resume(task_id) ile devam edilir
+        self.checkpoint_dir = checkpoint_dir
+        self.last_task_id = None
+        # Aynı adımı tekrarlayan görevleri yakala (görev başına sayaçlar: stall_detector.stats)
+        self.detect_stalls = detect_stalls
+        self.stall_detector = None
+        # Opt-in: LLM düşünürken olası okuma araçlarını arka planda başlat (görev kelimesi istatistikleri)
+        self.predictor = ToolPredictor(stats_path=prefetch_stats_path) if prefetch else None
+        # Adım süre ölçümü: rapor last_trace'te, her görev trace_path'e (JSONL) bir satır (None: dosyaya yazma)
+        self.trace_path = trace_path
+        self.last_trace = None
+        # Sınırı aşan gözlemler diske: LLM'e önizleme + handle (False: eski davranış, tam metin)
+        self.observation_store = observation_store if spill_observations else None
+        # Görev başına süre bütçesi (sn, None: sınırsız) - araçlar kalan süreyle sınırlanır, cancel() ile durdurulur
+        self.task_timeout = task_timeout
+        self.last_deadline = None
+        self._active_deadlines = set()
+        self._deadline_lock = threading.Lock()
+        # 🚦 LLM isteklerinin planlayıcı önceliği (toplu işler PRIORITY_BATCH ile sohbetin arkasında bekler)
+        self.priority = priority
+        # Çoklu eylemlerde okuma araçları için sınırlı thread havuzu (lazy)
+        self.max_parallel_tools = max_parallel_tools
+        self._tool_pool = None
+        self._pool_lock = threading.Lock()
+        # Opt-in (metin modu): cevabı akış olarak oku, eylem JSON'u kapanınca üretimi kes
+        self.stream = stream and not use_native_tools
+        self.stream_stats = {"streams": 0, "early_stops": 0, "last_action_ready_ms": 0.0}
         
     def _sanitize_json_string(self, text: str) -> str:
         """LLM response'undan JSON için zararlı kontrol karakterlerini temizle"""
@@ -546,11 +771,7 @@ class ReactAgent:
         potential_json_str = self._extract_and_sanitize_json(response_text)
         
         try:
-            action_json = json.loads(potential_json_str)
-            
-            # Final Answer araç ismini normalize et
-            if action_json.get("tool") == "Final Answer":
-                action_json["tool"] = "final_answer"
+            action_json = self._normalize_action(json.loads(potential_json_str))
             
             return thought, action_json
             
@@ -566,7 +787,7 @@ class ReactAgent:
             # Fallback: Son çare basit dize değiştirme
             try:
                 fallback_json = potential_json_str.encode('utf-8', 'ignore').decode('utf-8')
-                action_json = json.loads(fallback_json)
+                action_json = self._normalize_action(json.loads(fallback_json))
                 return thought, action_json
             except:
                 # Fallback: metin analizi
@@ -575,6 +796,23 @@ class ReactAgent:
         # Fallback parsing - eski format için
         return self._fallback_parse(response_text, thought)
     
+    def _normalize_action(self, action_json) -> dict:
+        """Tek eylem veya eylem listesini ortak formata çevir: {"tool": ...} ya da {"actions": [...]}"""
+        if isinstance(action_json, dict) and isinstance(action_json.get("actions"), list):
+            action_json = action_json["actions"]
+        
+        if isinstance(action_json, list):
+            actions = [self._normalize_action(item) for item in action_json if isinstance(item, dict)]
+            if len(actions) == 1:
+                return actions[0]
+            return {"actions": actions}
+        
+        # Final Answer araç ismini normalize et
+        if action_json.get("tool") == "Final Answer":
+            action_json["tool"] = "final_answer"
+        
+        return action_json
+    
     def _fallback_parse(self, response_text: str, thought: str) -> tuple:
         """Eski format veya hatalı JSON durumunda fallback parsing"""
         
@@ -609,26 +847,40 @@ class ReactAgent:
         
         # Son çare: Sonsuz döngü önleme - final_answer ver
         print("⚠️ Fallback: LLM belirsiz response verdi, görevi sonlandırıyorum")
-        return thought, {"tool": "final_answer", "tool_input": {"answer": "Görev tamamlanamadı - LLM response belirsiz"}}
+        return thought, {"tool": "final_answer", "tool_input": {"answer": UNPARSEABLE_RESPONSE_ANSWER}}
+    
+    @staticmethod
+    def _is_api_error(e: Exception) -> bool:
+        """Yeniden denemeye değer geçici API/bağlantı hatası mı?"""
+        error_msg = str(e).lower()
+        return any(keyword in error_msg for keyword in ['503', 'service unavailable', 'api', 'timeout', 'connection'])
+    
+    @staticmethod
+    def _retry_delay(e: Exception, attempt: int, max_retries: int) -> float:
+        """Jitter'lı üstel bekleme (Retry-After varsa ona uyar) - eşzamanlı çağıranlar aynı anda dönmesin"""
+        delay = backoff_delay(attempt, retry_after_seconds(e), base=2.0)
+        print(f"🧠 API hatası algılandı: {e}")
+        print(f"⏳ {delay:.1f} saniye sonra yeniden deniyorum... (Deneme {attempt + 2}/{max_retries})")
+        return delay
     
     def _invoke_llm_with_retry(self, messages, max_retries: int = 2) -> str:
         """LLM çağrısı dayanıklılık katmanı - API hatalarında retry mekanizması"""
+        return self._invoke_llm_message_with_retry(messages, max_retries=max_retries).content
+    
+    def _invoke_llm_message_with_retry(self, messages, max_retries: int = 2, llm=None):
+        """Retry katmanı - tam AIMessage döndürür (yerel araç modu tool_calls için kullanır)"""
+        llm = llm or self.llm
         
         for attempt in range(max_retries):
             try:
                 # LLM'i çağır
-                response = self.llm.invoke(messages)
-                return response.content
+                return llm.invoke(messages)
                 
             except Exception as e:
-                error_msg = str(e).lower()
-                
                 # API hatalarını tespit et
-                if any(keyword in error_msg for keyword in ['503', 'service unavailable', 'api', 'timeout', 'connection']):
+                if self._is_api_error(e):
                     if attempt < max_retries - 1:  # Son deneme değilse
-                        print(f"🧠 API hatası algılandı: {e}")
-                        print(f"⏳ 3 saniye sonra yeniden deniyorum... (Deneme {attempt + 2}/{max_retries})")
-                        time.sleep(3)
+                        time.sleep(self._retry_delay(e, attempt, max_retries))
                         continue
                     else:
                         # Final fallback - son deneme de başarısız
@@ -640,61 +892,117 @@ class ReactAgent:
         
         # Bu satıra asla ulaşmamalı ama güvenlik için
         raise Exception("Beklenmeyen durum: Retry döngüsü tamamlandı ama sonuç yok")
-
-    def _execute_local_python_with_scratchpad(self, code: str, scratchpad: dict) -> str:
-        """GÜÇLU execute_local_python - subprocess ile karmaşık kodları da çalıştırır"""
-        try:
-            import subprocess
-            import tempfile
-            import os
-            import json
-            
-            # Geçici dosyalar oluştur
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                # Scratchpad'i JSON olarak serialize et
-                scratchpad_json = json.dumps(scratchpad, ensure_ascii=False, indent=2)
+    
+    def _stream_llm_message_with_retry(self, messages, max_retries: int = 2):
+        """
+        Akış (streaming) retry katmanı - düşünceyi canlı basar, Action JSON'u kapanır
+        kapanmaz üretimi keser. Kuyruktaki gereksiz metin beklenmez.
+        """
+        for attempt in range(max_retries):
+            parser = StreamingActionParser()
+            live = False
+            ends_with_newline = False
+            try:
+                start = time.perf_counter()
+                stream = self.llm.stream(messages)
+                try:
+                    for chunk in stream:
+                        content = chunk.content if isinstance(chunk.content, str) else ""
+                        visible = parser.feed(content)
+                        if visible:
+                            if not live:
+                                print("💭 ", end="")
+                                live = True
+                            print(visible, end="", flush=True)
+                            ends_with_newline = visible.endswith("\n")
+                        if parser.complete:
+                            break
+                finally:
+                    # Generator'ı kapatmak HTTP akışını kapatır - model üretmeye devam etmez
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
                 
-                # Python script oluştur
-                full_script = f'''
-import json
-import os
-
-# Scratchpad'i yükle
-scratchpad = {scratchpad_json}
-
-# Kullanıcı kodu
-{code}
-'''
-                f.write(full_script)
-                script_path = f.name
-            
+                if live and not ends_with_newline:
+                    print()
+                self.stream_stats["streams"] += 1
+                self.stream_stats["last_action_ready_ms"] = (time.perf_counter() - start) * 1000
+                if parser.complete:
+                    self.stream_stats["early_stops"] += 1
+                    print(f"⚡ Eylem {self.stream_stats['last_action_ready_ms']:.0f} ms'de hazır - üretim erken kesildi")
+                return AIMessage(content=parser.result_text(),
+                                 response_metadata={"streamed": True, "early_stop": parser.complete})
+                
+            except Exception as e:
+                if live and not ends_with_newline:
+                    print()
+                if self._is_api_error(e):
+                    if attempt < max_retries - 1:
+                        time.sleep(self._retry_delay(e, attempt, max_retries))
+                        continue
+                    else:
+                        print(f"❌ API'ye ulaşılamıyor. Son deneme de başarısız: {e}")
+                        raise Exception("API_CONNECTION_ERROR")
+                else:
+                    raise e
+        
+        raise Exception("Beklenmeyen durum: Retry döngüsü tamamlandı ama sonuç yok")
+    
+    async def _ainvoke_llm_with_retry(self, messages, max_retries: int = 2) -> str:
+        """Async LLM çağrısı dayanıklılık katmanı - event loop'u bloklamaz"""
+        return (await self._ainvoke_llm_message_with_retry(messages, max_retries=max_retries)).content
+    
+    async def _ainvoke_llm_message_with_retry(self, messages, max_retries: int = 2, llm=None):
+        """Async retry katmanı - ainvoke + asyncio.sleep, tam AIMessage döndürür"""
+        llm = llm or self.llm
+        
+        for attempt in range(max_retries):
             try:
-                # Python betiğini çalıştır
-                result = subprocess.run(
-                    ['python', script_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,  # 10 saniye timeout
-                    cwd=os.getcwd()
-                )
+                return await llm.ainvoke(messages)
                 
-                # Sonuçları kontrol et
-                if result.returncode == 0:
-                    output = result.stdout.strip()
-                    return f"✅ **Python Kodu Çalıştırıldı (subprocess)**\n\n📤 **ÇIKTI:**\n```\n{output}\n```"
+            except Exception as e:
+                if self._is_api_error(e):
+                    if attempt < max_retries - 1:
+                        await asyncio.sleep(self._retry_delay(e, attempt, max_retries))
+                        continue
+                    else:
+                        print(f"❌ API'ye ulaşılamıyor. Son deneme de başarısız: {e}")
+                        raise Exception("API_CONNECTION_ERROR")
                 else:
-                    error = result.stderr.strip()
-                    return f"❌ **Python Çalıştırma Hatası (subprocess)**\n\n```\n{error}\n```"
-                    
-            finally:
-                # Geçici dosyayı temizle
-                try:
-                    os.unlink(script_path)
-                except:
-                    pass
-                    
-        except subprocess.TimeoutExpired:
-            return f"❌ **Python Kodu Timeout (10s)**\n\nKod çok uzun sürdü."
+                    raise e
+        
+        raise Exception("Beklenmeyen durum: Retry döngüsü tamamlandı ama sonuç yok")
+
+    def _execute_local_python_with_scratchpad(self, code: str, scratchpad: dict) -> str:
+        """GÜÇLU execute_local_python - oturum boyunca yaşayan sıcak worker ile çalıştırır"""
+        try:
+            # Worker'ı ilk kullanımda başlat - sadece kod + scratchpad farkı gönderilir
+            if self.python_worker is None:
+                self.python_worker = PersistentPythonWorker(timeout=10)
+            
+            # 10 sn veya görevin kalan bütçesi; iptalde worker öldürülür (sonraki çağrıda yeniden doğar).
+            # Bütçe kontrolü ve iptal kaydı worker kilidi alındıktan sonra execute() içinde yapılır
+            timeout = budget(10)
+            deadline = current_deadline()
+            result = self.python_worker.execute(code, scratchpad, timeout=timeout, deadline=deadline)
+            if deadline is not None and deadline.cancelled:
+                raise ToolCancelled(deadline.stop_reason())
+            duration_note = f"⏱️ Süre: {result['duration_ms']:.1f} ms"
+            print(f"🔥 Python worker: {result['status']} ({result['duration_ms']:.1f} ms)")
+            
+            # Sonuçları kontrol et
+            if result["status"] == "success":
+                output = result["output"].strip()
+                return f"✅ **Python Kodu Çalıştırıldı (worker)**\n\n📤 **ÇIKTI:**\n```\n{output}\n```\n{duration_note}"
+            elif result["status"] == "timeout":
+                return f"❌ **Python Kodu Timeout ({timeout:.1f}s)**\n\nKod çok uzun sürdü, worker yeniden başlatılacak.\n{duration_note}"
+            else:
+                error = result["error"].strip()
+                return f"❌ **Python Çalıştırma Hatası (worker)**\n\n```\n{error}\n```\n{duration_note}"
+        
+        except ToolCancelled as e:
+            # İptal edilen kod fallback ile yeniden çalıştırılmaz
+            return f"⏹️ **Python Kodu Durduruldu**\n\n{e}"
         except Exception as e:
             # Fallback: Eski exec() yöntemini dene
             try:
@@ -720,10 +1028,16 @@ scratchpad = {scratchpad_json}
                 return f"✅ **Python Kodu Çalıştırıldı (fallback)**\n\n📤 **ÇIKTI:**\n```\n{output.strip()}\n```"
                 
             except Exception as exec_error:
-                return f"❌ **Python Çalıştırma Hatası**\n\nSubprocess: {str(e)}\nExec: {str(exec_error)}"
+                return f"❌ **Python Çalıştırma Hatası**\n\nWorker: {str(e)}\nExec: {str(exec_error)}"
 
-    def execute_tool(self, action: dict) -> str:
-        """Aracı çalıştır ve sonucu döndür - Yeni format için optimize edildi"""
+    def execute_tool(self, action, cache: Optional[ToolResultCache] = None) -> str:
+        """Aracı çalıştır ve sonucu döndür - cache verilirse okuma araçları görev içinde memoize edilir"""
+        
+        # Eylem listesi: okuma araçları paralel, gözlemler çağrı sırasıyla tek metinde
+        if isinstance(action, list) or "actions" in action:
+            actions = action if isinstance(action, list) else action["actions"]
+            observations = self._execute_actions(actions, lambda a: a.get("scratchpad", {}), cache=cache)
+            return self._format_observations(actions, observations)
         
         tool_name = action.get("tool")
         tool_input = action.get("tool_input", {})
@@ -751,6 +1065,14 @@ scratchpad = {scratchpad_json}
                 
                 # execute_local_python fonksiyonunu scratchpad ile çağır
                 return self._execute_local_python_with_scratchpad(code, scratchpad)
+            elif cache is not None and tool_name in MEMOIZABLE_TOOLS:
+                if tool_name == "list_files_recursive":
+                    # Tam dosya listesi önbellekte - hafıza refleksi aynı taramayı yeniden kullanır
+                    directory_path = self._directory_input(tool_input)
+                    # Gözlem deposu açıksa liste kesilmez - uzun liste önizleme + handle olur
+                    limit = None if self.observation_store is not None else 20
+                    return _format_file_list(directory_path, self._scan_files_cached(directory_path, cache), limit)
+                return cache.get_or_compute(tool_name, tool_input, lambda: tool.invoke(tool_input))
             else:
                 # Diğer araçlar için invoke
                 result = tool.invoke(tool_input)
@@ -758,10 +1080,436 @@ scratchpad = {scratchpad_json}
                 
         except Exception as e:
             return f"❌ Araç çalıştırma hatası ({tool_name}): {e}"
+        finally:
+            # Yazma/çalıştırma araçları dosya sistemini değiştirmiş olabilir
+            if cache is not None and tool_name in FS_MUTATING_TOOLS:
+                cache.invalidate(tool_name)
+    
+    @staticmethod
+    def _directory_input(tool_input) -> str:
+        """list_files_recursive girdisi dict veya düz metin olabilir"""
+        if isinstance(tool_input, dict):
+            return tool_input.get("directory_path", ".") or "."
+        return tool_input or "."
+    
+    def _scan_files_cached(self, directory_path: str, cache: Optional[ToolResultCache]) -> Optional[list]:
+        """Dizin taraması (rglob) - görev önbelleği varsa tek sefer"""
+        if cache is None:
+            return _scan_files(directory_path)
+        return cache.get_or_compute("list_files_recursive", {"directory_path": directory_path},
+                                    lambda: _scan_files(directory_path))
+    
+    def _execute_action(self, action: dict, scratchpad: dict, cache: Optional[ToolResultCache] = None,
+                        trace: Optional[TaskTrace] = None) -> str:
+        """Tek aracı çalıştır - execute_local_python için scratchpad'i geç"""
+        deadline = current_deadline()
+        if deadline is not None and deadline.stopped and action.get("tool") != "final_answer":
+            return f"⏹️ Araç çalıştırılmadı ({action.get('tool')}): {deadline.stop_reason()}"
+        with maybe_span(trace, "tool", action.get("tool")), \
+                (deadline.track(action.get("tool")) if deadline is not None else nullcontext()):
+            if action.get("tool") == "execute_local_python":
+                action_copy = action.copy()
+                action_copy["scratchpad"] = scratchpad
+                return self.execute_tool(action_copy, cache=cache)
+            return self.execute_tool(action, cache=cache)
     
-    def run_react_loop(self, user_task: str, max_iterations: int = 10) -> str:
-        """Ana ReAct döngüsü - Yeniden İnşa Edilmiş Hafıza Sistemi"""
+    def _execute_actions(self, actions: list, scratchpad_for, on_segment_done=None,
+                         cache: Optional[ToolResultCache] = None, trace: Optional[TaskTrace] = None) -> list:
+        """
+        Eylemleri sırayı koruyarak çalıştırır: art arda gelen okuma araçları
+        sınırlı thread havuzunda paralel, diğerleri tek tek (seri) çalışır.
+        """
+        observations = [None] * len(actions)
+        index = 0
         
+        while index < len(actions):
+            end = index + 1
+            if actions[index].get("tool") in PARALLEL_SAFE_TOOLS:
+                while end < len(actions) and actions[end].get("tool") in PARALLEL_SAFE_TOOLS:
+                    end += 1
+            
+            if end - index > 1:
+                print(f"⚡ {end - index} okuma aracı paralel çalışıyor...")
+                # Görev deadline'ı (contextvar) havuz thread'lerine bağlam kopyasıyla taşınır
+                futures = [self._get_tool_pool().submit(contextvars.copy_context().run, self._execute_action,
+                                                        actions[i], scratchpad_for(actions[i]), cache, trace)
+                           for i in range(index, end)]
+                for offset, future in enumerate(futures):
+                    observations[index + offset] = future.result()
+            else:
+                observations[index] = self._execute_action(actions[index], scratchpad_for(actions[index]), cache, trace)
+            
+            # Hafıza refleksi segment bitince sırayla çalışır - sonraki seri adım güncel scratchpad'i görür
+            if on_segment_done:
+                on_segment_done(range(index, end), observations)
+            index = end
+        
+        return observations
+    
+    def _get_tool_pool(self):
+        """Okuma araçları ve ön-yükleme için paylaşılan sınırlı thread havuzu (lazy)"""
+        with self._pool_lock:
+            if self._tool_pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._tool_pool = ThreadPoolExecutor(max_workers=self.max_parallel_tools,
+                                                     thread_name_prefix="react-tool")
+            return self._tool_pool
+    
+    def _start_prefetch(self, user_task: str, cache: Optional[ToolResultCache]):
+        """İlk LLM çağrısı sürerken tahmin edilen okuma araçlarını arka planda başlat"""
+        if self.predictor is None or cache is None:
+            return
+        for tool_name, tool_input in self.predictor.predict(user_task):
+            if tool_name not in PARALLEL_SAFE_TOOLS or tool_name not in self.tools:
+                continue
+            if tool_name == "list_files_recursive":
+                # Önbellek tam taramayı tutar - aracın kendisi ve hafıza refleksi aynı sonucu kullanır
+                directory_path = self._directory_input(tool_input)
+                cache_input, compute = {"directory_path": directory_path}, (lambda d=directory_path: _scan_files(d))
+            else:
+                tool = self.tools[tool_name]
+                cache_input, compute = tool_input, (lambda t=tool, i=tool_input: t.invoke(i))
+            if cache.prefetch(tool_name, cache_input, compute, self._get_tool_pool()):
+                print(f"⚡ Ön-yükleme başlatıldı: {tool_name}({tool_input})")
+    
+    def _finish_prefetch(self, user_task: str, cache: Optional[ToolResultCache]):
+        """Kullanılmayan ön-yüklemeleri at ve görevde istenen okuma çağrılarından öğren"""
+        if self.predictor is None or cache is None:
+            return
+        cache.drop_pending()
+        self.predictor.learn(user_task, [call for call in cache.requested if call[0] in MEMOIZABLE_TOOLS])
+    
+    def _format_observations(self, actions: list, observations: list) -> str:
+        """Çoklu eylem gözlemlerini çağrı sırasıyla tek mesajda birleştir"""
+        if len(observations) == 1:
+            return observations[0]
+        parts = []
+        for number, (action, observation) in enumerate(zip(actions, observations), 1):
+            parts.append(f"[{number}/{len(observations)}] {action.get('tool')}:\n{observation}")
+        return "\n\n".join(parts)
+    
+    def _run_tool_steps(self, actions: list, scratchpad: dict, cache: Optional[ToolResultCache] = None,
+                        trace: Optional[TaskTrace] = None) -> list:
+        """Eylemleri çalıştır ve hafızaya kaydet; her biri için (gözlem, hafıza anahtarı) döndür"""
+        results = [None] * len(actions)
+        
+        def remember(indexes, observations):
+            for i in indexes:
+                with maybe_span(trace, "memory", actions[i].get("tool")):
+                    results[i] = self._remember_observation(actions[i], observations[i], scratchpad, cache)
+        
+        self._execute_actions(actions, lambda action: scratchpad, on_segment_done=remember, cache=cache, trace=trace)
+        return results
+    
+    def _run_tool_step(self, action: dict, scratchpad: dict, cache: Optional[ToolResultCache] = None,
+                       trace: Optional[TaskTrace] = None) -> tuple:
+        """Aracı çalıştır, sonucu hafızaya kaydet; (LLM'e gidecek gözlem, hafıza anahtarı) döndür"""
+        return self._run_tool_steps([action], scratchpad, cache, trace)[0]
+    
+    def _remember_observation(self, action: dict, observation: str, scratchpad: dict,
+                              cache: Optional[ToolResultCache] = None) -> tuple:
+        """Gözlemi göster ve otomatik hafıza refleksini uygula - büyük gözlemler diske alınır"""
+        tool_name = action.get("tool", "")
+        
+        # Büyük çıktı: LLM'e baş/son önizlemesi + handle, tam veri dosyada (read_observation ile okunur)
+        llm_observation, handle = observation, None
+        if self.observation_store is not None and tool_name not in UNSPILLED_TOOLS:
+            llm_observation, handle = self.observation_store.spill(observation, tool_name)
+        print(f"🔍 Gözlem: {llm_observation}")
+        
+        # 3. ADIM: Otomatik Hafıza Kaydetme Refleksi
+        memory_note = ""
+        memory_key = None
+        if tool_name == "list_files_recursive":
+            # Tam dosya listesi - görev önbelleği varsa aracın yaptığı tarama yeniden kullanılır
+            directory_path = self._directory_input(action.get("tool_input", {}))
+            full_files = self._scan_files_cached(directory_path, cache) or []
+            
+            memory_key = 'last_file_list'
+            scratchpad['last_file_list'] = list(full_files)
+            memory_note = f"\n\n💾 HAFIZA: Dosya listesi scratchpad['last_file_list']'e kaydedildi ({len(full_files)} dosya)"
+            print(f"💾 Hafıza: dosya listesi kaydedildi ({len(full_files)} dosya)")
+        elif tool_name == "get_git_status":
+            memory_key = 'last_git_status'
+            scratchpad['last_git_status'] = observation
+            memory_note = f"\n\n💾 HAFIZA: Git durumu scratchpad['last_git_status']'e kaydedildi"
+            print(f"💾 Hafıza: git durumu kaydedildi")
+        elif tool_name == "analyze_code_quality":
+            memory_key = 'last_code_quality'
+            scratchpad['last_code_quality'] = observation
+            memory_note = f"\n\n💾 HAFIZA: Kod kalitesi scratchpad['last_code_quality']'e kaydedildi"
+            print(f"💾 Hafıza: kod kalitesi kaydedildi")
+        elif tool_name == "get_file_imports":
+            memory_key = 'last_file_imports'
+            scratchpad['last_file_imports'] = observation
+            memory_note = f"\n\n💾 HAFIZA: Bağımlılıklar scratchpad['last_file_imports']'e kaydedildi"
+            print(f"💾 Hafıza: bağımlılıklar kaydedildi")
+        
+        if handle:
+            scratchpad.setdefault('observation_files', {}).update(self.observation_store.files([handle]))
+            memory_key = memory_key or 'observation_files'
+            print(f"📦 Hafıza: büyük gözlem {handle} olarak diske alındı")
+        
+        return llm_observation + memory_note, memory_key
+    
+    def run_react_loop(self, user_task: str, max_iterations: int = 10, task_id: Optional[str] = None,
+                       return_report: bool = False, use_answer_cache: bool = True):
+        """
+        Ana ReAct döngüsü - görev sonunda geçmiş sıkıştırma ve süre raporlarını üretir.
+        return_report=True ise (sonuç, süre raporu) döner; rapor her durumda self.last_trace'te,
+        araç çalıştırma özeti (biten/iptal/süre aşımı) raporun "tool_runs" alanında.
+        use_answer_cache=False: yan etkili görev - önbellekteki cevap kullanılmaz, yeni cevap yazılmaz.
+        """
+        cached = self._cached_answer(user_task, use_answer_cache)
+        if cached is not None:
+            return cached if return_report else cached[0]
+        checkpoint = self._new_checkpoint(task_id)
+        result = self._run_sync_task(user_task, max_iterations, checkpoint)
+        stored = self._store_answer(user_task, result, self.last_trace, self.last_deadline, use_answer_cache)
+        self.last_answer_cache = {"hit": False, "stored": stored}
+        if not return_report:
+            return result
+        return result, dict(self._task_report(self.last_trace, self.last_deadline), answer_cache=self.last_answer_cache)
+    
+    def resume(self, task_id: str, max_iterations: Optional[int] = None) -> str:
+        """
+        Checkpoint'ten görevi son tamamlanan adımdan sürdür - biten adımlar için LLM tekrar çağrılmaz.
+        
+        Args:
+            task_id: run_react_loop'un yazdığı checkpoint kimliği (self.last_task_id)
+            max_iterations: Toplam adım sınırı (varsayılan: görevin ilk sınırı)
+        """
+        checkpoint = TaskCheckpoint(task_id, self.checkpoint_dir or DEFAULT_CHECKPOINT_DIR)
+        state = checkpoint.load()
+        self.last_task_id = task_id
+        
+        if state["final"] is not None:
+            print(f"💾 Görev {task_id} zaten tamamlanmış - kayıtlı cevap döndürülüyor")
+            return state["final"]
+        if state["native_tools"] != self.use_native_tools:
+            print("⚠️ Checkpoint farklı araç modunda (native/metin) başlatılmış - mesaj formatı uyuşmayabilir")
+        
+        print(f"💾 Görev {task_id} {state['iteration']}. adımdan sonra sürdürülüyor "
+              f"({len(state['messages'])} mesaj, {len(state['scratchpad'])} hafıza kaydı)")
+        return self._run_sync_task(state["user_task"], max_iterations or state["max_iterations"],
+                                   checkpoint, state)
+    
+    def cancel(self, task_id: Optional[str] = None, reason: str = "kullanıcı iptal etti") -> int:
+        """
+        Çalışan görev(ler)i iptal et - kayıtlı alt süreçler ve konteynerler hemen öldürülür,
+        döngü bir sonraki adımda durur. task_id verilmezse tüm aktif görevler. İptal edilen görev sayısı döner.
+        """
+        with self._deadline_lock:
+            targets = [deadline for deadline in self._active_deadlines
+                       if task_id is None or deadline.task_id == task_id]
+        for deadline in targets:
+            print(f"⏹️ Görev iptal ediliyor: {deadline.task_id or '-'} ({reason})")
+            deadline.cancel(reason)
+        return len(targets)
+    
+    def _cached_answer(self, user_task: str, use_answer_cache: bool) -> Optional[tuple]:
+        """🎯 Önbellek hit'i: (işaretli cevap, rapor) - ajan hattı hiç çalışmaz"""
+        hit = get_answer_cache().lookup(user_task, self.answer_namespace, use_answer_cache and self.answer_cache)
+        if hit is None:
+            return None
+        self.last_answer_cache = {"hit": True, "age_s": round(hit["age_s"], 1), "lookup_ms": round(hit["lookup_ms"], 3)}
+        print(f"🎯 Cevap önbelleğinden döndü ({hit['lookup_ms']:.1f} ms, {hit['age_s']:.0f} sn önceki çalıştırma): "
+              f"{user_task[:60]}")
+        self.last_task_id = None
+        self.last_trace = trace = TaskTrace(None, user_task)
+        self.last_deadline = deadline = Deadline()
+        trace.finish()
+        report = self._task_report(trace, deadline)
+        report["answer_cache"] = self.last_answer_cache
+        return flag_answer(hit["answer"], hit), report
+
+    def _store_answer(self, user_task: str, result: Any, trace: TaskTrace, deadline: Deadline,
+                      use_answer_cache: bool) -> bool:
+        """Tamamlanan görevin cevabını yaz - hata/durdurma/tekrar cevapları ve yan etkili araçlar hariç"""
+        if not (use_answer_cache and self.answer_cache):
+            return False
+        tools_used = {span.get("name") for span in trace.spans if span["phase"] == "tool"}
+        answer = result[len(FINAL_ANSWER_PREFIX):] if isinstance(result, str) else ""
+        cacheable = (isinstance(result, str) and result.startswith(FINAL_ANSWER_PREFIX) and not deadline.stopped
+                     and not answer.startswith(("⚠️", "⏹️", "❌")) and not tools_used & ANSWER_UNCACHEABLE_TOOLS)
+        return get_answer_cache().put(user_task, result, self.answer_namespace, cacheable=cacheable,
+                                      tools=sorted(filter(None, tools_used)))
+
+    def _accounting(self, task_id: Optional[str]):
+        """🧾 LLM çağrılarını bu göreve yaz - çağıran (batch_runner) görev kimliği verdiyse o korunur"""
+        return accounting_scope(task=current_scope().get("task") or task_id, component="ReactAgent")
+
+    def _begin_deadline(self, task_id: Optional[str]) -> Deadline:
+        deadline = Deadline(self.task_timeout, task_id)
+        with self._deadline_lock:
+            self._active_deadlines.add(deadline)
+        return deadline
+    
+    def _end_deadline(self, deadline: Deadline):
+        with self._deadline_lock:
+            self._active_deadlines.discard(deadline)
+    
+    @staticmethod
+    def _task_report(trace: TaskTrace, deadline: Deadline) -> dict:
+        report = trace.report()
+        report["tool_runs"] = deadline.report()
+        return report
+    
+    def _stopped_answer(self, deadline: Deadline, scratchpad: dict) -> str:
+        """Süre bütçesi bitti veya iptal edildi: hafızadakilerle en iyi çaba cevabı"""
+        answer = (f"{TASK_STOPPED_MESSAGE} ({deadline.stop_reason()}). "
+                  f"Toplanan bilgiler hafızada: {', '.join(scratchpad) or 'yok'}.")
+        final_result = self.execute_tool({"tool": "final_answer", "tool_input": {"answer": answer}})
+        print(f"\n{final_result}")
+        print("\n🏁 GÖREV DURDURULDU!")
+        return final_result
+    
+    def _finish_trace(self, trace: TaskTrace):
+        """Görev süre raporunu kapat ve JSONL'e ekle"""
+        trace.finish()
+        if self.trace_path:
+            try:
+                trace.write_jsonl(self.trace_path)
+            except OSError as e:
+                print(f"⚠️ Süre raporu yazılamadı: {e}")
+    
+    def _new_checkpoint(self, task_id: Optional[str] = None) -> Optional[TaskCheckpoint]:
+        """Yeni görev için checkpoint dosyası (checkpoint_dir=None ise kapalı)"""
+        if not self.checkpoint_dir:
+            return None
+        checkpoint = TaskCheckpoint(task_id or new_task_id(), self.checkpoint_dir)
+        print(f"💾 Checkpoint: {checkpoint.path} (devam için: resume('{checkpoint.task_id}'))")
+        return checkpoint
+    
+    def _run_sync_task(self, user_task: str, max_iterations: int, checkpoint: Optional[TaskCheckpoint],
+                       state: Optional[dict] = None) -> str:
+        """Senkron görev çerçevesi: geçmiş/önbellek hazırlığı, döngü ve görev sonu raporları"""
+        self.history.reset()
+        self.tool_cache = ToolResultCache()
+        self.stall_detector = StallDetector(max_iterations=max_iterations) if self.detect_stalls else None
+        self.last_task_id = checkpoint.task_id if checkpoint else None
+        self.last_trace = TaskTrace(self.last_task_id, user_task)
+        self.last_deadline = deadline = self._begin_deadline(self.last_task_id)
+        if state:
+            # Yeniden kurulan gözlem mesajlarını geçmiş yöneticisine tekrar tanıt
+            for message, info in state["observations"]:
+                self.history.register_observation(message, info.get("tool"), info.get("keys"))
+        try:
+            with use_deadline(deadline), request_priority(self.priority), self._accounting(self.last_task_id):
+                return self._react_loop(user_task, max_iterations, self.history, self.tool_cache, checkpoint, state,
+                                        self.stall_detector, self.last_trace)
+        except KeyboardInterrupt:
+            # Ctrl+C: çalışan alt süreçler/konteynerler yetim kalmasın
+            deadline.cancel("kullanıcı durdurdu (Ctrl+C)")
+            raise
+        finally:
+            self._end_deadline(deadline)
+            print(deadline.summary_line())
+            self._finish_prefetch(user_task, self.tool_cache)
+            self._finish_trace(self.last_trace)
+            print(self.last_trace.summary_line())
+            self.last_history_report = self.history.report()
+            print(self.last_history_report)
+            print(self.tool_cache.report())
+            if self.stall_detector:
+                print(self.stall_detector.report())
+    
+    async def arun_react_loop(self, user_task: str, max_iterations: int = 10, return_report: bool = False,
+                              task_id: Optional[str] = None, use_answer_cache: bool = True):
+        """
+        Async ReAct döngüsü - LLM çağrıları ainvoke ile, araçlar executor'da çalışır.
+        Her görevin kendi messages, scratchpad ve geçmiş yöneticisi vardır;
+        aynı event loop'ta onlarca görev eşzamanlı çalışabilir.
+        return_report=True ise (sonuç, süre raporu) döner.
+        """
+        # 🎯 Çalışma alanı parmak izi git alt sürecine bakar - event loop'u bloklamasın
+        cached = await asyncio.get_running_loop().run_in_executor(None, self._cached_answer, user_task,
+                                                                  use_answer_cache)
+        if cached is not None:
+            return cached if return_report else cached[0]
+        history = MessageHistoryManager(token_budget=self.history.token_budget,
+                                        keep_last_observations=self.history.keep_last_observations)
+        cache = ToolResultCache()
+        stall = StallDetector(max_iterations=max_iterations) if self.detect_stalls else None
+        loop = asyncio.get_running_loop()
+        messages, scratchpad = self._start_task(user_task)
+        self._start_prefetch(user_task, cache)
+        checkpoint = self._new_checkpoint(task_id)
+        if checkpoint:
+            checkpoint.record_start(user_task, messages, max_iterations, self.use_native_tools)
+        trace = TaskTrace(checkpoint.task_id if checkpoint else None, user_task)
+        deadline = self._begin_deadline(trace.task_id)
+        result = None
+        
+        # Her asyncio görevi kendi bağlamında - deadline yalnızca bu görevi etkiler
+        with use_deadline(deadline), request_priority(self.priority), self._accounting(trace.task_id):
+            try:
+                for iteration in range(1, max_iterations + 1):
+                    if deadline.stopped:
+                        result = self._stopped_answer(deadline, scratchpad)
+                        break
+                    
+                    print(f"\n🔄 ADIM {iteration}: ({user_task[:40]})")
+                    print("-" * 30)
+                    
+                    trace.iteration = iteration
+                    
+                    try:
+                        llm = self.llm_with_tools if self.use_native_tools else self.llm
+                        with trace.span("history"):
+                            prompt_messages = history.compact(messages)
+                        print(f"[{user_task[:40]}] {history.prompt_size_line()}")
+                        with trace.span("llm"):
+                            # LLM beklemesi de kalan bütçeyle sınırlı
+                            response = await asyncio.wait_for(
+                                self._ainvoke_llm_message_with_retry(prompt_messages, llm=llm), deadline.remaining()
+                            )
+                        # Ayrıştırma + araç çalıştırma bloklayıcı - executor thread'inde (deadline bağlamıyla)
+                        result = await loop.run_in_executor(
+                            None, contextvars.copy_context().run, self._process_step, response, messages, scratchpad,
+                            history, cache, checkpoint, iteration, stall, trace
+                        )
+                    except Exception as e:
+                        if checkpoint:
+                            checkpoint.record_error(iteration, str(e))
+                        result = (self._stopped_answer(deadline, scratchpad) if deadline.stopped
+                                  else self._handle_loop_error(e))
+                    
+                    if result is _STOP_LOOP:
+                        break
+                    if result is not None:
+                        break
+                
+                if result is None or result is _STOP_LOOP:
+                    result = MAX_ITERATIONS_MESSAGE
+                stored = await loop.run_in_executor(None, self._store_answer, user_task, result, trace, deadline,
+                                                    use_answer_cache)
+                if not return_report:
+                    return result
+                return result, dict(self._task_report(trace, deadline), answer_cache={"hit": False, "stored": stored})
+            finally:
+                self._end_deadline(deadline)
+                print(f"[{user_task[:40]}] {deadline.summary_line()}")
+                self._finish_prefetch(user_task, cache)
+                self._finish_trace(trace)
+                print(f"[{user_task[:40]}] {trace.summary_line()}")
+                print(f"[{user_task[:40]}] {history.report()}")
+                print(f"[{user_task[:40]}] {cache.report()}")
+                if stall:
+                    print(f"[{user_task[:40]}] {stall.report()}")
+    
+    async def arun_tasks(self, user_tasks: list, max_concurrency: int = 10, max_iterations: int = 10) -> list:
+        """Birden fazla görevi tek event loop'ta sınırlı eşzamanlılıkla çalıştır - sonuçlar girdi sırasıyla"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _run(task):
+            async with semaphore:
+                return await self.arun_react_loop(task, max_iterations=max_iterations)
+        
+        return await asyncio.gather(*(_run(task) for task in user_tasks))
+    
+    def _start_task(self, user_task: str) -> tuple:
+        """Görev için izole başlangıç durumu: (messages, scratchpad)"""
         print(f"\n🎯 GÖREV BAŞLADI: {user_task}")
         print("=" * 60)
         
@@ -769,33 +1517,180 @@ scratchpad = {scratchpad_json}
         scratchpad = {}
         print("🧠 Çalışma Tezgâhı (Scratchpad) hazırlandı")
         
-        # Başlangıç mesajı
+        # Başlangıç mesajı - etkin araçlar için derlenmiş (her görevde aynı metin: sabit önek)
         messages = [
-            SystemMessage(content=REACT_SYSTEM_PROMPT),
+            SystemMessage(content=self.system_prompt.text),
             HumanMessage(content=f"Görev: {user_task}")
         ]
+        return messages, scratchpad
+    
+    def _react_loop(self, user_task: str, max_iterations: int, history: MessageHistoryManager,
+                    cache: Optional[ToolResultCache] = None, checkpoint: Optional[TaskCheckpoint] = None,
+                    state: Optional[dict] = None, stall: Optional[StallDetector] = None,
+                    trace: Optional[TaskTrace] = None) -> str:
+        """ReAct döngüsü gövdesi - Yeniden İnşa Edilmiş Hafıza Sistemi"""
+        if state:
+            # Checkpoint'ten devam: mesajlar, scratchpad ve adım sayacı geri yüklenir
+            messages, scratchpad, iteration = state["messages"], state["scratchpad"], state["iteration"]
+        else:
+            messages, scratchpad = self._start_task(user_task)
+            self._start_prefetch(user_task, cache)
+            iteration = 0
+            if checkpoint:
+                checkpoint.record_start(user_task, messages, max_iterations, self.use_native_tools)
         
-        iteration = 0
-        
+        deadline = current_deadline()
         while iteration < max_iterations:
+            if deadline is not None and deadline.stopped:
+                return self._stopped_answer(deadline, scratchpad)
+            
             iteration += 1
             print(f"\n🔄 ADIM {iteration}:")
             print("-" * 30)
             
+            if trace:
+                trace.iteration = iteration
+            
             try:
                 # LLM'den cevap al - Dayanıklılık katmanı ile
-                response_text = self._invoke_llm_with_retry(messages)
+                with maybe_span(trace, "history"):
+                    prompt_messages = history.compact(messages)
+                print(history.prompt_size_line())
+                with maybe_span(trace, "llm"):
+                    if self.stream:
+                        response = self._stream_llm_message_with_retry(prompt_messages)
+                    else:
+                        llm = self.llm_with_tools if self.use_native_tools else self.llm
+                        response = self._invoke_llm_message_with_retry(prompt_messages, llm=llm)
+                result = self._process_step(response, messages, scratchpad, history, cache,
+                                            checkpoint, iteration, stall, trace)
+            except Exception as e:
+                if checkpoint:
+                    checkpoint.record_error(iteration, str(e))
+                if deadline is not None and deadline.stopped:
+                    return self._stopped_answer(deadline, scratchpad)
+                result = self._handle_loop_error(e)
+            
+            if result is _STOP_LOOP:
+                break
+            if result is not None:
+                return result
+        
+        return MAX_ITERATIONS_MESSAGE
+    
+    def _process_step(self, response, messages: list, scratchpad: dict, history: MessageHistoryManager,
+                      cache: Optional[ToolResultCache], checkpoint: Optional[TaskCheckpoint], iteration: int,
+                      stall: Optional[StallDetector] = None, trace: Optional[TaskTrace] = None):
+        """LLM cevabını işle, tekrar kontrolü yap ve tamamlanan adımı checkpoint'e yaz"""
+        step_log = {}
+        step_start = len(messages)
+        result = self._handle_llm_response(response, messages, scratchpad, history, cache, step_log, trace)
+        if result is None and stall is not None:
+            result = self._check_stall(stall, step_log, messages, scratchpad, iteration)
+        if checkpoint:
+            with maybe_span(trace, "checkpoint"):
+                checkpoint.record_step(iteration, messages[step_start:], scratchpad, step_log, history)
+                if isinstance(result, str):
+                    checkpoint.record_final(result)
+        return result
+    
+    def _check_stall(self, stall: StallDetector, step_log: dict, messages: list, scratchpad: dict, iteration: int):
+        """Aynı adım tekrarlanıyorsa önce düzeltici gözlem ekle, sürerse en iyi çabayla bitir"""
+        work = step_log.get("work", [])
+        verdict = stall.check(work, step_log.get("observations", []), iteration)
+        
+        if verdict == "warn":
+            print("🔁 Tekrar tespit edildi - düzeltici gözlem ekleniyor")
+            messages.append(HumanMessage(content=f"Observation: {stall.corrective_message(work)}"))
+            return None
+        
+        if verdict == "stop":
+            print(f"🔁 Tekrar sürüyor - görev erken sonlandırılıyor (~{max(0, stall.max_iterations - iteration)} iterasyon tasarruf)")
+            last_observation = (step_log.get("observations") or [""])[-1]
+            answer = ("⚠️ Aynı adımlar tekrarlandığı için görev erken sonlandırıldı. "
+                      f"Toplanan bilgiler hafızada: {', '.join(scratchpad) or 'yok'}.\n\n"
+                      f"Son gözlem:\n{last_observation[:1500]}")
+            final_result = self.execute_tool({"tool": "final_answer", "tool_input": {"answer": answer}})
+            print(f"\n{final_result}")
+            print("\n🏁 GÖREV TEKRAR NEDENİYLE SONLANDIRILDI!")
+            return final_result
+        
+        return None
+    
+    def _handle_loop_error(self, e: Exception):
+        """Döngü hatası: API bağlantı hatasında kullanıcıya final cevap, diğerlerinde döngüyü durdur"""
+        # API bağlantı hatası için özel handling
+        if str(e) == "API_CONNECTION_ERROR":
+            final_result = self.execute_tool({
+                "tool": "final_answer", 
+                "tool_input": {"answer": API_ERROR_ANSWER}
+            })
+            print(f"\n{final_result}")
+            print("\n🏁 GÖREV API HATASI NEDENİYLE SONLANDIRILDI!")
+            return final_result
+        print(f"❌ Döngü hatası: {e}")
+        return _STOP_LOOP
+    
+    def _handle_llm_response(self, response, messages: list, scratchpad: dict, history: MessageHistoryManager,
+                             cache: Optional[ToolResultCache] = None, step_log: Optional[dict] = None,
+                             trace: Optional[TaskTrace] = None):
+        """
+        Tek bir LLM cevabını işler: ayrıştır, araçları çalıştır, gözlemleri messages'a ekle.
+        step_log verilirse adımın düşüncesi, eylemleri ve çalışan araçların gözlemleri
+        ({"thought", "actions", "work", "observations"}) içine yazılır.
+        
+        Returns:
+            Final cevap metni, döngüyü durdurmak için _STOP_LOOP, devam için None
+        """
+        if self.use_native_tools:
+            # Yerel function-calling: araç çağrıları yapısal olarak gelir
+            messages.append(response)
+            tool_calls = getattr(response, "tool_calls", None) or []
+            
+            if tool_calls:
+                thought = (response.content or "").strip() or "Düşünce bulunamadı"
+                print(f"🧠 Düşünce: {thought}")
                 
-                # Response'u parse et - KENDİ KENDİNİ DÜZELTME SİSTEMİ
-                try:
-                    thought, action = self.parse_llm_response(response_text)
-                except Exception as parse_error:
-                    # JSON parse hatası - Agent'a hata bildirimi yap
-                    print(f"🔧 JSON Parse Hatası - Kendi kendini düzeltme devreye giriyor...")
-                    print(f"🔍 Hata: {parse_error}")
-                    
-                    # Yapay gözlem oluştur - Agent'a neyin yanlış gittiğini bildir
-                    error_observation = f"""🔧 **System Error Feedback**: My previous action contained invalid JSON syntax. 
+                actions = [{"tool": call["name"], "tool_input": call.get("args", {})} for call in tool_calls]
+                print(f"⚡ Eylem (native): {actions if len(actions) > 1 else actions[0]}")
+                if step_log is not None:
+                    step_log.update(thought=thought, actions=actions)
+                
+                work = [(call, action) for call, action in zip(tool_calls, actions) if action["tool"] != "final_answer"]
+                if work:
+                    results = self._run_tool_steps([action for _, action in work], scratchpad, cache, trace)
+                    if step_log is not None:
+                        step_log.update(work=[action for _, action in work],
+                                        observations=[obs for obs, _ in results])
+                    for (call, action), (full_observation, memory_key) in zip(work, results):
+                        tool_message = ToolMessage(content=full_observation, tool_call_id=call["id"])
+                        history.register_observation(tool_message, action["tool"], memory_key)
+                        messages.append(tool_message)
+                
+                final_action = next((action for action in actions if action["tool"] == "final_answer"), None)
+                if final_action:
+                    final_result = self.execute_tool(final_action)
+                    print(f"\n{final_result}")
+                    print("\n🏁 GÖREV TAMAMLANDI!")
+                    return final_result
+                return None
+            
+            # Yapısal çağrı gelmediyse metin ayrıştırmaya düş
+            print("⚠️ Yapısal araç çağrısı yok - metin ayrıştırma fallback'i kullanılıyor")
+        
+        response_text = response.content
+        
+        # Response'u parse et - KENDİ KENDİNİ DÜZELTME SİSTEMİ
+        try:
+            with maybe_span(trace, "parse"):
+                thought, action = self.parse_llm_response(response_text)
+        except Exception as parse_error:
+            # JSON parse hatası - Agent'a hata bildirimi yap
+            print(f"🔧 JSON Parse Hatası - Kendi kendini düzeltme devreye giriyor...")
+            print(f"🔍 Hata: {parse_error}")
+            
+            # Yapay gözlem oluştur - Agent'a neyin yanlış gittiğini bildir
+            error_observation = f"""🔧 **System Error Feedback**: My previous action contained invalid JSON syntax. 
 
 **Error Details**: {str(parse_error)}
 
@@ -805,93 +1700,60 @@ scratchpad = {scratchpad_json}
 - Use simpler approach if needed
 
 **Next Step**: I should retry with corrected syntax."""
-                    
-                    # Bu hatayı bir sonraki döngüye gözlem olarak aktar
-                    messages.append(HumanMessage(content=f"Observation: {error_observation}"))
-                    
-                    # Bu döngüyü atla, bir sonraki iterasyonda düzeltilmiş yanıt gelsin
-                    continue
-                
-                # Düşünceyi göster
-                print(f"🧠 Düşünce: {thought}")
-                
-                if not action:
-                    print("❌ Eylem parse edilemedi. Döngü sonlandırılıyor.")
-                    break
-                
-                print(f"⚡ Eylem: {action}")
-                
-                # Final answer kontrolü
-                if action.get("tool") == "final_answer":
-                    final_result = self.execute_tool(action)
-                    print(f"\n{final_result}")
-                    print("\n🏁 GÖREV TAMAMLANDI!")
-                    return final_result
-                
-                # 2. ADIM: Aracı Çalıştır ve Sonucu Hafızaya Kaydet
-                tool_name = action.get("tool", "")
-                
-                # execute_local_python için scratchpad'i geç
-                if tool_name == "execute_local_python":
-                    action_copy = action.copy()
-                    action_copy["scratchpad"] = scratchpad
-                    observation = self.execute_tool(action_copy)
-                else:
-                    observation = self.execute_tool(action)
-                
-                print(f"🔍 Gözlem: {observation}")
-                
-                # 3. ADIM: Otomatik Hafıza Kaydetme Refleksi
-                memory_note = ""
-                if tool_name == "list_files_recursive":
-                    # list_files_recursive aracını tekrar çağır ama tam liste için
-                    from pathlib import Path
-                    directory_path = action.get("tool_input", {}).get("directory_path", ".")
-                    target_path = Path(directory_path)
-                    
-                    # Tam dosya listesi oluştur
-                    full_files = []
-                    if target_path.exists():
-                        for file_path in target_path.rglob("*"):
-                            if file_path.is_file():
-                                relative_path = file_path.relative_to(target_path)
-                                full_files.append(str(relative_path))
-                    
-                    scratchpad['last_file_list'] = sorted(full_files)
-                    memory_note = f"\n\n💾 HAFIZA: Dosya listesi scratchpad['last_file_list']'e kaydedildi ({len(full_files)} dosya)"
-                    print(f"💾 Hafıza: dosya listesi kaydedildi ({len(full_files)} dosya)")
-                elif tool_name == "get_git_status":
-                    scratchpad['last_git_status'] = observation
-                    memory_note = f"\n\n💾 HAFIZA: Git durumu scratchpad['last_git_status']'e kaydedildi"
-                    print(f"💾 Hafıza: git durumu kaydedildi")
-                elif tool_name == "analyze_code_quality":
-                    scratchpad['last_code_quality'] = observation
-                    memory_note = f"\n\n💾 HAFIZA: Kod kalitesi scratchpad['last_code_quality']'e kaydedildi"
-                    print(f"💾 Hafıza: kod kalitesi kaydedildi")
-                elif tool_name == "get_file_imports":
-                    scratchpad['last_file_imports'] = observation
-                    memory_note = f"\n\n💾 HAFIZA: Bağımlılıklar scratchpad['last_file_imports']'e kaydedildi"
-                    print(f"💾 Hafıza: bağımlılıklar kaydedildi")
-                
-                # Conversation history'e ekle - hafıza notu dahil
-                full_observation = observation + memory_note
-                messages.append(HumanMessage(content=f"Observation: {full_observation}"))
-                
-            except Exception as e:
-                # API bağlantı hatası için özel handling
-                if str(e) == "API_CONNECTION_ERROR":
-                    final_result = self.execute_tool({
-                        "tool": "final_answer", 
-                        "tool_input": {"answer": "❌ AI beynime (Groq API) ulaşırken bir sorun yaşıyorum. Lütfen birkaç dakika sonra tekrar deneyin. Sorun devam ederse sistem yöneticisine bildirin."}
-                    })
-                    print(f"\n{final_result}")
-                    print("\n🏁 GÖREV API HATASI NEDENİYLE SONLANDIRILDI!")
-                    return final_result
-                else:
-                    print(f"❌ Döngü hatası: {e}")
-                    break
+            
+            # Bu hatayı bir sonraki döngüye gözlem olarak aktar
+            messages.append(HumanMessage(content=f"Observation: {error_observation}"))
+            
+            # Bu döngüyü atla, bir sonraki iterasyonda düzeltilmiş yanıt gelsin
+            return None
         
-        return "⚠️ Maksimum iterasyon sayısına ulaşıldı. Görev tamamlanamadı."
+        # Düşünceyi göster (akış modunda zaten canlı basıldı)
+        if not (getattr(response, "response_metadata", None) or {}).get("streamed"):
+            print(f"🧠 Düşünce: {thought}")
+        
+        if not action:
+            print("❌ Eylem parse edilemedi. Döngü sonlandırılıyor.")
+            return _STOP_LOOP
+        
+        print(f"⚡ Eylem: {action}")
+        
+        actions = action["actions"] if "actions" in action else [action]
+        if step_log is not None:
+            step_log.update(thought=thought, actions=actions)
+        final_action = next((a for a in actions if a.get("tool") == "final_answer"), None)
+        work = [a for a in actions if a.get("tool") != "final_answer"]
+        
+        # 2. ADIM: Aracı Çalıştır ve Sonucu Hafızaya Kaydet (bağımsız okumalar paralel)
+        if work:
+            results = self._run_tool_steps(work, scratchpad, cache, trace)
+            if step_log is not None:
+                step_log.update(work=work, observations=[obs for obs, _ in results])
+            full_observation = self._format_observations(work, [obs for obs, _ in results])
+            
+            # Conversation history'e ekle - hafıza notu dahil, çağrı sırasıyla tek mesaj
+            observation_message = HumanMessage(content=f"Observation: {full_observation}")
+            history.register_observation(observation_message,
+                                         "+".join(a.get("tool", "") for a in work),
+                                         [key for _, key in results if key])
+            messages.append(observation_message)
+        
+        # Final answer kontrolü
+        if final_action:
+            final_result = self.execute_tool(final_action)
+            print(f"\n{final_result}")
+            print("\n🏁 GÖREV TAMAMLANDI!")
+            return final_result
+        
+        return None
+    
+    def close(self):
+        """Oturum kaynaklarını (sıcak Python worker) serbest bırak"""
+        if self.python_worker is not None:
+            self.python_worker.close()
+            self.python_worker = None
+        if self._tool_pool is not None:
+            self._tool_pool.shutdown(wait=False)
+            self._tool_pool = None
 
 # 6. ADIM: Ana Program ve Hoşgeldin Mesajı
 def show_welcome():
@@ -933,10 +1795,35 @@ def main():
     """Ana program döngüsü"""
     show_welcome()
     
-    # ReAct Agent'ı başlat
-    agent = ReactAgent()
+    # --timeout <sn>: görev başına süre bütçesi (araçlar kalan süreyle sınırlanır)
+    task_timeout = None
+    if "--timeout" in sys.argv:
+        timeout_index = sys.argv.index("--timeout") + 1
+        if timeout_index < len(sys.argv):
+            task_timeout = float(sys.argv[timeout_index])
+    
+    # ReAct Agent'ı başlat (--native-tools: yerel function-calling, --stream: akışlı cevap, --prefetch: ön-yükleme)
+    # --no-llm-cache: önbellekteki cevapları kullanma (her adım modele gider)
+    # --no-answer-cache: tekrarlanan görevler için kayıtlı final cevabı kullanma
+    agent = ReactAgent(use_native_tools="--native-tools" in sys.argv, stream="--stream" in sys.argv,
+                       prefetch="--prefetch" in sys.argv, task_timeout=task_timeout,
+                       llm_cache="--no-llm-cache" not in sys.argv, answer_cache="--no-answer-cache" not in sys.argv)
+    
+    # --resume <task_id>: yarım kalan görevi checkpoint'ten sürdür
+    if "--resume" in sys.argv:
+        resume_index = sys.argv.index("--resume") + 1
+        if resume_index < len(sys.argv):
+            try:
+                agent.resume(sys.argv[resume_index])
+            except (FileNotFoundError, ValueError) as e:
+                print(f"❌ Devam edilemedi: {e}")
+    
+    # Kullanıcı yazarken bağlantıyı arka planda ısıt (--no-warmup ile kapatılabilir)
+    if "--no-warmup" not in sys.argv:
+        llm.warm_up(background=True)
     
     print("\n🚀 ReAct Agent hazır!")
+    print(f"⏱️ İlk prompt'a kadar geçen süre: {llm.mark_first_prompt():.0f} ms")
     
     while True:
         try:
@@ -953,8 +1840,12 @@ def main():
                 print("⚠️ Bir görev verin veya 'exit' ile çıkın")
                 continue
             
-            # ReAct döngüsünü başlat
-            result = agent.run_react_loop(user_task)
+            # ReAct döngüsünü başlat - Ctrl+C sadece bu görevi iptal eder
+            try:
+                result = agent.run_react_loop(user_task)
+            except KeyboardInterrupt:
+                print("\n⏹️ Görev iptal edildi - çalışan araçlar durduruldu")
+                continue
             
         except KeyboardInterrupt:
             print("\n\n👋 ReAct Agent interrupted - Çıkılıyor...")
@@ -962,6 +1853,12 @@ def main():
         except Exception as e:
             print(f"\n❌ Beklenmeyen hata: {e}")
             print("🔄 Devam ediyor...")
+    
+    print(get_llm_cache().report())
+    print(get_answer_cache().report())
+    print(get_scheduler().report())
+    print(get_registry().summary_line())
+    agent.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
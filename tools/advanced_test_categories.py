@@ -499,6 +499,46 @@ class AdvancedTestCategoriesSystem:
         
         return self.create_claude_fix_commands()
     
+    def benchmark_intent_classification(self, batch_size: int = 10, max_concurrency: int = 4) -> Dict[str, Any]:
+        """Tüm kategori girdilerini tek tek (classify_intent) ve toplu (classify_many) sınıflandır - girdi/dakika"""
+        classifier = getattr(self.agent, "intent_classifier", None)
+        if classifier is None or not hasattr(classifier, "classify_many"):
+            print("⚠️ classify_many bulunamadı - sınıflandırma benchmark'ı atlandı")
+            return {}
+        inputs = [case["input"] for category in self.advanced_categories.values()
+                  for case in category.test_cases if case.get("input")]
+        print(f"\n⏱️ Intent sınıflandırma benchmark'ı: {len(inputs)} girdi, "
+              f"toplu boyut {batch_size}, {max_concurrency} eşzamanlı toplu istek")
+        
+        from utils.llm_cache import get_llm_cache
+        cache = get_llm_cache()
+        cache_enabled = cache.enabled
+        cache.enabled = False  # iki yol da gerçek LLM çağrısı yapsın
+        try:
+            start = time.perf_counter()
+            single = [classifier.classify_intent(text) for text in inputs]
+            single_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            batched = classifier.classify_many(inputs, batch_size=batch_size, max_concurrency=max_concurrency)
+            batch_seconds = time.perf_counter() - start
+        finally:
+            cache.enabled = cache_enabled
+        
+        agreement = sum(1 for a, b in zip(single, batched) if a.get("intent") == b.get("intent"))
+        report = {
+            "inputs": len(inputs),
+            "single_seconds": round(single_seconds, 3),
+            "batch_seconds": round(batch_seconds, 3),
+            "single_per_minute": round(len(inputs) / single_seconds * 60, 1) if single_seconds else None,
+            "batch_per_minute": round(len(inputs) / batch_seconds * 60, 1) if batch_seconds else None,
+            "intent_agreement": round(agreement / len(inputs), 3) if inputs else None,
+            "batch_stats": dict(classifier.batch_stats),
+        }
+        print(f"  🐢 Tek tek : {report['single_seconds']:.2f}s → {report['single_per_minute']} girdi/dk")
+        print(f"  🚀 Toplu   : {report['batch_seconds']:.2f}s → {report['batch_per_minute']} girdi/dk")
+        print(f"  🎯 Aynı intent: %{(report['intent_agreement'] or 0) * 100:.1f} | {report['batch_stats']}")
+        return report
+    
     def execute_category_tests(self, category: TestCategory, category_name: str):
         """Kategori testlerini çalıştır"""
         print(f"\n📊 {category.name} - Executing {len(category.test_cases)} test cases")
@@ -1016,6 +1056,43 @@ def main():
     print("🎯 Claude Code Integration + Gemini Enhanced Testing")
     print("=" * 80)
     
+    run = _run_all_categories
+    # --classify-benchmark [toplu_boyut]: sadece intent sınıflandırma hızını ölç (tek tek vs classify_many)
+    if "--classify-benchmark" in sys.argv:
+        index = sys.argv.index("--classify-benchmark") + 1
+        batch_size = int(sys.argv[index]) if index < len(sys.argv) and sys.argv[index].isdigit() else 10
+        run = lambda: 0 if AdvancedTestCategoriesSystem().benchmark_intent_classification(batch_size=batch_size) else 1
+    
+    # --record / --replay <kaset.jsonl>: LLM cevaplarını kaydet veya ağsız, saniyeler içinde tekrar oynat
+    for flag, mode in (("--record", "record"), ("--replay", "replay")):
+        if flag in sys.argv:
+            from utils.llm_cassette import use_cassette
+            index = sys.argv.index(flag) + 1
+            path = (sys.argv[index] if index < len(sys.argv) and not sys.argv[index].startswith("--")
+                    else os.path.join("logs", "cassettes", "advanced_tests.jsonl"))
+            with use_cassette(path, mode, os.getenv("LLM_CASSETTE_LATENCY")) as cassette:
+                try:
+                    code = run()
+                finally:
+                    print(cassette.report())
+            # Sınıflandırıcı miss'i sessizce fallback'e düşürür - eksik kayıt varsa oynatma başarısız sayılır
+            if mode == "replay" and cassette.stats["misses"]:
+                print(f"❌ Kaset eksik: {cassette.stats['misses']} istek kayıtta yok (istem kayıtla oynatma arasında değişmiş)")
+                return code or 1
+            return code
+    
+    # --stub [senaryo.jsonl]: API anahtarı/ağ olmadan yerel stub LLM sunucusuna karşı çalış
+    if "--stub" in sys.argv:
+        from utils.stub_llm_server import StubLLMServer, StubBehaviour, load_script
+        index = sys.argv.index("--stub") + 1
+        script = sys.argv[index] if index < len(sys.argv) and not sys.argv[index].startswith("--") else None
+        with StubLLMServer(StubBehaviour(load_script(script))) as server:
+            print(f"🧪 Stub LLM sunucusu: {server.url}")
+            return run()
+    return run()
+
+
+def _run_all_categories():
     try:
         # Test sistemini başlat
         test_system = AdvancedTestCategoriesSystem()
@@ -22,7 +22,10 @@ except ImportError:
 from langchain.tools import tool
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.pydantic_v1 import BaseModel, Field
-from langchain_groq import ChatGroq
+from utils.llm_cache import cached_llm
+from utils.llm_scheduler import scheduled_llm
+from utils.llm_registry import get_registry
+from utils.llm_accounting import accounted
 
 
 # --- Profesyonel Tavsiye #2: Yapısal Çıktı (Structured Output) ---
@@ -50,6 +53,7 @@ class ArchitectureDecision(BaseModel):
 
 
 @tool(args_schema=ArchitectureInput)
+@accounted("decide_architecture")
 def decide_architecture(problem_description: str) -> Dict:
     """
     Verilen bir probleme en uygun AI mimarisini (Transformer veya SSM) seçer.
@@ -75,11 +79,12 @@ Senin görevin, kullanıcının problemini dikkatlice analiz edip bu iki seçene
 
     # 2. LLM Nesnesini Oluşturma
     # `with_structured_output` metodu, LLM'in cevabını ArchitectureDecision şemamıza zorlar.
-    llm = ChatGroq(
-        temperature=0, 
-        model_name=settings.AGENT_MODEL_NAME, 
-        groq_api_key=settings.GROQ_API_KEY
-    ).with_structured_output(ArchitectureDecision)
+    # temperature=0: aynı problem tanımı için karar önbellekten döner (🗄️)
+    # 🏊 ChatGroq her çağrıda yeniden kurulmaz - havuzdaki istemci (ve bağlantıları) paylaşılır
+    groq_client = get_registry().client("groq", model=settings.AGENT_MODEL_NAME, temperature=0,
+                                        api_key=settings.GROQ_API_KEY)
+    llm = cached_llm(scheduled_llm(groq_client.with_structured_output(ArchitectureDecision), provider="groq"),
+                     output_type=ArchitectureDecision)
 
     # 3. Prompt Şablonunu Oluşturma
     prompt = ChatPromptTemplate.from_messages([
@@ -87,13 +92,11 @@ Senin görevin, kullanıcının problemini dikkatlice analiz edip bu iki seçene
         ("human", "Lütfen aşağıdaki problemi analiz et ve en uygun mimariye karar ver:\n\n{problem}")
     ])
 
-    # 4. Zinciri (Chain) Oluşturma ve Çağırma
-    chain = prompt | llm
-    
+    # 4. Prompt'u Doldurma ve Çağırma (önbellek anahtarı doldurulmuş mesajlardan üretilir)
     print(f"\n[Architect Tool] Mimari kararı için LLM çağrılıyor...\nProblem: {problem_description}")
     
     try:
-        decision = chain.invoke({"problem": problem_description})
+        decision = llm.invoke(prompt.format_messages(problem=problem_description))
         print(f"[Architect Tool] LLM'den cevap alındı: {decision}")
         # Pydantic modelini Python sözlüğüne çevirerek döndür
         return decision.dict()
@@ -11,17 +11,14 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from langchain_core.tools import tool
 
+from utils.deadline import run_process, budget, ToolCancelled
+
 def _check_ruff_availability() -> Dict[str, Any]:
     """
     Ruff'ın yüklü olup olmadığını kontrol eder
     """
     try:
-        result = subprocess.run(
-            ["ruff", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        result = run_process(["ruff", "--version"], timeout=5)
         
         if result.returncode == 0:
             version = result.stdout.strip()
@@ -122,11 +119,11 @@ def _run_ruff_analysis(file_path: str) -> Dict[str, Any]:
     """
     try:
         # GÜVENLI Ruff check komutu - lazer odaklı analiz - DÜZELTİLDİ
-        result = subprocess.run(
+        # 15 sn tek dosya için yeterli; görev bütçesi daha azsa onunla sınırlanır
+        timeout = budget(15)
+        result = run_process(
             ["ruff", "check", "--output-format=json", "--quiet", "--exit-zero", file_path],
-            capture_output=True,
-            text=True,
-            timeout=15  # Daha kısa timeout - tek dosya için yeterli
+            timeout=timeout
         )
         
         # DEBUG logs kaldırıldı - artık çalışıyor
@@ -181,12 +178,18 @@ def _run_ruff_analysis(file_path: str) -> Dict[str, Any]:
             "stderr": result.stderr if result.stderr else None
         }
         
-    except subprocess.TimeoutExpired:
+    except subprocess.TimeoutExpired as e:
         return {
             "status": "error",
-            "message": "Ruff analizi 30 saniye içinde tamamlanamadı",
+            "message": f"Ruff analizi {e.timeout:.0f} saniye içinde tamamlanamadı",
             "error_type": "timeout"
         }
+    except ToolCancelled as e:
+        return {
+            "status": "error",
+            "message": f"Ruff analizi durduruldu: {e}",
+            "error_type": "cancelled"
+        }
     except Exception as e:
         return {
             "status": "error",
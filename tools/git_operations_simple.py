@@ -5,11 +5,12 @@ Core Agent için basit ve güvenilir Git araçları
 """
 
 import os
-import subprocess
 from typing import Dict, List
 from pathlib import Path
 from langchain_core.tools import tool
 
+from utils.deadline import run_process
+
 try:
     import git
     from git.exc import InvalidGitRepositoryError, GitCommandError
@@ -134,10 +135,8 @@ def git_create_branch(branch_name: str) -> str:
     """
     try:
         # Yeni branch oluştur ve geç
-        result = subprocess.run(
+        result = run_process(
             ["git", "checkout", "-b", branch_name],
-            capture_output=True,
-            text=True,
             cwd=".",
             timeout=30
         )
@@ -163,10 +162,8 @@ def git_commit_changes(message: str) -> str:
     """
     try:
         # Tüm değişiklikleri stage'e ekle
-        add_result = subprocess.run(
+        add_result = run_process(
             ["git", "add", "."],
-            capture_output=True,
-            text=True,
             cwd=".",
             timeout=30
         )
@@ -175,10 +172,8 @@ def git_commit_changes(message: str) -> str:
             return f"❌ **Git Add Hatası**\n\n{add_result.stderr}"
         
         # Commit et
-        commit_result = subprocess.run(
+        commit_result = run_process(
             ["git", "commit", "-m", message],
-            capture_output=True,
-            text=True,
             cwd=".",
             timeout=30
         )
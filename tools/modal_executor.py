@@ -30,11 +30,16 @@ base_image = modal.Image.debian_slim().pip_install([
 # Workspace volume for persistent file storage
 workspace_volume = modal.Volume.from_name("atolye-workspace", create_if_missing=True)
 
+# Uzak fonksiyon üst sınırları - istemci tarafında görevin kalan bütçesiyle ayrıca sınırlanır
+GPU_CODE_TIMEOUT = 3600
+SIMPLE_CODE_TIMEOUT = 600
+BASH_COMMAND_TIMEOUT = 300
+
 # LOCAL DEVELOPMENT: Direct execution without serve mode
 def execute_code_locally(code: str, use_gpu: bool = False) -> Dict[str, Any]:
     """Local development version - executes code directly"""
     try:
-        import subprocess
+        from utils.deadline import run_process
         import sys
         
         # Create temp file
@@ -44,8 +49,7 @@ def execute_code_locally(code: str, use_gpu: bool = False) -> Dict[str, Any]:
             temp_file = f.name
         
         # Execute locally
-        result = subprocess.run([sys.executable, temp_file], 
-                              capture_output=True, text=True, timeout=30)
+        result = run_process([sys.executable, temp_file], timeout=30)
         
         # Cleanup
         os.unlink(temp_file)
@@ -73,10 +77,10 @@ def execute_code_locally(code: str, use_gpu: bool = False) -> Dict[str, Any]:
 def execute_bash_locally(command: str) -> Dict[str, Any]:
     """Local development version - executes bash directly"""
     try:
-        import subprocess
+        # Yerel çalıştırma: görev bütçesiyle sınırlı, iptalde süreç grubu öldürülür
+        from utils.deadline import run_process
         
-        result = subprocess.run(command, shell=True, 
-                              capture_output=True, text=True, timeout=30)
+        result = run_process(command, shell=True, timeout=30)
         
         if result.returncode == 0:
             return {
@@ -100,7 +104,7 @@ def execute_bash_locally(command: str) -> Dict[str, Any]:
 
 @app.function(
     gpu="T4",
-    timeout=3600,
+    timeout=GPU_CODE_TIMEOUT,
     image=base_image,
     memory=8192
 )
@@ -248,7 +252,7 @@ def get_workspace_file(filename: str) -> Dict[str, Any]:
         }
 
 @app.function(
-    timeout=600,
+    timeout=SIMPLE_CODE_TIMEOUT,
     image=base_image,
     memory=2048
 )
@@ -306,7 +310,7 @@ def execute_simple_code(code: str, requirements: Optional[List[str]] = None) ->
         sys.stderr = old_stderr
 
 @app.function(
-    timeout=300,
+    timeout=BASH_COMMAND_TIMEOUT,
     image=modal.Image.debian_slim().pip_install(["requests"])
 )
 def execute_bash_command(command: str) -> Dict[str, Any]:
@@ -342,6 +346,18 @@ def execute_bash_command(command: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+class RemoteCallStopped(Exception):
+    """Modal çağrısı süre aşımı veya görev iptali nedeniyle durduruldu"""
+
+
+# FunctionCall.get(timeout=...) modal'ın kendi TimeoutError'ını fırlatır (builtin'in alt sınıfı değil)
+try:
+    from modal.exception import TimeoutError as ModalTimeoutError
+    REMOTE_TIMEOUT_ERRORS = (TimeoutError, ModalTimeoutError)
+except ImportError:
+    REMOTE_TIMEOUT_ERRORS = (TimeoutError,)
+
+
 class ModalExecutor:
     """Local interface for Modal serverless functions."""
     
@@ -380,6 +396,30 @@ class ModalExecutor:
             self._last_health_check = current_time
             return False
         
+    def _call_remote(self, function, default_timeout: float, *args):
+        """
+        Modal fonksiyonunu spawn et ve görev bütçesi kadar bekle.
+        Süre dolarsa veya görev iptal edilirse uzak çağrı da iptal edilir.
+        """
+        from utils.deadline import budget, on_cancel, current_deadline, ToolCancelled
+        
+        try:
+            timeout = budget(default_timeout)
+        except ToolCancelled as e:
+            raise RemoteCallStopped(f"Modal call not started: {e}")
+        call = function.spawn(*args)
+        with on_cancel(call.cancel):
+            try:
+                return call.get(timeout=timeout)
+            except Exception as e:
+                deadline = current_deadline()
+                if deadline is not None and deadline.cancelled:
+                    raise RemoteCallStopped(f"Modal call cancelled: {deadline.stop_reason()}")
+                if isinstance(e, REMOTE_TIMEOUT_ERRORS):
+                    call.cancel()
+                    raise RemoteCallStopped(f"Modal call cancelled after {timeout:.0f}s")
+                raise
+        
     def execute_python_code(self, code: str, use_gpu: bool = False, 
                           requirements: list = []) -> Dict[str, Any]:
         """HYBRID: Execute Python code with Modal.com primary + local fallback"""
@@ -392,15 +432,18 @@ class ModalExecutor:
             try:
                 if use_gpu:
                     self.logger.info("🚀 PRIMARY: Executing code with GPU on Modal.com...")
-                    result = execute_gpu_code.remote(code, requirements)
+                    result = self._call_remote(execute_gpu_code, GPU_CODE_TIMEOUT, code, requirements)
                 else:
                     self.logger.info("🚀 PRIMARY: Executing code on Modal.com...")
-                    result = execute_simple_code.remote(code, requirements)
+                    result = self._call_remote(execute_simple_code, SIMPLE_CODE_TIMEOUT, code, requirements)
                     
                 self.logger.info(f"✅ Modal.com execution completed: {result['status']}")
                 result["execution_method"] = "Modal.com Cloud"
                 return result
                 
+            except RemoteCallStopped as e:
+                # Bütçe bitti veya iptal edildi - yerel yedeğe geçmenin anlamı yok
+                return {"status": "error", "output": "", "error": str(e), "execution_method": "Modal.com Cloud"}
             except Exception as e:
                 self.logger.warning(f"⚠️ Modal.com failed, falling back to local: {e}")
                 # Mark Modal as unhealthy for future requests
@@ -414,6 +457,7 @@ class ModalExecutor:
         """Local fallback execution with subprocess"""
         try:
             import subprocess
+            from utils.deadline import run_process, ToolCancelled
             import sys
             import tempfile
             import os
@@ -425,8 +469,7 @@ class ModalExecutor:
             
             try:
                 # Execute locally
-                result = subprocess.run([sys.executable, temp_file], 
-                                      capture_output=True, text=True, timeout=30)
+                result = run_process([sys.executable, temp_file], timeout=30)
                 
                 # Cleanup
                 os.unlink(temp_file)
@@ -447,12 +490,12 @@ class ModalExecutor:
                         "execution_method": "Local CPU"
                     }
                     
-            except subprocess.TimeoutExpired:
+            except (subprocess.TimeoutExpired, ToolCancelled) as e:
                 os.unlink(temp_file)
                 return {
                     "status": "error",
                     "output": "",
-                    "error": "Local execution timed out after 30 seconds",
+                    "error": f"Local execution stopped: {e}",
                     "execution_method": "Local CPU"
                 }
                 
@@ -474,11 +517,13 @@ class ModalExecutor:
             # 2. Primary Execution: Try Modal.com
             try:
                 self.logger.info(f"🚀 PRIMARY: Executing bash on Modal.com: {command}")
-                result = execute_bash_command.remote(command)
+                result = self._call_remote(execute_bash_command, BASH_COMMAND_TIMEOUT, command)
                 self.logger.info(f"✅ Modal.com bash completed: {result['status']}")
                 result["execution_method"] = "Modal.com Cloud"
                 return result
                 
+            except RemoteCallStopped as e:
+                return {"status": "error", "output": "", "error": str(e), "execution_method": "Modal.com Cloud"}
             except Exception as e:
                 self.logger.warning(f"⚠️ Modal.com bash failed, falling back to local: {e}")
                 self._modal_healthy = False
@@ -491,9 +536,9 @@ class ModalExecutor:
         """Local bash fallback execution"""
         try:
             import subprocess
+            from utils.deadline import run_process, ToolCancelled
             
-            result = subprocess.run(command, shell=True, 
-                                  capture_output=True, text=True, timeout=30)
+            result = run_process(command, shell=True, timeout=30)
             
             return {
                 "status": "success" if result.returncode == 0 else "error",
@@ -503,11 +548,11 @@ class ModalExecutor:
                 "execution_method": "Local Bash"
             }
             
-        except subprocess.TimeoutExpired:
+        except (subprocess.TimeoutExpired, ToolCancelled) as e:
             return {
                 "status": "error",
                 "output": "",
-                "error": "Local bash command timed out after 30 seconds",
+                "error": f"Local bash command stopped: {e}",
                 "execution_method": "Local Bash"
             }
         except Exception as e:
@@ -12,6 +12,11 @@ from typing import Dict, Any, Optional
 from pathlib import Path
 from langchain_core.tools import tool
 
+from utils.deadline import budget, on_cancel, current_deadline
+
+# Konteyner başına üst sınır - görev bütçesi daha azsa onunla sınırlanır
+SANDBOX_TIMEOUT = 30
+
 def _check_docker_availability() -> Dict[str, Any]:
     """
     Docker'ın yüklü ve çalışıyor olup olmadığını kontrol eder
@@ -64,6 +69,16 @@ def _create_temp_code_file(code: str, language: str = "python") -> str:
         tmp_file.write(code)
         return tmp_file.name
 
+def _stop_container(container, remove: bool = False):
+    """Çalışan konteyneri öldür (ve istenirse sil) - zaten bittiyse sessizce geç"""
+    try:
+        if remove:
+            container.remove(force=True)
+        else:
+            container.kill()
+    except Exception:
+        pass
+
 def _run_code_in_docker(code_file_path: str, language: str = "python", client=None) -> Dict[str, Any]:
     """
     Docker konteynerinde kod çalıştırır
@@ -134,14 +149,12 @@ def _run_code_in_docker(code_file_path: str, language: str = "python", client=No
                 f"echo '{encoded_code}' | base64 -d | bash"
             ]
         
-        # Konteyneri çalıştır - güvenlik sınırlamaları ile
+        # Konteyneri arka planda başlat - bekleme süresi görev bütçesiyle sınırlı, iptalde öldürülür
+        timeout = budget(SANDBOX_TIMEOUT)
         container = client.containers.run(
             image=config["image"],
             command=cmd,
-            remove=True,  # İş bitince otomatik sil
-            detach=False,  # Çıktıyı bekle
-            stdout=True,
-            stderr=True,
+            detach=True,  # wait(timeout) ile bekle - süre dolarsa kill
             mem_limit="128m",  # Bellek sınırı
             cpu_period=100000,  # CPU sınırı
             cpu_quota=50000,   # CPU kullanımı %50 ile sınırla
@@ -150,15 +163,48 @@ def _run_code_in_docker(code_file_path: str, language: str = "python", client=No
             security_opt=["no-new-privileges"],  # Güvenlik
         )
         
-        # Çıktıyı decode et
-        output = container.decode('utf-8') if container else ""
+        start = time.perf_counter()
+        try:
+            with on_cancel(container.kill):
+                try:
+                    exit_status = container.wait(timeout=timeout).get("StatusCode", 0)
+                except Exception as wait_error:
+                    # requests ReadTimeout / ConnectionError: konteyner hâlâ çalışıyor
+                    _stop_container(container)
+                    deadline = current_deadline()
+                    if deadline is not None and deadline.cancelled:
+                        return {"status": "cancelled", "message": f"Sandbox durduruldu: {deadline.stop_reason()}"}
+                    return {
+                        "status": "timeout",
+                        "message": f"Code execution exceeded {timeout:.0f}s and the container was killed ({type(wait_error).__name__})"
+                    }
+            
+            deadline = current_deadline()
+            if deadline is not None and deadline.cancelled:
+                return {"status": "cancelled", "message": f"Sandbox durduruldu: {deadline.stop_reason()}"}
+            
+            # Çıktıyı decode et
+            output = container.logs(stdout=True, stderr=True).decode('utf-8')
+            stderr = container.logs(stdout=False, stderr=True).decode('utf-8')
+        finally:
+            _stop_container(container, remove=True)
+        
+        if exit_status != 0:
+            return {
+                "status": "runtime_error",
+                "output": output,
+                "stdout": output,
+                "stderr": stderr,
+                "exit_code": exit_status,
+                "message": f"Code execution failed with exit code {exit_status}"
+            }
         
         return {
             "status": "success",
             "output": output,
             "stdout": output,
-            "stderr": "",
-            "execution_time": "< 30s"
+            "stderr": stderr,
+            "execution_time": f"{time.perf_counter() - start:.1f}s"
         }
         
     except docker.errors.ContainerError as e:
@@ -190,7 +236,7 @@ def run_code_in_sandbox(code: str, language: str = "python") -> str:
     
     BU ARAÇ TAM GÜVENLİ:
     - Ana sistemden tamamen izole Docker konteyneri
-    - Bellek sınırı (128MB), CPU sınırı (%50), timeout (30s)
+    - Bellek sınırı (128MB), CPU sınırı (%50), timeout (30s veya görevin kalan süre bütçesi)
     - Ağ erişimi kapalı, dosya sistemi salt okunur
     - Root olmayan kullanıcı, güvenlik kısıtlamaları
     
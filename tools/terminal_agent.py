@@ -10,6 +10,9 @@ import json
 import time
 import asyncio
 import subprocess
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -21,6 +24,13 @@ import re
 # Add parent directory to path to import from project root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.deadline import run_process, ToolCancelled
+from utils.llm_cache import cached_llm
+from utils.llm_scheduler import scheduled_llm, provider_of, request_priority, PRIORITY_BATCH
+from utils.llm_hedge import get_hedger
+from utils.llm_registry import get_registry
+from utils.llm_accounting import accounted, accounting_scope, get_accountant
+
 try:
     from langchain_groq import ChatGroq
     from langchain_google_genai import ChatGoogleGenerativeAI
@@ -58,6 +68,52 @@ except ImportError:
     from rich.prompt import Prompt, Confirm
     from rich.markdown import Markdown
 
+# Provider preference: Gemini (best Turkish support), GPT-3.5-Turbo, then Groq (fast, limited Turkish)
+TERMINAL_LLM_PREFERENCE = ("gemini", "openai", "groq")
+TERMINAL_LLM_MODELS = {"gemini": "gemini-1.5-flash", "openai": "gpt-3.5-turbo", "groq": "llama-3.1-70b-versatile"}
+_LLM_READY_MESSAGES = {
+    "gemini": "[green]🤖 Gemini 1.5 Flash ready (Turkish optimized)[/green]",
+    "openai": "[cyan]🧠 GPT-3.5-Turbo ready (good Turkish support)[/cyan]",
+    "groq": "[magenta]⚡ Groq Llama ready (limited Turkish)[/magenta]",
+}
+
+def terminal_llm(provider: str):
+    """Pooled terminal-agent client for a provider (same object for every agent/classifier)"""
+    return get_registry().client(provider, model=TERMINAL_LLM_MODELS[provider], temperature=0.1)
+
+def initialize_best_available_llm(announce=print):
+    """First configured provider that is not quota-blocked or failing, per the registry's health"""
+    if not LANGCHAIN_AVAILABLE:
+        return None
+    llm = get_registry().best_available(TERMINAL_LLM_PREFERENCE, models=TERMINAL_LLM_MODELS, temperature=0.1)
+    if llm is None:
+        announce("[red]❌ No LLM available - using pattern-based fallback only[/red]")
+        return None
+    announce(_LLM_READY_MESSAGES[llm.provider])
+    return llm
+
+# Categories, Turkish patterns and examples shared by the single and batched classification prompts
+INTENT_CLASSIFICATION_GUIDE = """KATEGORILER:
+1. CHAT - Sohbet, selamlaşma, yetenek soruları, bilgi istekleri
+2. FILE_OPERATION - Dosya işlemleri (oluşturma, düzenleme, okuma, silme)
+3. SYSTEM_COMMAND - Terminal komutları, paket kurulumu, sistem işlemleri
+4. CODE_GENERATION - Kod yazma, geliştirme, programlama
+5. EXPLANATION - Açıklama, yardım, dokümantasyon
+6. PROJECT_MANAGEMENT - Çok adımlı proje görevleri
+
+ÖNEMLİ TÜRKÇE PATTERN'LAR (Yüksek güvenle CHAT):
+- "neler yapabilirsin", "ne yapabilirsin", "hangi özelliklerin var" → CHAT
+- "merhaba", "nasılsın", "selam", "orda mısın" → CHAT  
+- "hangi dosya dizininde", "nerede çalışıyorsun" → CHAT
+- "sen kimsin", "ne tür bir asistansın" → CHAT
+
+ÖRNEKLER:
+Girdi: "sen neler yapabilirsin" → Intent: CHAT, Confidence: 0.95
+Girdi: "hangi dosya dizininde çalışıyorsun" → Intent: CHAT, Confidence: 0.95
+Girdi: "python dosyası oluştur" → Intent: FILE_OPERATION, Confidence: 0.90
+Girdi: "run ls komutu" → Intent: SYSTEM_COMMAND, Confidence: 0.90"""
+INTENT_BATCH_SIZE = 10
+
 @dataclass
 class TaskStep:
     id: str
@@ -71,65 +127,36 @@ class TaskStep:
 class AdvancedIntentClassifier:
     """LLM-based intent classification for terminal commands vs chat"""
     
-    def __init__(self, llm=None):
+    def __init__(self, llm=None, hedge: bool = None):
         self.llm = llm
-        self.gemini_available = True  # Track Gemini availability
+        # Hedging: if the primary is slower than its p90, race the same prompt on the next provider
+        self.hedge = os.getenv("LLM_HEDGE", "0") == "1" if hedge is None else hedge
+        # classify_many counters: items answered by a batch call vs. re-classified one by one
+        self.batch_stats = {"batches": 0, "items": 0, "batched_items": 0, "item_fallbacks": 0, "failed_batches": 0}
+        self._batch_stats_lock = threading.Lock()
         
         if self.llm is None and LANGCHAIN_AVAILABLE:
             # Try LLMs in order of preference
             self.llm = self._initialize_best_available_llm()
     
     def _initialize_best_available_llm(self):
-        """Initialize the best available LLM with quota checking"""
-        
-        # 1. Try Gemini first (best Turkish support) with quota check
-        if ChatGoogleGenerativeAI and os.getenv("GOOGLE_API_KEY") and self.gemini_available:
-            try:
-                llm = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-flash",
-                    temperature=0.1,
-                    google_api_key=os.getenv("GOOGLE_API_KEY"),
-                    max_retries=0  # Disable LangChain's own retries for clean error handling
-                )
-                # Quick test to check if Gemini is working
-                test_response = llm.invoke([HumanMessage(content="test")])
-                print("🤖 [green]Gemini 1.5 Flash initialized (Turkish optimized)[/green]")
-                return llm
-            except Exception as e:
-                if "quota" in str(e).lower() or "rate limit" in str(e).lower():
-                    self.gemini_available = False
-                    print("⚠️ [yellow]Gemini quota exceeded, switching to backup[/yellow]")
-                else:
-                    print(f"⚠️ [yellow]Gemini unavailable: {str(e)[:50]}...[/yellow]")
-        
-        # 2. Try GPT-3.5-Turbo backup (good Turkish support)
-        if ChatOpenAI and os.getenv("OPENAI_API_KEY"):
-            try:
-                llm = ChatOpenAI(
-                    model="gpt-3.5-turbo",
-                    temperature=0.1,
-                    openai_api_key=os.getenv("OPENAI_API_KEY")
-                )
-                print("🧠 [cyan]GPT-3.5-Turbo initialized (good Turkish support)[/cyan]")
-                return llm
-            except Exception as e:
-                print(f"⚠️ [yellow]GPT-3.5-Turbo unavailable: {str(e)[:50]}...[/yellow]")
-        
-        # 3. Fallback to Groq (fast but limited Turkish)
-        if ChatGroq and os.getenv("GROQ_API_KEY"):
-            try:
-                llm = ChatGroq(
-                    model_name="llama-3.1-70b-versatile",
-                    temperature=0.1
-                )
-                print("⚡ [magenta]Groq Llama fallback initialized (limited Turkish)[/magenta]")
-                return llm
-            except Exception as e:
-                print(f"⚠️ [yellow]Groq unavailable: {str(e)[:50]}...[/yellow]")
-        
-        print("❌ [red]No LLM available - using fallback classification only[/red]")
-        return None
+        """Pick the best available LLM from the shared client registry (no test prompt)"""
+        return initialize_best_available_llm(print)
                 
+    @staticmethod
+    def _history_context(conversation_history: list = None) -> str:
+        """Last 3 turns as user + intent only: timestamps and routed responses change from run to run
+        and would make the prompt (and its cache/cassette key) different on every replay"""
+        if not conversation_history:
+            return "Yok"
+        turns = []
+        for entry in conversation_history[-3:]:
+            intent = entry.get("intent")
+            turns.append({"user": entry.get("user"),
+                          "intent": intent.get("intent") if isinstance(intent, dict) else intent})
+        return json.dumps(turns, ensure_ascii=False)
+
+    @accounted("AdvancedIntentClassifier")
     def classify_intent(self, user_input: str, conversation_history: list = None) -> dict:
         """Classify user input intent using LLM"""
         if not self.llm:
@@ -140,28 +167,10 @@ class AdvancedIntentClassifier:
         turkish_classification_prompt = f"""Sen Türkçe uzmanı bir intent classifier'sın. 
 Terminal AI agent için kullanıcı girdisini analiz et ve doğru kategoriyi belirle.
 
-KATEGORILER:
-1. CHAT - Sohbet, selamlaşma, yetenek soruları, bilgi istekleri
-2. FILE_OPERATION - Dosya işlemleri (oluşturma, düzenleme, okuma, silme)
-3. SYSTEM_COMMAND - Terminal komutları, paket kurulumu, sistem işlemleri
-4. CODE_GENERATION - Kod yazma, geliştirme, programlama
-5. EXPLANATION - Açıklama, yardım, dokümantasyon
-6. PROJECT_MANAGEMENT - Çok adımlı proje görevleri
-
-ÖNEMLİ TÜRKÇE PATTERN'LAR (Yüksek güvenle CHAT):
-- "neler yapabilirsin", "ne yapabilirsin", "hangi özelliklerin var" → CHAT
-- "merhaba", "nasılsın", "selam", "orda mısın" → CHAT  
-- "hangi dosya dizininde", "nerede çalışıyorsun" → CHAT
-- "sen kimsin", "ne tür bir asistansın" → CHAT
-
-ÖRNEKLER:
-Girdi: "sen neler yapabilirsin" → Intent: CHAT, Confidence: 0.95
-Girdi: "hangi dosya dizininde çalışıyorsun" → Intent: CHAT, Confidence: 0.95
-Girdi: "python dosyası oluştur" → Intent: FILE_OPERATION, Confidence: 0.90
-Girdi: "run ls komutu" → Intent: SYSTEM_COMMAND, Confidence: 0.90
+{INTENT_CLASSIFICATION_GUIDE}
 
 BAĞLAM:
-Önceki konuşma: {conversation_history[-3:] if conversation_history else "Yok"}
+Önceki konuşma: {self._history_context(conversation_history)}
 Mevcut girdi: "{user_input}"
 
 SADECE JSON döndür:
@@ -178,8 +187,21 @@ SADECE JSON döndür:
     "reasoning": "bu kategoriyi seçme nedeni"
 }}"""
 
+        if self.hedge:
+            try:
+                provider, result = get_hedger().invoke(self.hedge_candidates(),
+                                                       [HumanMessage(content=turkish_classification_prompt)],
+                                                       validate=self._parse_json_strict)
+                return result
+            except Exception as e:
+                print(f"⚠️ LLM error (all providers): {str(e)[:50]}...")
+                return self._fallback_classification(user_input)
+
         try:
-            response = self.llm.invoke([HumanMessage(content=turkish_classification_prompt)])
+            # Same input + same model -> cached classification (self.llm stays the raw model for isinstance checks).
+            # max_retries=0: on a rate limit fail fast to the backups below; the scheduler still pauses this provider
+            response = cached_llm(scheduled_llm(self.llm, max_retries=0)).invoke(
+                [HumanMessage(content=turkish_classification_prompt)])
             return self._parse_json_safe(response.content)
         except Exception as e:
             # Check if it's a quota/rate limit error for silent handling
@@ -197,37 +219,123 @@ SADECE JSON döndür:
                 return backup_result
             return self._fallback_classification(user_input)
     
+    @accounted("AdvancedIntentClassifier")
+    def classify_many(self, inputs: List[str], batch_size: int = INTENT_BATCH_SIZE,
+                      max_concurrency: int = 4) -> List[dict]:
+        """Classify many inputs with one LLM call per batch_size inputs (results in input order).
+        
+        Batches run concurrently at batch priority, so the shared scheduler rate-limits them behind
+        interactive requests. Items an unparseable or partial batch answer does not cover fall back
+        to classify_intent one by one.
+        """
+        inputs = list(inputs)
+        if not self.llm:
+            return [self._fallback_classification(text) for text in inputs]
+        batches = [inputs[i:i + batch_size] for i in range(0, len(inputs), batch_size)]
+        if not batches:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches))),
+                                thread_name_prefix="intent-batch") as pool:
+            # copy_context: each batch keeps the caller's accounting scope and deadline
+            futures = [pool.submit(contextvars.copy_context().run, self._classify_batch, batch) for batch in batches]
+            return [result for future in futures for result in future.result()]
+    
+    def _batch_prompt(self, batch: List[str]) -> str:
+        numbered = "\n".join(f"{index}. {json.dumps(text, ensure_ascii=False)}" for index, text in enumerate(batch, 1))
+        return f"""Sen Türkçe uzmanı bir intent classifier'sın. 
+Terminal AI agent için aşağıdaki {len(batch)} numaralı girdinin HER BİRİNİ ayrı ayrı analiz et ve doğru kategoriyi belirle.
+
+{INTENT_CLASSIFICATION_GUIDE}
+
+GİRDİLER:
+{numbered}
+
+SADECE JSON dizisi döndür - her girdi için bir nesne, girdilerle aynı sırada, "index" girdinin numarası:
+[
+    {{
+        "index": 1,
+        "intent": "kategori_adı",
+        "confidence": 0.95,
+        "entities": {{
+            "filename": "dosya_adı_varsa",
+            "command": "komut_varsa",
+            "language": "programlama_dili_varsa"
+        }},
+        "requires_execution": true,
+        "suggested_response_type": "chat_response",
+        "reasoning": "kısa neden"
+    }}
+]"""
+    
+    def _parse_batch(self, content: str, size: int) -> dict:
+        """Batch answer -> {position: classification}; raises if no usable item (whole batch falls back)"""
+        json_match = re.search(r'\[.*\]', content, re.DOTALL)
+        if not json_match:
+            raise ValueError("No JSON array in batch classification response")
+        items = json.loads(json_match.group())
+        if not isinstance(items, list):
+            raise ValueError("Batch classification response is not a list")
+        parsed = {}
+        for position, item in enumerate(items):
+            if not isinstance(item, dict) or "intent" not in item:
+                continue
+            index = item.pop("index", None)
+            # Trust the echoed index when it is in range, otherwise the array position
+            slot = index - 1 if isinstance(index, int) and 1 <= index <= size else position
+            if slot < size and slot not in parsed:
+                parsed[slot] = item
+        if not parsed:
+            raise ValueError("Batch classification response has no valid item")
+        return parsed
+    
+    def _classify_batch(self, batch: List[str]) -> List[dict]:
+        messages = [HumanMessage(content=self._batch_prompt(batch))]
+        parsed = {}
+        with request_priority(PRIORITY_BATCH):
+            try:
+                if self.hedge:
+                    _, parsed = get_hedger().invoke(self.hedge_candidates(), messages,
+                                                    validate=lambda response: self._parse_batch(response.content,
+                                                                                                len(batch)))
+                else:
+                    response = cached_llm(scheduled_llm(self.llm)).invoke(messages)
+                    parsed = self._parse_batch(response.content, len(batch))
+            except Exception as e:
+                print(f"⚠️ Batch classification failed ({len(batch)} inputs), classifying one by one: {str(e)[:50]}...")
+            with self._batch_stats_lock:
+                self.batch_stats["batches"] += 1
+                self.batch_stats["failed_batches"] += 0 if parsed else 1
+                self.batch_stats["items"] += len(batch)
+                self.batch_stats["batched_items"] += len(parsed)
+                self.batch_stats["item_fallbacks"] += len(batch) - len(parsed)
+            return [parsed[index] if index in parsed else self.classify_intent(text)
+                    for index, text in enumerate(batch)]
+    
+    def _backup_llm_candidates(self) -> list:
+        """Healthy backup LLMs from other providers than the primary (pooled, created once per process)"""
+        registry = get_registry()
+        primary = provider_of(self.llm) if self.llm else None
+        backup_llms = []
+        for provider, llm_name in (("openai", "GPT-3.5-Turbo"), ("groq", "Groq")):
+            if provider == primary or not registry.is_configured(provider):
+                continue
+            if not registry.health(provider).available:
+                continue  # last calls hit quota/errors - skip until it cools down
+            backup_llms.append((llm_name, terminal_llm(provider)))
+        return backup_llms
+    
+    def hedge_candidates(self) -> list:
+        """Primary + backups in preference order, as (provider, model) pairs for the hedger"""
+        llms = ([self.llm] if self.llm else []) + [llm for _, llm in self._backup_llm_candidates()]
+        # max_retries=0: a rate-limited provider loses the race instead of blocking it
+        return [(provider_of(llm), cached_llm(scheduled_llm(llm, max_retries=0))) for llm in llms]
+    
     def _try_backup_llms(self, user_input: str, prompt: str) -> dict:
         """Try backup LLMs when primary fails"""
-        backup_llms = []
-        
-        # Try GPT-3.5-Turbo if available
-        if ChatOpenAI and os.getenv("OPENAI_API_KEY") and not isinstance(self.llm, ChatOpenAI):
-            try:
-                backup_llm = ChatOpenAI(
-                    model="gpt-3.5-turbo",
-                    temperature=0.1,
-                    openai_api_key=os.getenv("OPENAI_API_KEY")
-                )
-                backup_llms.append(("GPT-3.5-Turbo", backup_llm))
-            except:
-                pass
-        
-        # Try Groq if available  
-        if ChatGroq and os.getenv("GROQ_API_KEY") and not isinstance(self.llm, ChatGroq):
-            try:
-                backup_llm = ChatGroq(
-                    model_name="llama-3.1-70b-versatile",
-                    temperature=0.1
-                )
-                backup_llms.append(("Groq", backup_llm))
-            except:
-                pass
-        
         # Try each backup LLM silently
-        for llm_name, backup_llm in backup_llms:
+        for llm_name, backup_llm in self._backup_llm_candidates():
             try:
-                response = backup_llm.invoke([HumanMessage(content=prompt)])
+                response = cached_llm(scheduled_llm(backup_llm, max_retries=0)).invoke([HumanMessage(content=prompt)])
                 result = self._parse_json_safe(response.content)
                 # Only show success message once per session
                 if not hasattr(self, f'_{llm_name.lower()}_success_shown'):
@@ -339,6 +447,16 @@ SADECE JSON döndür:
             "suggested_response_type": "command_execution"
         }
     
+    def _parse_json_strict(self, response) -> dict:
+        """Parse a classification or raise - an invalid answer must not win a hedged race"""
+        json_match = re.search(r'\{.*\}', response.content, re.DOTALL)
+        if not json_match:
+            raise ValueError("No JSON object in classification response")
+        result = json.loads(json_match.group())
+        if not isinstance(result, dict) or "intent" not in result:
+            raise ValueError("Classification response has no intent")
+        return result
+    
     def _parse_json_safe(self, content: str) -> dict:
         """Safely parse JSON from LLM response"""
         try:
@@ -359,6 +477,7 @@ class ResponseRouter:
         self.llm = llm
         self.console = console or Console()
         
+    @accounted("ResponseRouter")
     def route_response(self, intent_result: dict, user_input: str) -> dict:
         """Route response based on classified intent"""
         intent = intent_result.get('intent', 'SYSTEM_COMMAND')
@@ -554,20 +673,20 @@ class CommandExecutor:
                 if re.search(pattern, command, re.IGNORECASE):
                     return False, "", f"Dangerous command blocked: {command}"
             
-            # Execute command
-            result = subprocess.run(
+            # Execute command - the whole process group is killed on timeout/cancel
+            result = run_process(
                 command,
                 shell=True,
-                capture_output=True,
-                text=True,
                 timeout=timeout,
                 cwd=self.working_directory
             )
             
             return result.returncode == 0, result.stdout, result.stderr
             
-        except subprocess.TimeoutExpired:
-            return False, "", f"Command timed out after {timeout} seconds"
+        except subprocess.TimeoutExpired as e:
+            return False, "", f"Command timed out after {e.timeout:.0f} seconds"
+        except ToolCancelled as e:
+            return False, "", f"Command cancelled: {e}"
         except Exception as e:
             return False, "", f"Execution error: {str(e)}"
     
@@ -739,12 +858,15 @@ class MemorySystem:
             pass  # Silent fail for session loading
 
 class TerminalAgent:
-    def __init__(self):
+    def __init__(self, hedge: bool = None):
         self.console = Console()
         self.executor = CommandExecutor(self.console)
         self.error_handler = ErrorHandler(self.console)
         self.planner = TaskPlanner(self.console)  # Keep for compatibility
         self.memory = MemorySystem()
+        self.hedge = os.getenv("LLM_HEDGE", "0") == "1" if hedge is None else hedge
+        # Token/latency accounting groups every LLM call of this run under one session
+        self.session_id = datetime.now().strftime("terminal-%Y%m%d-%H%M%S")
         
         # New LLM-based components  
         self.llm = None
@@ -756,58 +878,12 @@ class TerminalAgent:
         self._init_components()
     
     def _initialize_best_available_llm(self):
-        """Initialize the best available LLM with quota checking (same as AdvancedIntentClassifier)"""
-        
-        # 1. Try Gemini first (best Turkish support) with quota check
-        if ChatGoogleGenerativeAI and os.getenv("GOOGLE_API_KEY"):
-            try:
-                llm = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-flash",
-                    temperature=0.1,
-                    google_api_key=os.getenv("GOOGLE_API_KEY"),
-                    max_retries=0  # Disable LangChain's own retries for clean error handling
-                )
-                # Quick test to check if Gemini is working
-                test_response = llm.invoke([HumanMessage(content="test")])
-                self.console.print("[green]🤖 Gemini 1.5 Flash ready (Turkish optimized)[/green]")
-                return llm
-            except Exception as e:
-                if "quota" in str(e).lower() or "rate limit" in str(e).lower():
-                    self.console.print("[yellow]🔄 Gemini quota exceeded, using backup LLM[/yellow]")
-                else:
-                    self.console.print(f"[yellow]⚠️ Gemini unavailable, trying alternatives[/yellow]")
-        
-        # 2. Try GPT-3.5-Turbo backup (good Turkish support)
-        if ChatOpenAI and os.getenv("OPENAI_API_KEY"):
-            try:
-                llm = ChatOpenAI(
-                    model="gpt-3.5-turbo",
-                    temperature=0.1,
-                    openai_api_key=os.getenv("OPENAI_API_KEY")
-                )
-                self.console.print("[cyan]🧠 GPT-3.5-Turbo ready (good Turkish support)[/cyan]")
-                return llm
-            except Exception as e:
-                self.console.print(f"[yellow]⚠️ GPT-3.5-Turbo unavailable[/yellow]")
-        
-        # 3. Fallback to Groq (fast but limited Turkish)
-        if ChatGroq and os.getenv("GROQ_API_KEY"):
-            try:
-                llm = ChatGroq(
-                    model_name="llama-3.1-70b-versatile",
-                    temperature=0.1
-                )
-                self.console.print("[magenta]⚡ Groq Llama ready (limited Turkish)[/magenta]")
-                return llm
-            except Exception as e:
-                self.console.print(f"[yellow]⚠️ Groq unavailable[/yellow]")
-        
-        self.console.print("[red]❌ No LLM available - using pattern-based fallback only[/red]")
-        return None
+        """Pick the best available LLM from the shared client registry (same as AdvancedIntentClassifier)"""
+        return initialize_best_available_llm(self.console.print)
     
     def _init_components(self):
         """Initialize agent components after LLM is ready"""
-        self.intent_classifier = AdvancedIntentClassifier(self.llm)
+        self.intent_classifier = AdvancedIntentClassifier(self.llm, hedge=self.hedge)
         self.response_router = ResponseRouter(self.llm, self.console)
         self.conversation_history = []
         
@@ -986,6 +1062,15 @@ Similar to Claude Code, but running locally!
         
         return "✅ File created, tested, and verified successfully!"
     
+    @accounted("TerminalAgent")
+    def _invoke_llm(self, prompt: str):
+        """Single prompt to the LLM - hedged across providers when hedging is enabled"""
+        messages = [HumanMessage(content=prompt)]
+        if self.hedge:
+            provider, response = get_hedger().invoke(self.intent_classifier.hedge_candidates(), messages)
+            return response
+        return cached_llm(scheduled_llm(self.llm)).invoke(messages)
+    
     def _attempt_syntax_fix(self, filename: str, original_content: str, error_message: str) -> str:
         """Attempt to fix syntax errors using LLM"""
         self.console.print("🔧 [yellow]Attempting to fix syntax error...[/yellow]")
@@ -1002,7 +1087,7 @@ Similar to Claude Code, but running locally!
                 Please provide the corrected Python code. Return ONLY the fixed code, nothing else:
                 """
                 
-                response = self.llm.invoke([HumanMessage(content=fix_prompt)])
+                response = self._invoke_llm(fix_prompt)
                 fixed_content = response.content.strip()
                 
                 # Remove code block markers if present
@@ -1071,7 +1156,7 @@ Similar to Claude Code, but running locally!
                 Respond with practical suggestions only, one per line:
                 """
                 
-                response = self.llm.invoke([HumanMessage(content=recovery_prompt)])
+                response = self._invoke_llm(recovery_prompt)
                 self.console.print(f"🤖 [blue]AI Suggestions:[/blue]")
                 for line in response.content.strip().split('\n'):
                     if line.strip():
@@ -1315,7 +1400,8 @@ The agent understands natural language commands and converts them to terminal op
                 if not user_input.strip():
                     continue
                 
-                result = self.process_request(user_input)
+                with accounting_scope(session=self.session_id):
+                    result = self.process_request(user_input)
                 
                 if result == "exit":
                     self.console.print("\n👋 [bold blue]Goodbye! Session saved.[/bold blue]")
@@ -1330,6 +1416,9 @@ The agent understands natural language commands and converts them to terminal op
             traceback.print_exc()
         finally:
             self.memory.save_session()
+            if self.hedge:
+                self.console.print(get_hedger().summary_line())
+            self.console.print(get_accountant().summary_line(session=self.session_id))
 
 if __name__ == "__main__":
     agent = TerminalAgent()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+🎯 ANSWER CACHE - Tekrarlanan Görevler İçin Final Cevap Önbelleği
+Aynı görev (normalize edilmiş metin) aynı çalışma alanı durumunda tekrar istenirse
+ajan hattı hiç çalışmadan kayıtlı final cevap milisaniyeler içinde döner.
+
+Anahtar: normalize görev metni + ajan yapılandırması (namespace) + çalışma alanı parmak izi
+(git HEAD, kirli dosya listesi ve bu dosyaların boyut/mtime bilgisi; git yoksa dosya ağacı hash'i).
+Kayıt görev BİTTİKTEN sonraki parmak iziyle yazılır: dosya yazan bir görevin cevabı, çalışma
+alanı o görevin bıraktığı halde kaldıkça geçerlidir - dosya değişince kendiliğinden geçersizleşir.
+
+Yan etkili görevler için açık çıkış: use_cache=False (çağrı başına) veya answer_cache=False (ajan).
+Depolama LLM cevap önbelleğiyle aynı iki seviyeli yapı (bellek LRU + disk, TTL).
+
+Ortam değişkenleri:
+    ANSWER_CACHE=off               final cevap önbelleğini kapat
+    ANSWER_CACHE_DIR               disk deposu (varsayılan logs/answer_cache)
+    ANSWER_CACHE_TTL               kayıt ömrü, saniye (varsayılan 900)
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import subprocess
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utils.llm_cache import LLMResponseCache, _normalize_text
+
+DEFAULT_ANSWER_CACHE_DIR = os.path.join("logs", "answer_cache")
+DEFAULT_ANSWER_CACHE_TTL = 900
+# Ajanın kendi kayıtları (izler, checkpoint'ler, önbellekler) parmak izini değiştirmesin
+IGNORED_DIRS = {".git", "logs", "__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache",
+                ".venv", "venv", "node_modules"}
+_TASK_PUNCTUATION = " .!?…'\"`"
+
+
+def normalize_task(text: str) -> str:
+    """Büyük/küçük harf, boşluk ve sondaki noktalama farkları anahtarı değiştirmesin.
+    I/İ/ı/i hepsi 'i' olur - "GIT" ile "git" (ASCII komutlar) ve Türkçe yazımlar aynı anahtara düşer"""
+    text = _normalize_text(text.replace("İ", "i").lower().replace("ı", "i"))
+    return text.strip(_TASK_PUNCTUATION)
+
+
+def _ignored(path: str) -> bool:
+    return any(part in IGNORED_DIRS for part in path.replace(os.sep, "/").split("/"))
+
+
+def _stat_entry(base: str, path: str) -> str:
+    try:
+        stat = os.stat(os.path.join(base, path))
+        return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+    except OSError:
+        return f"{path}|silindi"
+
+
+def _git(root: str, *args: str) -> Optional[str]:
+    try:
+        completed = subprocess.run(["git", "-C", root, *args], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return completed.stdout if completed.returncode == 0 else None
+
+
+_toplevels: Dict[str, Optional[str]] = {}
+
+
+def _git_toplevel(root: str) -> Optional[str]:
+    """Depo kökü (dizin başına bir kez sorulur) - git yoksa None"""
+    if root not in _toplevels:
+        output = _git(root, "rev-parse", "--show-toplevel")
+        _toplevels[root] = output.strip() if output else None
+    return _toplevels[root]
+
+
+def _git_fingerprint(root: str, toplevel: str) -> Optional[Dict[str, Any]]:
+    """Tek 'git status' çağrısı: HEAD + kirli dosyalar (izlenmeyenler dahil, .gitignore hariç)"""
+    output = _git(root, "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=all")
+    if output is None:
+        return None
+    head, entries = None, []
+    items = iter(output.split("\0"))
+    for item in items:
+        if item.startswith("# branch.oid "):
+            head = item[len("# branch.oid "):]
+            continue
+        if item.startswith("1 "):
+            path = item.split(" ", 8)[8]
+        elif item.startswith("2 "):
+            path = item.split(" ", 9)[9]
+            next(items, None)  # yeniden adlandırmanın eski yolu
+        elif item.startswith("u "):
+            path = item.split(" ", 10)[10]
+        elif item.startswith("? "):
+            path = item[2:]
+        else:
+            continue
+        if not _ignored(path):
+            entries.append(f"{item[:2]}{_stat_entry(toplevel, path)}")
+    entries.sort()
+    digest = hashlib.sha256("\n".join([head or ""] + entries).encode("utf-8")).hexdigest()
+    return {"head": head, "dirty": bool(entries), "changed_files": len(entries), "tree": digest[:16]}
+
+
+def _walk_fingerprint(root: str) -> Dict[str, Any]:
+    """Git dışı dizin: tüm dosyaların yol/boyut/mtime hash'i"""
+    entries = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in IGNORED_DIRS]
+        for name in filenames:
+            entries.append(_stat_entry(root, os.path.relpath(os.path.join(directory, name), root)))
+    entries.sort()
+    digest = hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+    return {"head": None, "dirty": None, "changed_files": len(entries), "tree": digest[:16]}
+
+
+def workspace_fingerprint(root: str = ".") -> Dict[str, Any]:
+    """{"head", "dirty", "changed_files", "tree"} - çalışma alanı değişince tree değişir"""
+    root = os.path.abspath(root)
+    toplevel = _git_toplevel(root)
+    fingerprint = _git_fingerprint(root, toplevel) if toplevel else None
+    return fingerprint or _walk_fingerprint(root)
+
+
+def flag_answer(answer: str, hit: Dict[str, Any]) -> str:
+    """Önbellekten dönen cevabın başına görünür işaret"""
+    return (f"⚡ [Önbellekten: {hit['age_s']:.0f} sn önceki aynı görevin cevabı, "
+            f"{hit['lookup_ms']:.0f} ms] {answer}")
+
+
+class AnswerCache:
+    """Görev cevapları için anahtar üretimi + istatistikler; kayıtlar LLMResponseCache deposunda"""
+
+    def __init__(self, root: str = ".", directory: Optional[str] = DEFAULT_ANSWER_CACHE_DIR,
+                 ttl: Optional[float] = DEFAULT_ANSWER_CACHE_TTL, enabled: bool = True,
+                 fingerprint: Callable[[str], Dict[str, Any]] = workspace_fingerprint):
+        self.root = root
+        self.enabled = enabled
+        self.fingerprint = fingerprint
+        self.store = LLMResponseCache(directory=directory, ttl=ttl, max_temperature=None)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "opted_out": 0, "not_stored": 0}
+
+    @classmethod
+    def from_env(cls) -> "AnswerCache":
+        return cls(directory=os.getenv("ANSWER_CACHE_DIR", DEFAULT_ANSWER_CACHE_DIR),
+                   ttl=float(os.getenv("ANSWER_CACHE_TTL", str(DEFAULT_ANSWER_CACHE_TTL))),
+                   enabled=os.getenv("ANSWER_CACHE", "on").lower() not in ("off", "0", "false", "no"))
+
+    def _count(self, field: str):
+        with self._lock:
+            self.stats[field] += 1
+
+    def key(self, task: str, namespace: str = "") -> str:
+        payload = json.dumps({"task": normalize_task(task), "namespace": namespace,
+                              "workspace": self.fingerprint(self.root)}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, task: str, namespace: str = "", use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """Hit: {"answer", "age_s", "lookup_ms", ...} - kapalı, çıkış yapılmış veya miss ise None"""
+        if not (use_cache and self.enabled):
+            self._count("opted_out")
+            return None
+        start = time.perf_counter()
+        value = self.store.get(self.key(task, namespace))
+        if value is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return dict(value, age_s=time.time() - value["stored_at"],
+                    lookup_ms=(time.perf_counter() - start) * 1000)
+
+    def put(self, task: str, answer: Any, namespace: str = "", use_cache: bool = True, cacheable: bool = True,
+            **meta) -> bool:
+        """Görev bittikten sonra çağrılır - anahtar güncel (görev sonrası) çalışma alanı durumuyla"""
+        if not (use_cache and self.enabled):
+            return False
+        if not cacheable:
+            self._count("not_stored")
+            return False
+        try:
+            self.store.put(self.key(task, namespace), dict(meta, answer=answer, stored_at=time.time()))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Cevap önbelleğine yazılamadı: {e}")
+            return False
+        self._count("stores")
+        return True
+
+    def clear(self):
+        self.store.clear()
+
+    def report(self) -> str:
+        with self._lock:
+            s = dict(self.stats)
+        return (f"🎯 Cevap önbelleği: {s['hits']} hit / {s['misses']} miss, {s['stores']} kayıt, "
+                f"{s['not_stored']} saklanmayan (hata/yan etki), {s['opted_out']} bypass")
+
+
+_default_cache: Optional[AnswerCache] = None
+_default_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Süreç genelindeki final cevap önbelleği (ortam değişkenlerinden, lazy)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = AnswerCache.from_env()
+        return _default_cache
+
+
+class CachedAgent:
+    """
+    run(query) -> dict döndüren ajanlar (GraphAgent) için sarmalayıcı: hit'te ajan çalışmaz,
+    sonuç "answer_cache" alanıyla işaretlenir. "result" metnine dokunulmaz (kod çıkaran
+    çağıranlar bozulmasın) - sohbette göstermek için flag_answer(result, answer_cache).
+    Hatalı sonuçlar (method="error_fallback" veya hata durumlu adım) ve unsafe_tools'tan
+    birini kullanan sonuçlar saklanmaz.
+    """
+
+    def __init__(self, agent: Any, namespace: str = "", cache: Optional[AnswerCache] = None,
+                 unsafe_tools: Iterable[str] = ()):
+        self.agent = agent
+        self.namespace = namespace or type(agent).__name__
+        self.cache = cache
+        self.unsafe_tools = frozenset(unsafe_tools)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.agent, name)
+
+    def _cache(self) -> AnswerCache:
+        return self.cache if self.cache is not None else get_answer_cache()
+
+    def _cacheable(self, result: Any) -> bool:
+        if not isinstance(result, dict) or result.get("method") == "error_fallback":
+            return False
+        for step in result.get("intermediate_steps") or []:
+            if isinstance(step, dict) and (step.get("status") == "error" or step.get("tool_used") in self.unsafe_tools):
+                return False
+        return True
+
+    def run(self, query: str, *args, use_cache: bool = True, **kwargs) -> Dict[str, Any]:
+        cache = self._cache()
+        use_cache = use_cache and not args and not kwargs
+        hit = cache.lookup(query, self.namespace, use_cache)
+        if hit is not None:
+            print(f"🎯 Cevap önbelleğinden döndü ({hit['lookup_ms']:.1f} ms): {query[:60]}")
+            result = dict(hit["answer"])
+            result["answer_cache"] = {"hit": True, "age_s": round(hit["age_s"], 1),
+                                      "lookup_ms": round(hit["lookup_ms"], 3)}
+            result["execution_time"] = hit["lookup_ms"] / 1000
+            return result
+        result = self.agent.run(query, *args, **kwargs)
+        stored = cache.put(query, result, self.namespace, use_cache, self._cacheable(result))
+        if isinstance(result, dict):
+            result = dict(result, answer_cache={"hit": False, "stored": stored})
+        return result
+
+
+def cached_agent(agent: Any, **options) -> Any:
+    """Ajanı final cevap önbelleğiyle sarmala (zaten sarmalıysa aynen)"""
+    if agent is None or isinstance(agent, CachedAgent):
+        return agent
+    return CachedAgent(agent, **options)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+💾 CHECKPOINT - Çökmeye Dayanıklı ReAct Görev Kaydı
+Her tamamlanan adımın yeni mesajları, scratchpad'i ve eylem kaydı append-only
+JSONL dosyasına yazılır (flush + fsync). Süreç ölse veya API düşse bile görev
+son tamamlanan adımdan, LLM'i tekrar çağırmadan devam ettirilebilir.
+"""
+
+import os
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+DEFAULT_CHECKPOINT_DIR = os.path.join("logs", "checkpoints")
+
+
+def new_task_id() -> str:
+    """Sıralanabilir, çakışmayan görev kimliği: 20250122-143005-a1b2c3"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def serialize_message(message, observation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """LangChain mesajını JSON'a çevir - gözlem bilgisi (araç, hafıza anahtarları) ile"""
+    content = getattr(message, "content", "")
+    data = {"type": getattr(message, "type", "human"),
+            "content": content if isinstance(content, (str, list)) else str(content)}
+    if getattr(message, "tool_calls", None):
+        data["tool_calls"] = message.tool_calls
+    if getattr(message, "tool_call_id", None):
+        data["tool_call_id"] = message.tool_call_id
+    if observation:
+        data["observation"] = observation
+    return data
+
+
+def deserialize_message(data: Dict[str, Any]):
+    """serialize_message'ın tersi"""
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+    message_type = data.get("type")
+    content = data.get("content", "")
+    if message_type == "system":
+        return SystemMessage(content=content)
+    if message_type == "ai":
+        return AIMessage(content=content, tool_calls=data.get("tool_calls") or [])
+    if message_type == "tool":
+        return ToolMessage(content=content, tool_call_id=data.get("tool_call_id", ""))
+    return HumanMessage(content=content)
+
+
+class TaskCheckpoint:
+    """Tek bir görevin append-only checkpoint dosyası"""
+
+    def __init__(self, task_id: str, directory: str = DEFAULT_CHECKPOINT_DIR):
+        self.task_id = task_id
+        self.directory = Path(directory)
+        self.path = self.directory / f"{task_id}.jsonl"
+
+    def _append(self, record: Dict[str, Any]):
+        """Tek satır yaz ve diske indir - yarım kalan satır yüklemede atlanır"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record["ts"] = time.time()
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record_start(self, user_task: str, messages: List, max_iterations: int, native_tools: bool):
+        self._append({"type": "start", "task_id": self.task_id, "user_task": user_task,
+                      "max_iterations": max_iterations, "native_tools": native_tools,
+                      "messages": [serialize_message(m) for m in messages]})
+
+    def record_step(self, iteration: int, new_messages: List, scratchpad: dict,
+                    step_log: Dict[str, Any], history=None):
+        """Tamamlanan adım: yeni mesajlar, scratchpad'in tam hali ve eylem kaydı"""
+        serialized = [serialize_message(m, history.observation_info(m) if history else None)
+                      for m in new_messages]
+        self._append({"type": "step", "iteration": iteration, "messages": serialized,
+                      "scratchpad": scratchpad, "thought": step_log.get("thought"),
+                      "actions": step_log.get("actions", [])})
+
+    def record_final(self, result: str):
+        self._append({"type": "final", "result": result})
+
+    def record_error(self, iteration: int, error: str):
+        """Görevi bitirmeyen hata (örn. API bağlantısı) - resume bu adımdan devam eder"""
+        self._append({"type": "error", "iteration": iteration, "error": error})
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Checkpoint'ten görev durumunu yeniden kur.
+
+        Returns:
+            {"user_task", "max_iterations", "native_tools", "messages", "observations",
+             "scratchpad", "iteration", "final", "actions"}
+        """
+        if not self.path.exists():
+            raise FileNotFoundError(f"Checkpoint bulunamadı: {self.path}")
+
+        state: Dict[str, Any] = {"messages": [], "observations": [], "scratchpad": {},
+                                 "iteration": 0, "final": None, "actions": []}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # çökme sırasında yarım yazılmış son satır
+
+                if record["type"] == "start":
+                    state.update(user_task=record["user_task"], max_iterations=record["max_iterations"],
+                                 native_tools=record.get("native_tools", False))
+                    state["messages"] = [deserialize_message(m) for m in record["messages"]]
+                elif record["type"] == "step":
+                    for data in record["messages"]:
+                        message = deserialize_message(data)
+                        state["messages"].append(message)
+                        if data.get("observation"):
+                            state["observations"].append((message, data["observation"]))
+                    state["scratchpad"] = record["scratchpad"]
+                    state["iteration"] = record["iteration"]
+                    state["actions"].append(record.get("actions", []))
+                elif record["type"] == "final":
+                    state["final"] = record["result"]
+
+        if "user_task" not in state:
+            raise ValueError(f"Checkpoint başlangıç kaydı eksik: {self.path}")
+        return state
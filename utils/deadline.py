@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+⏳ DEADLINE - Görev Süre Bütçesi ve İşbirlikçi İptal
+Her görev tek bir Deadline taşır: araçlar sabit zaman aşımları yerine kalan bütçeyi
+(timeout_for) kullanır, çalıştırdıkları alt süreç/konteynerin öldürme fonksiyonunu
+kaydeder (on_cancel). cancel() çağrılınca kayıtlı tüm alt işler sonlandırılır.
+Aktif deadline contextvar'da durur - araç imzaları değişmez; thread'e geçerken
+contextvars.copy_context() ile taşınır.
+"""
+
+import os
+import time
+import signal
+import threading
+import subprocess
+import contextvars
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, List, Optional
+
+_CURRENT: "contextvars.ContextVar[Optional[Deadline]]" = contextvars.ContextVar("react_deadline", default=None)
+
+
+class ToolCancelled(Exception):
+    """Görev iptal edildi veya süre bütçesi bitti - araç başlatılmamalı/sürdürülmemeli"""
+
+
+class Deadline:
+    """Tek görevin süre bütçesi, iptal bayrağı ve araç çalıştırma kayıtları"""
+
+    def __init__(self, timeout: Optional[float] = None, task_id: Optional[str] = None):
+        self.timeout = timeout
+        self.task_id = task_id
+        self._expires_at = time.monotonic() + timeout if timeout else None
+        self._cancelled = threading.Event()
+        self.reason: Optional[str] = None
+        self._lock = threading.Lock()
+        self._killers: Dict[int, Callable[[], Any]] = {}
+        self._next_killer = 0
+        self.runs: List[Dict[str, Any]] = []  # araç başına {"tool", "status", "duration_ms"}
+
+    def remaining(self) -> Optional[float]:
+        """Kalan saniye (sınırsız görevde None)"""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self._expires_at is not None and time.monotonic() >= self._expires_at
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def stopped(self) -> bool:
+        return self.cancelled or self.expired
+
+    def stop_reason(self) -> str:
+        if self.cancelled:
+            return self.reason or "iptal edildi"
+        return f"{self.timeout:g} sn süre bütçesi doldu" if self.expired else ""
+
+    def cancel(self, reason: str = "iptal edildi"):
+        """İptal bayrağını kaldır ve çalışan tüm alt süreç/konteynerleri sonlandır"""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self.reason = reason
+            self._cancelled.set()
+            killers = list(self._killers.values())
+        for killer in killers:
+            try:
+                killer()
+            except Exception as e:
+                print(f"⚠️ İptal sırasında alt iş sonlandırılamadı: {e}")
+
+    def check(self):
+        """Bütçe bittiyse veya iptal edildiyse ToolCancelled fırlat"""
+        if self.stopped:
+            raise ToolCancelled(self.stop_reason())
+
+    def timeout_for(self, default: float) -> float:
+        """Aracın varsayılan zaman aşımını kalan bütçeyle sınırla"""
+        self.check()
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
+
+    @contextmanager
+    def on_cancel(self, killer: Callable[[], Any]):
+        """Blok süresince iptalde çağrılacak öldürme fonksiyonunu kaydet"""
+        with self._lock:
+            killer_id = self._next_killer
+            self._next_killer += 1
+            self._killers[killer_id] = killer
+            already_cancelled = self._cancelled.is_set()
+        if already_cancelled:
+            killer()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._killers.pop(killer_id, None)
+
+    @contextmanager
+    def track(self, tool_name: str):
+        """Araç çalıştırmasını kaydet: finished | cancelled | timed_out"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            status = "cancelled" if self.cancelled else "timed_out" if self.expired else "finished"
+            with self._lock:
+                self.runs.append({"tool": tool_name, "status": status,
+                                  "duration_ms": round((time.perf_counter() - start) * 1000, 3)})
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            runs = list(self.runs)
+        counts = {"finished": 0, "cancelled": 0, "timed_out": 0}
+        for run in runs:
+            counts[run["status"]] += 1
+        return {"timeout": self.timeout, "remaining": self.remaining(), "stopped": self.stop_reason() or None,
+                **counts, "runs": runs}
+
+    def summary_line(self) -> str:
+        report = self.report()
+        text = (f"⏳ Araç çalıştırmaları: {report['finished']} bitti, {report['cancelled']} iptal, "
+                f"{report['timed_out']} süre aşımı")
+        if report["remaining"] is not None:
+            text += f" (kalan bütçe {report['remaining']:.1f} sn)"
+        if report["stopped"]:
+            text += f" - görev durduruldu: {report['stopped']}"
+        return text
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Bu bağlamda çalışan görevin deadline'ı (yoksa None)"""
+    return _CURRENT.get()
+
+
+@contextmanager
+def use_deadline(deadline: Optional[Deadline]):
+    """Blok boyunca deadline'ı aktif yap"""
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def budget(default: float) -> float:
+    """Aktif deadline varsa kalan bütçeyle sınırlı zaman aşımı, yoksa varsayılan"""
+    deadline = current_deadline()
+    return deadline.timeout_for(default) if deadline is not None else default
+
+
+def on_cancel(killer: Callable[[], Any]):
+    """Aktif deadline'a öldürme fonksiyonu kaydet (deadline yoksa etkisiz)"""
+    deadline = current_deadline()
+    return deadline.on_cancel(killer) if deadline is not None else nullcontext()
+
+
+def _kill_process_tree(process: subprocess.Popen):
+    """Süreci ve (ayrı oturumda başlatıldıysa) tüm çocuklarını öldür"""
+    if process.poll() is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        process.kill()
+
+
+def run_process(args, timeout: float, text: bool = True, **popen_kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run(capture_output=True) yerine: zaman aşımı kalan görev bütçesiyle sınırlanır,
+    iptal/zaman aşımı/Ctrl+C durumunda süreç grubu öldürülür (shell=True çocukları dahil).
+
+    Raises:
+        subprocess.TimeoutExpired: süre doldu (mevcut araç hata yolları aynen çalışır)
+        ToolCancelled: görev iptal edildi
+    """
+    deadline = current_deadline()
+    timeout = deadline.timeout_for(timeout) if deadline is not None else timeout
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text,
+                               start_new_session=hasattr(os, "killpg"), **popen_kwargs)
+    with (deadline.on_cancel(lambda: _kill_process_tree(process)) if deadline is not None else nullcontext()):
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            _kill_process_tree(process)
+            process.communicate()
+            raise
+    if deadline is not None and deadline.cancelled:
+        raise ToolCancelled(deadline.stop_reason())
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
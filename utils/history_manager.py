@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+📚 HISTORY MANAGER - Token Bütçeli Mesaj Geçmişi
+ReAct döngüsünde eski gözlemleri, scratchpad anahtarına işaret eden kısa
+özetlerle değiştirerek prompt boyutunu bütçe içinde tutar.
+"""
+
+from typing import Dict, Any, List
+
+
+def estimate_tokens(text: str) -> int:
+    """Yerel token tahmini - tokenizer gerektirmez (~4 karakter = 1 token)"""
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
+
+def _message_tokens(message) -> int:
+    content = getattr(message, "content", "")
+    if not isinstance(content, str):
+        content = str(content)
+    return estimate_tokens(content) + 4  # rol/format ek yükü
+
+
+def _with_content(message, content: str):
+    """Mesajın (tool_call_id gibi alanları koruyarak) yeni içerikli kopyasını üret"""
+    if hasattr(message, "model_copy"):
+        return message.model_copy(update={"content": content})
+    return message.copy(update={"content": content})
+
+
+class MessageHistoryManager:
+    """Sistem prompt'u ve görevi aynen tutar, son N gözlem dışındakileri özetler"""
+
+    def __init__(self, token_budget: int = 6000, keep_last_observations: int = 3, preview_chars: int = 120):
+        self.token_budget = token_budget
+        self.keep_last_observations = keep_last_observations
+        self.preview_chars = preview_chars
+        self._observations: Dict[int, Dict[str, Any]] = {}
+        self._compacted_ids = set()
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self) -> Dict[str, int]:
+        return {"llm_calls": 0, "tokens_before": 0, "tokens_after": 0,
+                "tokens_saved": 0, "compacted_observations": 0,
+                "system_tokens": 0, "last_prompt_tokens": 0, "max_prompt_tokens": 0}
+
+    def reset(self):
+        """Yeni görev için kayıtları ve sayaçları sıfırla"""
+        self._observations = {}
+        self._compacted_ids = set()
+        self.stats = self._empty_stats()
+
+    def register_observation(self, message, tool_name: str, scratchpad_key=None):
+        """Bir gözlem mesajını, hangi araçtan geldiği ve hangi hafıza anahtar(lar)ında durduğu ile kaydet"""
+        if isinstance(scratchpad_key, str):
+            scratchpad_key = [scratchpad_key]
+        self._observations[id(message)] = {"tool": tool_name, "keys": list(scratchpad_key or [])}
+
+    def observation_info(self, message) -> Dict[str, Any]:
+        """Kayıtlı gözlem bilgisi ({"tool", "keys"}) - gözlem değilse boş sözlük"""
+        return dict(self._observations.get(id(message), {}))
+
+    def _summarize(self, message, info: Dict[str, Any]) -> str:
+        content = getattr(message, "content", "") or ""
+        body = content[len("Observation: "):] if content.startswith("Observation: ") else content
+        first_line = next((line.strip() for line in body.splitlines() if line.strip()), "")
+        preview = first_line[:self.preview_chars] + ("..." if len(first_line) > self.preview_chars else "")
+        if info.get("keys"):
+            location = "Tam veri: " + ", ".join(f"scratchpad['{key}']" for key in info["keys"])
+        else:
+            location = "Tam veri artık prompt'ta değil"
+        summary = f"🗜️ [ÖZET] {info.get('tool') or 'araç'} gözlemi ({estimate_tokens(body)} token) kısaltıldı. {preview} | {location}"
+        return f"Observation: {summary}" if content.startswith("Observation: ") else summary
+
+    def compact(self, messages: List) -> List:
+        """LLM'e gidecek mesaj listesini bütçeye sığdır - orijinal liste değişmez"""
+        tokens_before = sum(_message_tokens(m) for m in messages)
+        result = list(messages)
+        tokens_after = tokens_before
+
+        if tokens_before > self.token_budget:
+            # İlk iki mesaj (sistem + görev) aynen kalır; son N gözlem korunur
+            observation_indexes = [i for i, m in enumerate(result)
+                                   if i >= 2 and id(m) in self._observations]
+            keep = self.keep_last_observations
+            compactable = observation_indexes[:-keep] if keep > 0 else observation_indexes
+
+            for index in compactable:
+                if tokens_after <= self.token_budget:
+                    break
+                original = result[index]
+                summary = self._summarize(original, self._observations[id(original)])
+                replaced = _with_content(original, summary)
+                tokens_after -= _message_tokens(original) - _message_tokens(replaced)
+                result[index] = replaced
+                self._compacted_ids.add(id(original))
+
+        self.stats["compacted_observations"] = len(self._compacted_ids)
+        self.stats["llm_calls"] += 1
+        self.stats["tokens_before"] += tokens_before
+        self.stats["tokens_after"] += tokens_after
+        self.stats["tokens_saved"] += tokens_before - tokens_after
+        # İstek başına gönderilen prompt boyutu (sistem prompt'u dahil)
+        self.stats["system_tokens"] = _message_tokens(result[0]) if result else 0
+        self.stats["last_prompt_tokens"] = tokens_after
+        self.stats["max_prompt_tokens"] = max(self.stats["max_prompt_tokens"], tokens_after)
+        return result
+
+    def prompt_size_line(self) -> str:
+        """Son isteğin prompt boyutu - döngü her LLM çağrısından önce yazdırır"""
+        s = self.stats
+        return f"📏 Prompt: {s['last_prompt_tokens']} token (sistem {s['system_tokens']})"
+
+    def report(self) -> str:
+        """Görev sonu token tasarrufu raporu"""
+        s = self.stats
+        ratio = (s["tokens_saved"] / s["tokens_before"] * 100) if s["tokens_before"] else 0.0
+        return (f"📚 Geçmiş sıkıştırma: {s['llm_calls']} LLM çağrısı, "
+                f"{s['tokens_before']} → {s['tokens_after']} token "
+                f"(~{s['tokens_saved']} token tasarruf, %{ratio:.1f}), "
+                f"{s['compacted_observations']} gözlem özetlendi, "
+                f"istek başına ort. {s['tokens_after'] // max(1, s['llm_calls'])} / en fazla {s['max_prompt_tokens']} token")
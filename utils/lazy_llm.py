@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+💤 LAZY LLM - İlk Kullanımda Oluşturulan LLM İstemcisi
+Modül import'unda ağ çağrısı yapmaz; istemci ilk invoke/bind_tools anında
+kurulur. İsteğe bağlı arka plan ısınması (warm-up) ve başlangıç ölçümü sağlar.
+"""
+
+import time
+import threading
+from typing import Callable, Any, Dict, Optional
+
+# Süreç başlangıcına en yakın referans noktası (bu modül ilk import edildiğinde)
+PROCESS_START = time.perf_counter()
+
+
+class LazyLLM:
+    """LLM istemcisini saran vekil (proxy) - gerçek istemci ilk erişimde oluşturulur"""
+
+    def __init__(self, factory: Callable[[], Any], name: str = "llm"):
+        self._factory = factory
+        self._name = name
+        self._client = None
+        self._lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, Any] = {
+            "init_ms": None,          # istemci oluşturma süresi
+            "warmup_ms": None,        # ısınma çağrısı (ilk round-trip) süresi
+            "warmup_error": None,
+            "time_to_first_prompt_ms": None,
+        }
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._client is not None
+
+    def get(self):
+        """Gerçek istemciyi döndür - gerekiyorsa (thread-safe) oluştur"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    start = time.perf_counter()
+                    self._client = self._factory()
+                    self.stats["init_ms"] = (time.perf_counter() - start) * 1000
+        return self._client
+
+    def __getattr__(self, attr):
+        # Sadece LazyLLM'de olmayan özellikler buraya düşer (invoke, ainvoke, bind_tools, ...)
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.get(), attr)
+
+    def warm_up(self, background: bool = True, probe: bool = True) -> Optional[threading.Thread]:
+        """
+        İstemciyi önceden hazırla.
+
+        Args:
+            background: True ise kullanıcı prompt'unu bekletmeden ayrı thread'de çalışır
+            probe: True ise kısa bir test çağrısı ile bağlantıyı (TLS/HTTP havuzu) ısıtır
+        """
+        def _run():
+            start = time.perf_counter()
+            try:
+                client = self.get()
+                if probe:
+                    from langchain_core.messages import HumanMessage
+                    client.invoke([HumanMessage(content="test")])
+                self.stats["warmup_ms"] = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                # Isınma hatası ölümcül değil - gerçek çağrı zaten retry mantığından geçer
+                self.stats["warmup_error"] = str(e)
+
+        if not background:
+            _run()
+            return None
+        if self._warmup_thread is None or not self._warmup_thread.is_alive():
+            self._warmup_thread = threading.Thread(target=_run, name=f"{self._name}-warmup", daemon=True)
+            self._warmup_thread.start()
+        return self._warmup_thread
+
+    def mark_first_prompt(self) -> float:
+        """Süreç başlangıcından kullanıcıya ilk prompt gösterilene kadar geçen süreyi kaydet"""
+        if self.stats["time_to_first_prompt_ms"] is None:
+            self.stats["time_to_first_prompt_ms"] = (time.perf_counter() - PROCESS_START) * 1000
+        return self.stats["time_to_first_prompt_ms"]
+
+    def __repr__(self):
+        state = "hazır" if self.is_initialized else "henüz oluşturulmadı"
+        return f"<LazyLLM {self._name}: {state}>"
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+🧾 LLM ACCOUNTING - Oturum / Sağlayıcı / Bileşen Bazında Token ve Gecikme Muhasebesi
+Havuzdaki (utils/llm_registry) her gerçek LLM çağrısı bir kayıt bırakır:
+giriş/çıkış token'ı (sağlayıcı bildirmezse yerel tahmin), duvar saati gecikmesi,
+kaçıncı deneme olduğu, sağlayıcı/model ve çağıran bağlam (oturum, görev, bileşen).
+Bağlam contextvar'da taşınır - çağrı imzaları değişmez:
+
+    with accounting_scope(session="dashboard-42", component="ResponseRouter"):
+        llm.invoke(...)
+
+Sorgu: get_accountant().query(group_by=("component",), session="dashboard-42")
+Periyodik dışa aktarım: LLM_ACCOUNTING_EXPORT=logs/llm_usage.jsonl (LLM_ACCOUNTING_INTERVAL sn)
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.history_manager import estimate_tokens
+from utils.tracing import percentile
+
+DEFAULT_EXPORT_PATH = os.path.join("logs", "llm_usage.jsonl")
+GROUP_FIELDS = ("session", "task", "component", "provider", "model", "status")
+
+_SCOPE: "contextvars.ContextVar[Dict[str, Optional[str]]]" = contextvars.ContextVar("llm_accounting_scope",
+                                                                                   default={})
+_ATTEMPT: "contextvars.ContextVar[int]" = contextvars.ContextVar("llm_attempt", default=0)
+
+
+@contextmanager
+def accounting_scope(session: Optional[str] = None, task: Optional[str] = None,
+                     component: Optional[str] = None):
+    """Blok içindeki LLM çağrılarını etiketle - verilmeyen alanlar dış kapsamdan gelir"""
+    scope = dict(_SCOPE.get())
+    for field, value in (("session", session), ("task", task), ("component", component)):
+        if value is not None:
+            scope[field] = str(value)
+    token = _SCOPE.set(scope)
+    try:
+        yield scope
+    finally:
+        _SCOPE.reset(token)
+
+
+def accounted(component: str):
+    """Dekoratör: fonksiyondaki tüm LLM çağrıları bu bileşene yazılır"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with accounting_scope(component=component):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_scope() -> Dict[str, Optional[str]]:
+    return dict(_SCOPE.get())
+
+
+@contextmanager
+def llm_attempt(attempt: int):
+    """Planlayıcının yeniden deneme sayacı - kayıtlara 'retries' olarak yazılır"""
+    token = _ATTEMPT.set(attempt)
+    try:
+        yield
+    finally:
+        _ATTEMPT.reset(token)
+
+
+def _text_tokens(value: Any) -> int:
+    if hasattr(value, "to_messages"):
+        value = value.to_messages()
+    if isinstance(value, str):
+        return estimate_tokens(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_text_tokens(getattr(item, "content", item)) + 4 for item in value)
+    content = getattr(value, "content", None)
+    if content is not None:
+        return estimate_tokens(content if isinstance(content, str) else str(content))
+    return estimate_tokens(str(value)) if value is not None else 0
+
+
+def token_usage(messages: Any, result: Any) -> Dict[str, Any]:
+    """(prompt, completion) token - önce sağlayıcının bildirdiği, yoksa yerel tahmin"""
+    usage = getattr(result, "usage_metadata", None)
+    if isinstance(usage, dict) and (usage.get("input_tokens") or usage.get("output_tokens")):
+        return {"prompt_tokens": int(usage.get("input_tokens") or 0),
+                "completion_tokens": int(usage.get("output_tokens") or 0), "estimated": False}
+    metadata = getattr(result, "response_metadata", None) or {}
+    reported = metadata.get("token_usage") or metadata.get("usage") if isinstance(metadata, dict) else None
+    if isinstance(reported, dict) and (reported.get("prompt_tokens") or reported.get("completion_tokens")):
+        return {"prompt_tokens": int(reported.get("prompt_tokens") or 0),
+                "completion_tokens": int(reported.get("completion_tokens") or 0), "estimated": False}
+    return {"prompt_tokens": _text_tokens(messages),
+            "completion_tokens": _text_tokens(result) if result is not None else 0, "estimated": True}
+
+
+def model_name(llm: Any) -> Optional[str]:
+    for attribute in ("model_name", "model"):
+        value = getattr(llm, attribute, None)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+class LLMAccountant:
+    """Süreç içi kayıt defteri (sınırlı pencere) + toplu sorgu + JSONL dışa aktarım"""
+
+    def __init__(self, max_records: int = 50000):
+        self.records: deque = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._exported = 0  # dışa aktarılan kayıt sayısı (deque dönse de toplam sayaç)
+        self._total = 0
+        self._exporter: Optional[threading.Thread] = None
+        self._stop_export = threading.Event()
+
+    def record(self, provider: Optional[str], model: Optional[str], messages: Any, result: Any,
+               latency_ms: float, error: Optional[Exception] = None, status: Optional[str] = None):
+        """Tek LLM çağrısını kaydet - bağlam (oturum/görev/bileşen/deneme) contextvar'dan okunur"""
+        entry = dict(current_scope())
+        entry.update(token_usage(messages, result if error is None else None))
+        if error is not None:
+            entry["completion_tokens"] = 0
+        entry.update({"ts": time.time(), "provider": provider, "model": model,
+                      "latency_ms": round(latency_ms, 3), "retries": _ATTEMPT.get(),
+                      "status": status or ("error" if error is not None else "ok")})
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {str(error)[:200]}"
+        with self._lock:
+            self.records.append(entry)
+            self._total += 1
+        return entry
+
+    def select(self, since: Optional[float] = None, **filters) -> List[Dict[str, Any]]:
+        """Filtreye uyan ham kayıtlar: select(session="x", provider="groq", since=ts)"""
+        with self._lock:
+            records = list(self.records)
+        return [r for r in records
+                if (since is None or r["ts"] >= since)
+                and all(value is None or r.get(field) == value for field, value in filters.items())]
+
+    @staticmethod
+    def aggregate(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        records = list(records)
+        latencies = [r["latency_ms"] for r in records if r["status"] != "cached"]
+        prompt = sum(r["prompt_tokens"] for r in records if r["status"] != "cached")
+        completion = sum(r["completion_tokens"] for r in records if r["status"] != "cached")
+        return {"calls": len(records),
+                "errors": sum(1 for r in records if r["status"] == "error"),
+                "cached": sum(1 for r in records if r["status"] == "cached"),
+                "retries": sum(1 for r in records if r["retries"]),
+                "prompt_tokens": prompt, "completion_tokens": completion,
+                "total_tokens": prompt + completion,
+                "estimated_calls": sum(1 for r in records if r.get("estimated")),
+                "latency_total_ms": round(sum(latencies), 3),
+                "latency_p50_ms": round(percentile(latencies, 50), 3),
+                "latency_p95_ms": round(percentile(latencies, 95), 3)}
+
+    def query(self, group_by: Iterable[str] = ("provider",), since: Optional[float] = None,
+              **filters) -> Dict[str, Dict[str, Any]]:
+        """
+        Gruplanmış özet: {"groq": {...}} veya çok alanlı gruplamada {"s1|ReactAgent": {...}}.
+        group_by alanları: session, task, component, provider, model, status
+        """
+        group_by = tuple(group_by)
+        unknown = set(group_by) - set(GROUP_FIELDS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen gruplama alanı: {', '.join(sorted(unknown))}")
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for record in self.select(since, **filters):
+            key = "|".join(str(record.get(field) or "-") for field in group_by) if group_by else "all"
+            groups.setdefault(key, []).append(record)
+        return {key: self.aggregate(records) for key, records in sorted(groups.items())}
+
+    def totals(self, since: Optional[float] = None, **filters) -> Dict[str, Any]:
+        return self.aggregate(self.select(since, **filters))
+
+    def summary(self, since: Optional[float] = None, **filters) -> Dict[str, Any]:
+        """Dışa aktarım için tam özet: toplam + sağlayıcı, bileşen ve oturum kırılımı"""
+        return {"generated_at": time.time(), "filters": {k: v for k, v in filters.items() if v is not None},
+                "totals": self.totals(since, **filters),
+                "by_provider": self.query(("provider",), since, **filters),
+                "by_component": self.query(("component",), since, **filters),
+                "by_session": self.query(("session",), since, **filters)}
+
+    def summary_line(self, **filters) -> str:
+        totals = self.totals(**filters)
+        if not totals["calls"]:
+            return "🧾 LLM muhasebesi: henüz çağrı yok"
+        slowest = max(self.query(("provider",), **filters).items(),
+                      key=lambda item: item[1]["latency_p50_ms"], default=None)
+        estimated = f" ({totals['estimated_calls']} tahmini)" if totals["estimated_calls"] else ""
+        line = (f"🧾 LLM: {totals['calls']} çağrı, {totals['prompt_tokens']} giriş + "
+                f"{totals['completion_tokens']} çıkış token{estimated}, {totals['errors']} hata, "
+                f"{totals['retries']} yeniden deneme, {totals['cached']} önbellek")
+        if slowest and slowest[1]["latency_p50_ms"]:
+            line += f" - en yavaş: {slowest[0]} (p50 {slowest[1]['latency_p50_ms']:.0f} ms)"
+        return line
+
+    def export(self, path: str = DEFAULT_EXPORT_PATH, include_records: bool = True) -> int:
+        """Yeni kayıtları ve güncel özeti JSONL'e ekle - eklenen kayıt sayısı döner"""
+        with self._lock:
+            fresh = min(self._total - self._exported, len(self.records))
+            records = list(self.records)[-fresh:] if fresh else []
+            self._exported = self._total
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            if include_records:
+                for record in records:
+                    f.write(json.dumps(dict(record, type="call"), ensure_ascii=False) + "\n")
+            f.write(json.dumps(dict(self.summary(), type="summary"), ensure_ascii=False) + "\n")
+        return len(records)
+
+    def start_periodic_export(self, path: str = DEFAULT_EXPORT_PATH, interval: float = 60.0):
+        """Arka plan thread'i her interval saniyede export eder (daemon - çıkışta son export için stop)"""
+        if self._exporter is not None:
+            return
+
+        def loop():
+            while not self._stop_export.wait(interval):
+                try:
+                    self.export(path)
+                except OSError as e:
+                    print(f"⚠️ LLM muhasebe raporu yazılamadı: {e}")
+
+        self._stop_export.clear()
+        self._exporter = threading.Thread(target=loop, name="llm-accounting-export", daemon=True)
+        self._exporter.start()
+        self._export_path = path
+
+    def stop_periodic_export(self):
+        if self._exporter is None:
+            return
+        self._stop_export.set()
+        self._exporter.join(timeout=5)
+        self._exporter = None
+        self.export(self._export_path)
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self._total = self._exported = 0
+
+
+_default_accountant: Optional[LLMAccountant] = None
+_default_lock = threading.Lock()
+
+
+def get_accountant() -> LLMAccountant:
+    """Süreç genelindeki muhasebe defteri (LLM_ACCOUNTING_EXPORT varsa periyodik export açılır)"""
+    global _default_accountant
+    with _default_lock:
+        if _default_accountant is None:
+            _default_accountant = LLMAccountant()
+            path = os.getenv("LLM_ACCOUNTING_EXPORT")
+            if path:
+                _default_accountant.start_periodic_export(path, float(os.getenv("LLM_ACCOUNTING_INTERVAL", "60")))
+        return _default_accountant
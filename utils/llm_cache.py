@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+🗄️ LLM CACHE - İki Seviyeli Kalıcı LLM Cevap Önbelleği
+Aynı model + parametre + (normalize edilmiş) mesajlar için cevabı tekrar üretmek
+yerine önbellekten döndürür: önce bellekteki LRU, sonra diskteki JSON deposu.
+Kayıtların TTL'i vardır, disk deposu boyut sınırını aşınca en eski kayıtlar silinir.
+Sadece düşük sıcaklıklı (deterministik sayılabilecek) çağrılar önbelleklenir.
+
+Ortam değişkenleri:
+    LLM_CACHE=off                  önbelleği tamamen kapat (bypass)
+    LLM_CACHE_DIR                  disk deposu (varsayılan logs/llm_cache)
+    LLM_CACHE_TTL                  kayıt ömrü, saniye (varsayılan 86400)
+    LLM_CACHE_MAX_TEMPERATURE      bu sıcaklığın üstündeki çağrılar önbelleklenmez (varsayılan 0.3)
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from utils.checkpoint import serialize_message, deserialize_message
+from utils.llm_accounting import get_accountant, model_name
+
+DEFAULT_LLM_CACHE_DIR = os.path.join("logs", "llm_cache")
+# *_api_base: stub sunucu / özel uç cevapları gerçek sağlayıcı cevaplarıyla karışmasın
+_MODEL_PARAMS = ("model_name", "model", "temperature", "max_tokens", "max_output_tokens", "top_p", "n", "stop",
+                 "openai_api_base", "groq_api_base")
+_WHITESPACE = re.compile(r"[ \t]+")
+
+
+def _normalize_text(text: str) -> str:
+    """Satır sonu boşlukları ve art arda boşluklar anahtarı değiştirmesin"""
+    lines = [_WHITESPACE.sub(" ", line).rstrip() for line in text.replace("\r\n", "\n").split("\n")]
+    return "\n".join(lines).strip()
+
+
+def normalize_messages(messages: Any) -> list:
+    """str, PromptValue veya mesaj listesi -> [{"type", "content", ...}]"""
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    if isinstance(messages, str):
+        messages = [{"type": "human", "content": messages}]
+    normalized = []
+    for message in messages:
+        if isinstance(message, tuple) and len(message) == 2:
+            data = {"type": message[0], "content": message[1]}
+        elif isinstance(message, dict):
+            data = dict(message)
+        else:
+            data = serialize_message(message)
+        if isinstance(data.get("content"), str):
+            data["content"] = _normalize_text(data["content"])
+        normalized.append(data)
+    return normalized
+
+
+def model_signature(llm: Any) -> Dict[str, Any]:
+    """
+    Model adı + örnekleme parametreleri + bağlı argümanlar (bind_tools araçları vb.).
+    RunnableBinding (.bound/.kwargs) ve RunnableSequence (.first) zincirlerini izler.
+    """
+    from utils.lazy_llm import LazyLLM
+
+    signature: Dict[str, Any] = {}
+    bound_kwargs: Dict[str, Any] = {}
+    target = llm
+    for _ in range(8):
+        if isinstance(target, LazyLLM):
+            target = target.get()
+        elif "inner" in getattr(target, "__dict__", {}):
+            target = target.inner  # ScheduledChatModel gibi ince sarmalayıcılar
+        elif hasattr(target, "bound") and hasattr(target, "kwargs"):
+            bound_kwargs.update(target.kwargs or {})
+            target = target.bound
+        elif hasattr(target, "first") and hasattr(target, "last"):
+            target = target.first
+        else:
+            break
+    signature["class"] = type(target).__name__
+    for name in _MODEL_PARAMS:
+        value = getattr(target, name, None)
+        if value is not None and isinstance(value, (str, int, float, list, tuple)):
+            signature[name] = value
+    if bound_kwargs:
+        signature["bound"] = json.loads(json.dumps(bound_kwargs, sort_keys=True, default=str))
+    return signature
+
+
+def cache_key(llm: Any, messages: Any, namespace: str = "") -> Tuple[str, Dict[str, Any]]:
+    """(sha256 anahtar, model imzası)"""
+    signature = model_signature(llm)
+    payload = json.dumps({"model": signature, "messages": normalize_messages(messages), "namespace": namespace},
+                         ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest(), signature
+
+
+class LLMResponseCache:
+    """Bellek LRU + disk deposu - thread-safe, süreç genelinde paylaşılır"""
+
+    def __init__(self, directory: Optional[str] = DEFAULT_LLM_CACHE_DIR, ttl: Optional[float] = 86400,
+                 max_memory_entries: int = 256, max_disk_bytes: int = 50 * 1024 * 1024,
+                 max_temperature: Optional[float] = 0.3, enabled: bool = True):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.max_temperature = max_temperature
+        self.enabled = enabled
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._disk_index: Optional[Dict[str, Tuple[float, int]]] = None  # anahtar -> (mtime, boyut)
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "expired": 0,
+                      "evictions": 0, "bypassed": 0, "uncacheable": 0}
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        max_temperature = os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3")
+        return cls(directory=os.getenv("LLM_CACHE_DIR", DEFAULT_LLM_CACHE_DIR),
+                   ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+                   max_temperature=float(max_temperature) if max_temperature else None,
+                   enabled=os.getenv("LLM_CACHE", "on").lower() not in ("off", "0", "false", "no"))
+
+    def count(self, field: str):
+        """Sayaç artışı kilit altında - paralel araç thread'leri ve async görevler aynı önbelleği paylaşır"""
+        with self._lock:
+            self.stats[field] += 1
+
+    def cacheable(self, signature: Dict[str, Any]) -> bool:
+        temperature = signature.get("temperature")
+        return self.max_temperature is None or temperature is None or temperature <= self.max_temperature
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _fresh(self, created: float) -> bool:
+        return self.ttl is None or time.time() - created <= self.ttl
+
+    def _load_disk_index(self):
+        """Disk deposunu ilk kullanımda bir kez tara (boyut sınırı için)"""
+        if self._disk_index is not None:
+            return
+        self._disk_index = {}
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    stat = os.stat(os.path.join(root, name))
+                    self._disk_index[name[:-5]] = (stat.st_mtime, stat.st_size)
+                    self._disk_bytes += stat.st_size
+
+    def _remove_disk_locked(self, key: str):
+        mtime_size = self._disk_index.pop(key, None) if self._disk_index is not None else None
+        if mtime_size:
+            self._disk_bytes -= mtime_size[1]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Kayıtlı değer (serileştirilmiş) veya None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[key]
+                self.stats["expired"] += 1
+
+            if self.directory:
+                try:
+                    with open(self._path(key), encoding="utf-8") as f:
+                        record = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    record = None
+                if record is not None:
+                    if self._fresh(record.get("created", 0)):
+                        self._remember_locked(key, record["created"], record["value"])
+                        self.stats["disk_hits"] += 1
+                        return record["value"]
+                    self._load_disk_index()
+                    self._remove_disk_locked(key)
+                    self.stats["expired"] += 1
+
+            self.stats["misses"] += 1
+            return None
+
+    def _remember_locked(self, key: str, created: float, value: Dict[str, Any]):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, key: str, value: Dict[str, Any], signature: Optional[Dict[str, Any]] = None):
+        """Değeri iki seviyeye de yaz - disk yazımı atomik (tmp + replace)"""
+        created = time.time()
+        with self._lock:
+            self._remember_locked(key, created, value)
+            self.stats["stores"] += 1
+            if not self.directory:
+                return
+            self._load_disk_index()
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = json.dumps({"created": created, "model": signature or {}, "value": value},
+                              ensure_ascii=False, default=str)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            previous = self._disk_index.get(key)
+            if previous:
+                self._disk_bytes -= previous[1]
+            size = len(data.encode("utf-8"))
+            self._disk_index[key] = (created, size)
+            self._disk_bytes += size
+            self._enforce_disk_cap_locked()
+
+    def _enforce_disk_cap_locked(self):
+        """Boyut sınırı aşıldıysa en eski kayıtları sil"""
+        if self.max_disk_bytes is None or self._disk_bytes <= self.max_disk_bytes:
+            return
+        for key, _ in sorted(self._disk_index.items(), key=lambda item: item[1][0]):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            self._remove_disk_locked(key)
+            self._memory.pop(key, None)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Bellek ve disk kayıtlarını sil"""
+        with self._lock:
+            self._memory.clear()
+            self._load_disk_index()
+            for key in list(self._disk_index):
+                self._remove_disk_locked(key)
+
+    def hit_ratio(self) -> float:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def report(self) -> str:
+        with self._lock:
+            s = dict(self.stats)
+        return (f"🗄️ LLM önbelleği: {s['memory_hits']} bellek + {s['disk_hits']} disk hit / {s['misses']} miss "
+                f"(%{self.hit_ratio() * 100:.1f}), {s['stores']} kayıt, {s['expired']} süresi dolan, "
+                f"{s['evictions']} tahliye, {s['bypassed']} bypass, {s['uncacheable']} önbelleklenemez")
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Süreç genelindeki varsayılan önbellek (ortam değişkenlerinden, lazy)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache.from_env()
+        return _default_cache
+
+
+class CachedChatModel:
+    """
+    Sohbet modeli sarmalayıcısı: invoke/ainvoke önbellekten, diğer her şey (stream,
+    warm_up, ...) alttaki modele geçer. bind_tools sonucu da önbellekli sarmalanır.
+    output_type verilirse (with_structured_output) Pydantic sonucu dict olarak saklanır.
+    """
+
+    def __init__(self, llm: Any, cache: Optional[LLMResponseCache] = None, enabled: bool = True,
+                 namespace: str = "", output_type: Any = None):
+        self.inner = llm
+        self.cache = cache
+        self.enabled = enabled
+        self.namespace = namespace
+        self.output_type = output_type
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    def _cache(self) -> LLMResponseCache:
+        return self.cache if self.cache is not None else get_llm_cache()
+
+    def uncached(self) -> "CachedChatModel":
+        """Aynı model, önbellek kapalı (bypass)"""
+        return CachedChatModel(self.inner, self.cache, enabled=False, namespace=self.namespace,
+                               output_type=self.output_type)
+
+    def bind_tools(self, *args, **kwargs) -> "CachedChatModel":
+        return CachedChatModel(self.inner.bind_tools(*args, **kwargs), self.cache, self.enabled, self.namespace)
+
+    def _encode(self, result: Any) -> Optional[Dict[str, Any]]:
+        if self.output_type is not None:
+            data = result.dict() if hasattr(result, "dict") else result
+            return {"kind": "structured", "data": data}
+        if not (getattr(result, "content", None) or getattr(result, "tool_calls", None)):
+            return None  # boş cevap saklanmaz
+        return {"kind": "message", "data": serialize_message(result)}
+
+    def _decode(self, value: Dict[str, Any]) -> Any:
+        if value["kind"] == "structured":
+            return self.output_type(**value["data"]) if isinstance(value["data"], dict) else value["data"]
+        message = deserialize_message(value["data"])
+        message.response_metadata = {"llm_cache": "hit"}
+        return message
+
+    def _lookup(self, messages: Any, use_cache: bool) -> Tuple[Optional[str], Any, Optional[Dict[str, Any]]]:
+        """(anahtar, önbellekteki sonuç, imza) - önbellek kapalıysa anahtar None"""
+        from utils.llm_cassette import active_cassette
+
+        cache = self._cache()
+        # 📼 Kaset aktifken her çağrı kasete ulaşmalı (kayıt eksiksiz, oynatma önbellek durumundan bağımsız)
+        if not (use_cache and self.enabled and cache.enabled) or active_cassette() is not None:
+            cache.count("bypassed")
+            return None, None, None
+        key, signature = cache_key(self.inner, messages, self.namespace)
+        if not cache.cacheable(signature):
+            cache.count("uncacheable")
+            return None, None, None
+        value = cache.get(key)
+        return key, (self._decode(value) if value is not None else None), signature
+
+    def _store(self, key: Optional[str], result: Any, signature: Optional[Dict[str, Any]]):
+        if key is None:
+            return
+        value = self._encode(result)
+        if value is not None:
+            try:
+                self._cache().put(key, value, signature)
+            except OSError as e:
+                print(f"⚠️ LLM önbelleğine yazılamadı: {e}")
+
+    def _account_hit(self, messages: Any, cached: Any):
+        """🧾 Önbellek hit'i muhasebeye token harcamadan 'cached' olarak yazılır"""
+        from utils.llm_scheduler import provider_of
+
+        provider = getattr(self.inner, "provider", None)
+        get_accountant().record(provider if isinstance(provider, str) else provider_of(self.inner),
+                                model_name(self.inner), messages, cached, 0.0, status="cached")
+
+    def invoke(self, messages: Any, *args, use_cache: bool = True, **kwargs) -> Any:
+        key, cached, signature = self._lookup(messages, use_cache and not args and not kwargs)
+        if cached is not None:
+            self._account_hit(messages, cached)
+            return cached
+        result = self.inner.invoke(messages, *args, **kwargs)
+        self._store(key, result, signature)
+        return result
+
+    async def ainvoke(self, messages: Any, *args, use_cache: bool = True, **kwargs) -> Any:
+        key, cached, signature = self._lookup(messages, use_cache and not args and not kwargs)
+        if cached is not None:
+            self._account_hit(messages, cached)
+            return cached
+        result = await self.inner.ainvoke(messages, *args, **kwargs)
+        self._store(key, result, signature)
+        return result
+
+
+def cached_llm(llm: Any, **options) -> Any:
+    """Modeli önbellekli sarmala (None ise None - yedek modu olan yerler için)"""
+    if llm is None or isinstance(llm, CachedChatModel):
+        return llm
+    return CachedChatModel(llm, **options)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+📼 LLM CASSETTE - Kayıt/Tekrar Oynatma ile Deterministik Ajan Testleri
+Havuzdaki (utils/llm_registry) tüm sohbet modeli çağrıları bir kasetten geçer:
+    record  - gerçek modeli çağır, istek hash'i -> cevap olarak kasete ekle
+    replay  - sadece kasetten cevap ver (ağ yok); kayıt yoksa CassetteMiss
+    auto    - kasette varsa oynat, yoksa gerçek çağrı yapıp kaydet
+Aynı istek birden fazla kez kaydedildiyse cevaplar kayıt sırasıyla döner.
+İstenirse kaydedilen gecikme (veya sabit bir süre) oynatmada taklit edilir.
+
+Ortam değişkenleri:
+    LLM_CASSETTE=tests/cassettes/kategori.jsonl
+    LLM_CASSETTE_MODE=record | replay | auto      (varsayılan auto)
+    LLM_CASSETTE_LATENCY=recorded | <saniye>      (varsayılan 0: gecikmesiz)
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.checkpoint import serialize_message, deserialize_message
+
+CASSETTE_MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(RuntimeError):
+    """Replay modunda istek kasette yok - gerçek çağrı yapılmaz"""
+
+
+def _encode(result: Any) -> Dict[str, Any]:
+    if hasattr(result, "content") or hasattr(result, "tool_calls"):
+        data = serialize_message(result)
+        data["type"] = "ai"  # akıştan birleştirilen AIMessageChunk da AIMessage olarak oynatılır
+        return {"kind": "message", "data": data}
+    data = result.dict() if hasattr(result, "dict") else result
+    return {"kind": "structured", "data": data}
+
+
+def _decode(value: Dict[str, Any], output_type: Any = None) -> Any:
+    if value["kind"] == "structured":
+        data = value["data"]
+        return output_type(**data) if isinstance(output_type, type) and isinstance(data, dict) else data
+    message = deserialize_message(value["data"])
+    message.response_metadata = {"llm_cassette": "replay"}
+    return message
+
+
+def _replay_chunks(value: Dict[str, Any]):
+    """Kayıtlı mesajı akış olarak ver (tek parça - tüketiciler içeriği biriktirir)"""
+    from langchain_core.messages import AIMessageChunk
+
+    data = value["data"]
+    tool_call_chunks = [{"name": call.get("name"), "args": json.dumps(call.get("args", {})),
+                         "id": call.get("id"), "index": index}
+                        for index, call in enumerate(data.get("tool_calls") or [])]
+    yield AIMessageChunk(content=data.get("content", ""), tool_call_chunks=tool_call_chunks)
+
+
+def _preview(messages: Any) -> str:
+    """Kasette okunabilirlik için son mesajın başı"""
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    last = messages if isinstance(messages, str) else (messages[-1] if messages else "")
+    content = getattr(last, "content", last)
+    return (content if isinstance(content, str) else str(content))[:200]
+
+
+class Cassette:
+    """Tek bir JSONL kaset dosyası - append-only, thread-safe"""
+
+    def __init__(self, path: str, mode: str = "auto", latency: Optional[str] = None):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Geçersiz kaset modu: {mode} (seçenekler: {', '.join(CASSETTE_MODES)})")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.providers = set()
+        self.stats = {"replayed": 0, "recorded": 0, "misses": 0}
+        self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        path = os.getenv("LLM_CASSETTE")
+        if not path:
+            return None
+        return cls(path, os.getenv("LLM_CASSETTE_MODE", "auto").lower(), os.getenv("LLM_CASSETTE_LATENCY"))
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self):
+        if self.mode == "record":
+            # Yeniden kayıt eski kaseti siler - oynatma sırası karışmasın
+            if os.path.exists(self.path):
+                open(self.path, "w").close()
+            return
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # yarım kalmış son satır
+                self._entries.setdefault(entry["key"], []).append(entry)
+                if entry.get("provider"):
+                    self.providers.add(entry["provider"])
+
+    def _next_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Bu anahtar için sıradaki kayıt - bitince sonuncu tekrar edilir"""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            self.stats["replayed"] += 1
+            return entries[min(index, len(entries) - 1)]
+
+    def _simulate_latency(self, entry: Dict[str, Any]) -> float:
+        if not self.latency or self.latency in ("0", "off"):
+            return 0.0
+        if self.latency == "recorded":
+            return entry.get("latency_ms", 0) / 1000
+        return float(self.latency)
+
+    def _append(self, key: str, provider: Optional[str], messages: Any, response: Dict[str, Any],
+                latency_ms: float, signature: Dict[str, Any]):
+        entry = {"key": key, "provider": provider, "model": signature.get("model") or signature.get("model_name"),
+                 "prompt_preview": _preview(messages), "response": response,
+                 "latency_ms": round(latency_ms, 3), "recorded_at": time.time()}
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            self._entries.setdefault(key, []).append(entry)
+            if provider:
+                self.providers.add(provider)
+            self.stats["recorded"] += 1
+
+    def _lookup(self, model: Any, messages: Any):
+        from utils.llm_cache import cache_key
+
+        key, signature = cache_key(model, messages, namespace="cassette")
+        entry = None if self.mode == "record" else self._next_entry(key)
+        if entry is None and self.replaying:
+            with self._lock:
+                self.stats["misses"] += 1
+            raise CassetteMiss(f"Kasette kayıt yok ({self.path}): {_preview(messages)[:80]!r} - "
+                               f"LLM_CASSETTE_MODE=record ile yeniden kaydedin")
+        return key, signature, entry
+
+    def invoke(self, model: Any, provider: Optional[str], messages: Any, call: Callable[[], Any],
+               output_type: Any = None) -> Any:
+        key, signature, entry = self._lookup(model, messages)
+        if entry is not None:
+            time.sleep(self._simulate_latency(entry))
+            return _decode(entry["response"], output_type)
+        start = time.perf_counter()
+        result = call()
+        self._append(key, provider, messages, _encode(result), (time.perf_counter() - start) * 1000, signature)
+        return result
+
+    async def ainvoke(self, model: Any, provider: Optional[str], messages: Any, call: Callable[[], Any],
+                      output_type: Any = None) -> Any:
+        import asyncio
+
+        key, signature, entry = self._lookup(model, messages)
+        if entry is not None:
+            await asyncio.sleep(self._simulate_latency(entry))
+            return _decode(entry["response"], output_type)
+        start = time.perf_counter()
+        result = await call()
+        self._append(key, provider, messages, _encode(result), (time.perf_counter() - start) * 1000, signature)
+        return result
+
+    def stream(self, model: Any, provider: Optional[str], messages: Any, call: Callable[[], Any]):
+        key, signature, entry = self._lookup(model, messages)
+        if entry is not None:
+            time.sleep(self._simulate_latency(entry))
+            yield from _replay_chunks(entry["response"])
+            return
+        start = time.perf_counter()
+        content: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        try:
+            for chunk in call():
+                if isinstance(chunk.content, str):
+                    content.append(chunk.content)
+                for part in getattr(chunk, "tool_call_chunks", None) or []:
+                    call_state = tool_calls.setdefault(part.get("index") or 0, {"name": "", "args": "", "id": None})
+                    call_state["name"] += part.get("name") or ""
+                    call_state["args"] += part.get("args") or ""
+                    call_state["id"] = call_state["id"] or part.get("id")
+                yield chunk
+        finally:
+            # Tüketici erken kapatsa da (parser tamamlandı) görülen kısım kaydedilir - oynatma aynı yerde biter
+            if content or tool_calls:
+                data = {"type": "ai", "content": "".join(content)}
+                if tool_calls:
+                    data["tool_calls"] = [{"name": c["name"], "args": json.loads(c["args"] or "{}"), "id": c["id"]}
+                                          for _, c in sorted(tool_calls.items())]
+                self._append(key, provider, messages, {"kind": "message", "data": data},
+                             (time.perf_counter() - start) * 1000, signature)
+
+    def report(self) -> str:
+        with self._lock:
+            stats = dict(self.stats)
+        return (f"📼 Kaset ({self.mode}, {self.path}): {stats['replayed']} oynatıldı, "
+                f"{stats['recorded']} kaydedildi, {stats['misses']} eksik")
+
+
+_active: Optional[Cassette] = None
+_active_loaded = False
+_active_lock = threading.Lock()
+
+
+def active_cassette() -> Optional[Cassette]:
+    """Süreçteki aktif kaset (ilk çağrıda LLM_CASSETTE ortam değişkeninden)"""
+    global _active, _active_loaded
+    if not _active_loaded:
+        with _active_lock:
+            if not _active_loaded:
+                _active = Cassette.from_env()
+                _active_loaded = True
+    return _active
+
+
+def set_active_cassette(cassette: Optional[Cassette]):
+    global _active, _active_loaded
+    with _active_lock:
+        _active = cassette
+        _active_loaded = True
+
+
+@contextmanager
+def use_cassette(path: str, mode: str = "auto", latency: Optional[str] = None):
+    """Blok boyunca tüm havuz istemcilerini kasete bağla"""
+    previous = active_cassette()
+    cassette = Cassette(path, mode, latency)
+    set_active_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        set_active_cassette(previous)
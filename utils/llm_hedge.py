@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+🏁 LLM HEDGE - Sağlayıcılar Arası Yedekli (Hedged) İstek
+Birincil sağlayıcı uyarlanabilir bir süre içinde (kendi p90 gecikmesi) cevap vermezse
+aynı istem sıradaki sağlayıcıya da gönderilir; ilk geçerli cevap kazanır, diğer çağrılar
+iptal edilir (asyncio görevleri - HTTP isteği gerçekten kapanır). Hata veren çağrı
+beklemeden bir sonrakini başlatır. Sağlayıcı başına kazanma/hedge istatistikleri tutulur.
+
+Çağrılar süreç boyunca yaşayan tek bir event loop thread'inde çalışır: async HTTP
+istemcilerinin bağlantı havuzu loop'lar arasında taşınmaz.
+"""
+
+import time
+import asyncio
+import threading
+import contextvars
+import concurrent.futures
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.tracing import percentile
+
+
+class _HedgeStats:
+    def __init__(self, window: int):
+        self.latencies_ms = deque(maxlen=window)  # yalnızca tamamlanan geçerli cevaplar
+        self.counts = {"launched": 0, "as_hedge": 0, "wins": 0, "hedge_wins": 0,
+                       "errors": 0, "invalid": 0, "cancelled": 0}
+
+
+class LLMHedger:
+    """
+    candidates: [(sağlayıcı_adı, model)] tercih sırasıyla - modellerin ainvoke'u olmalı.
+    Hedge gecikmesi: son başlatılan sağlayıcının p{hedge_percentile} gecikmesi,
+    yeterli örnek yoksa initial_delay; [min_delay, max_delay] aralığına kırpılır.
+    """
+
+    def __init__(self, initial_delay: float = 1.5, min_delay: float = 0.2, max_delay: float = 8.0,
+                 hedge_percentile: float = 90, min_samples: int = 5, window: int = 200):
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.window = window
+        self._stats: Dict[str, _HedgeStats] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self.requests = 0
+
+    def _provider(self, name: str) -> _HedgeStats:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _HedgeStats(self.window)
+            return stats
+
+    def _count(self, name: str, key: str, latency_ms: Optional[float] = None):
+        stats = self._provider(name)
+        with self._lock:
+            stats.counts[key] += 1
+            if latency_ms is not None:
+                stats.latencies_ms.append(latency_ms)
+
+    def delay_for(self, name: str) -> float:
+        """Bu sağlayıcı için hedge başlatmadan önce beklenecek süre (sn)"""
+        stats = self._provider(name)
+        with self._lock:
+            samples = list(stats.latencies_ms)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        delay = percentile(samples, self.hedge_percentile) / 1000
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    async def ainvoke(self, candidates: List[Tuple[str, Any]], messages: Any,
+                      validate: Optional[Callable[[Any], Any]] = None) -> Tuple[str, Any]:
+        """
+        İlk geçerli cevabı döndürür: (kazanan_sağlayıcı, validate(cevap) veya cevap).
+        Tüm adaylar başarısız olursa son hatayı fırlatır.
+        """
+        if not candidates:
+            raise RuntimeError("Hedge için LLM adayı yok")
+        with self._lock:
+            self.requests += 1
+
+        pending: Dict[asyncio.Task, Tuple[str, float, bool]] = {}  # görev -> (sağlayıcı, başlangıç, hedge mi)
+        next_index = 0
+        last_error: Optional[Exception] = None
+
+        def launch():
+            nonlocal next_index
+            name, llm = candidates[next_index]
+            is_hedge = next_index > 0
+            next_index += 1
+            self._count(name, "launched")
+            if is_hedge:
+                self._count(name, "as_hedge")
+            task = asyncio.ensure_future(llm.ainvoke(messages))
+            pending[task] = (name, time.perf_counter(), is_hedge)
+            return name
+
+        last_launched = launch()
+        try:
+            while pending:
+                timeout = self.delay_for(last_launched) if next_index < len(candidates) else None
+                done, _ = await asyncio.wait(list(pending), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Birincil yavaş kaldı - aynı istemi sıradaki sağlayıcıya da gönder
+                    last_launched = launch()
+                    continue
+                for task in done:
+                    name, started, is_hedge = pending.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        last_error = e
+                        self._count(name, "errors")
+                        continue
+                    try:
+                        value = validate(response) if validate else response
+                    except Exception as e:
+                        last_error = e
+                        self._count(name, "invalid")
+                        continue
+                    self._count(name, "wins", (time.perf_counter() - started) * 1000)
+                    if is_hedge:
+                        self._count(name, "hedge_wins")
+                    return name, value
+                if next_index < len(candidates):
+                    # Biten çağrılar başarısız - sıradaki sağlayıcıyı hedge süresini beklemeden başlat
+                    last_launched = launch()
+            raise last_error or RuntimeError("Hiçbir LLM adayı geçerli cevap vermedi")
+        finally:
+            # Kaybedenleri (veya dışarıdan iptal edildiysek hepsini) durdur
+            for task, (name, _, _) in pending.items():
+                task.cancel()
+                self._count(name, "cancelled")
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-hedge-loop", daemon=True).start()
+            return self._loop
+
+    def invoke(self, candidates: List[Tuple[str, Any]], messages: Any,
+               validate: Optional[Callable[[Any], Any]] = None) -> Tuple[str, Any]:
+        """Senkron arayüz - çağıranın contextvar'ları (deadline, öncelik) görevle taşınır"""
+        loop = self._event_loop()
+        context = contextvars.copy_context()
+        result: concurrent.futures.Future = concurrent.futures.Future()
+        holder = {}
+
+        def on_done(task: asyncio.Task):
+            if task.cancelled():
+                result.cancel()
+            elif task.exception() is not None:
+                result.set_exception(task.exception())
+            else:
+                result.set_result(task.result())
+
+        def start():
+            task = context.run(loop.create_task, self.ainvoke(candidates, messages, validate))
+            holder["task"] = task
+            task.add_done_callback(on_done)
+
+        loop.call_soon_threadsafe(start)
+        try:
+            return result.result()
+        except BaseException:
+            # Ctrl+C vb. - uçuştaki tüm sağlayıcı çağrılarını iptal et
+            if not result.done():
+                loop.call_soon_threadsafe(lambda: holder.get("task") and holder["task"].cancel())
+            raise
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = {name: dict(stats.counts,
+                                    p50_ms=round(percentile(list(stats.latencies_ms), 50), 3),
+                                    p90_ms=round(percentile(list(stats.latencies_ms), 90), 3))
+                         for name, stats in self._stats.items()}
+            requests = self.requests
+        for name, data in providers.items():
+            data["hedge_delay_s"] = round(self.delay_for(name), 3)
+        return {"requests": requests, "providers": providers}
+
+    def summary_line(self) -> str:
+        report = self.report()
+        if not report["requests"]:
+            return "🏁 Hedge: henüz istek yok"
+        parts = [f"{name} {p['wins']} kazanç ({p['hedge_wins']} hedge ile), {p['errors']} hata, "
+                 f"{p['cancelled']} iptal, p90 {p['p90_ms']:.0f} ms"
+                 for name, p in sorted(report["providers"].items())]
+        return f"🏁 Hedge ({report['requests']} istek): " + "; ".join(parts)
+
+
+_default_hedger: Optional[LLMHedger] = None
+_default_lock = threading.Lock()
+
+
+def get_hedger() -> LLMHedger:
+    """Süreç genelindeki hedger (gecikme geçmişi tüm ajanlarca paylaşılır)"""
+    global _default_hedger
+    with _default_lock:
+        if _default_hedger is None:
+            _default_hedger = LLMHedger()
+        return _default_hedger
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+🏊 LLM REGISTRY - Ajanlar Arası Paylaşılan, Lazy LLM İstemci Havuzu
+Her (sağlayıcı, model, parametre) için istemci süreç boyunca bir kez oluşturulur
+(ilk çağrıda) ve HTTP bağlantı havuzu tüm ajan/araç modüllerince yeniden kullanılır.
+Sağlayıcı sağlığı test prompt'u atılmadan gerçek çağrılardan izlenir:
+son hata, kota durumu, gecikme EWMA'sı.
+"""
+
+import os
+import time
+import threading
+import importlib.util
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils.lazy_llm import LazyLLM
+from utils.llm_scheduler import is_rate_limit_error, retry_after_seconds
+from utils.stub_llm_server import stub_url, STUB_API_KEY
+from utils.llm_cassette import active_cassette
+from utils.llm_accounting import get_accountant, model_name
+
+# sağlayıcı -> (LangChain paketi, API key ortam değişkeni, varsayılan model)
+PROVIDERS = {
+    "groq": ("langchain_groq", "GROQ_API_KEY", "llama3-70b-8192"),
+    "gemini": ("langchain_google_genai", "GOOGLE_API_KEY", "gemini-1.5-flash"),
+    "openai": ("langchain_openai", "OPENAI_API_KEY", "gpt-3.5-turbo"),
+}
+EWMA_ALPHA = 0.2
+QUOTA_COOLDOWN = 60.0      # Retry-After yoksa kota hatasından sonra sağlayıcı bu kadar atlanır
+FAILURE_COOLDOWN = 30.0    # art arda hatalardan sonra bekleme
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+def _build_stub_client(provider: str, model: str, temperature: float, url: str, options: dict):
+    """🧪 Yerel stub sunucuya bağlı istemci - Groq kendi SDK'sıyla, diğerleri OpenAI uyumlu uçla"""
+    options.setdefault("max_retries", 0)  # enjekte edilen 429/503'ler planlayıcıya/yedeklere görünsün
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, temperature=temperature, groq_api_key=STUB_API_KEY, base_url=url, **options)
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, temperature=temperature, openai_api_key=STUB_API_KEY,
+                      base_url=f"{url}/v1", **options)
+
+
+def _build_client(provider: str, model: str, temperature: float, api_key: Optional[str], options: dict,
+                  url: Optional[str] = None):
+    """Gerçek LangChain istemcisini oluştur - yalnızca ilk çağrıda"""
+    if url:
+        return _build_stub_client(provider, model, temperature, url, options)
+    _, key_env, _ = PROVIDERS[provider]
+    api_key = api_key or os.getenv(key_env)
+    cassette = active_cassette()
+    if not api_key and cassette is not None and cassette.replaying:
+        api_key = "cassette-replay"  # 📼 oynatmada istemci kurulur ama hiç istek atmaz
+    if not api_key:
+        raise RuntimeError(f"{key_env} bulunamadı! .env dosyasında {key_env}=your_key_here ekleyin")
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, temperature=temperature, groq_api_key=api_key, **options)
+    if provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        # LangChain'in kendi retry'ı kapalı - kota hatası hemen görünsün (planlayıcı/yedekler karar verir)
+        options.setdefault("max_retries", 0)
+        return ChatGoogleGenerativeAI(model=model, temperature=temperature, google_api_key=api_key, **options)
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model=model, temperature=temperature, openai_api_key=api_key, **options)
+    raise ValueError(f"Bilinmeyen LLM sağlayıcısı: {provider}")
+
+
+class ClientHealth:
+    """Sağlayıcı sağlığı - gerçek çağrıların sonucundan güncellenir"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency_ewma_ms: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+        self.quota_blocked_until = 0.0
+
+    def record_success(self, latency_ms: float):
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.quota_blocked_until = 0.0  # cevap geldiyse kota tekrar açılmış
+            self.latency_ewma_ms = (latency_ms if self.latency_ewma_ms is None
+                                    else EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * self.latency_ewma_ms)
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = f"{type(error).__name__}: {str(error)[:200]}"
+            self.last_error_at = time.time()
+            if is_rate_limit_error(error):
+                cooldown = retry_after_seconds(error) or QUOTA_COOLDOWN
+                self.quota_blocked_until = max(self.quota_blocked_until, time.monotonic() + cooldown)
+
+    @property
+    def quota_exhausted(self) -> bool:
+        return time.monotonic() < self.quota_blocked_until
+
+    @property
+    def available(self) -> bool:
+        """Kota dolmamış ve art arda hata eşiği aşılmamış (ya da bekleme süresi geçmiş)"""
+        if self.quota_exhausted:
+            return False
+        if self.consecutive_failures < MAX_CONSECUTIVE_FAILURES:
+            return True
+        return time.time() - (self.last_error_at or 0) > FAILURE_COOLDOWN
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"available": self.available, "quota_exhausted": self.quota_exhausted,
+                    "latency_ewma_ms": round(self.latency_ewma_ms, 3) if self.latency_ewma_ms is not None else None,
+                    "successes": self.successes, "failures": self.failures,
+                    "consecutive_failures": self.consecutive_failures, "last_error": self.last_error}
+
+
+class _HealthTracked:
+    """
+    invoke/ainvoke/stream çağrılarını ölçüp sağlayıcı sağlığına ve 🧾 muhasebe defterine yazan ortak davranış.
+    📼 Aktif kaset varsa çağrı önce kasetten geçer (oynatılan cevaplar sağlığa yazılmaz).
+    """
+
+    output_type: Any = None  # with_structured_output şeması (kasetten geri kurmak için)
+
+    def _tracked_target(self):
+        raise NotImplementedError
+
+    def _account(self, args: tuple, result: Any, latency_ms: float, error: Optional[Exception] = None):
+        get_accountant().record(self.provider, model_name(self._tracked_target()), args[0] if args else None,
+                                result, latency_ms, error)
+
+    def _track(self, function, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            self.health.record_failure(e)
+            self._account(args, None, (time.perf_counter() - start) * 1000, e)
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.health.record_success(latency_ms)
+        self._account(args, result, latency_ms)
+        return result
+
+    def invoke(self, *args, **kwargs):
+        cassette = active_cassette()
+        if cassette is None or not args:
+            return self._track(self._tracked_target().invoke, *args, **kwargs)
+        return cassette.invoke(self._tracked_target(), self.provider, args[0],
+                               lambda: self._track(self._tracked_target().invoke, *args, **kwargs),
+                               self.output_type)
+
+    async def ainvoke(self, *args, **kwargs):
+        cassette = active_cassette()
+        if cassette is None or not args:
+            return await self._atrack(*args, **kwargs)
+        return await cassette.ainvoke(self._tracked_target(), self.provider, args[0],
+                                      lambda: self._atrack(*args, **kwargs), self.output_type)
+
+    def stream(self, *args, **kwargs):
+        cassette = active_cassette()
+        if cassette is None or not args:
+            return self._stream(*args, **kwargs)
+        return cassette.stream(self._tracked_target(), self.provider, args[0],
+                               lambda: self._stream(*args, **kwargs))
+
+    async def _atrack(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = await self._tracked_target().ainvoke(*args, **kwargs)
+        except Exception as e:
+            self.health.record_failure(e)
+            self._account(args, None, (time.perf_counter() - start) * 1000, e)
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.health.record_success(latency_ms)
+        self._account(args, result, latency_ms)
+        return result
+
+    def _stream(self, *args, **kwargs):
+        start = time.perf_counter()
+        content, last, failed = [], None, False
+        try:
+            for chunk in self._tracked_target().stream(*args, **kwargs):
+                if isinstance(getattr(chunk, "content", None), str):
+                    content.append(chunk.content)
+                last = chunk
+                yield chunk
+        except Exception as e:
+            failed = True
+            self.health.record_failure(e)
+            self._account(args, None, (time.perf_counter() - start) * 1000, e)
+            raise
+        finally:
+            # Tüketici akışı erken kapatsa da (parser tamamlandı) çağrı başarılı sayılır
+            if not failed:
+                latency_ms = (time.perf_counter() - start) * 1000
+                self.health.record_success(latency_ms)
+                usage = last if getattr(last, "usage_metadata", None) else "".join(content)
+                self._account(args, usage, latency_ms)
+
+    def bind_tools(self, *args, **kwargs) -> "TrackedRunnable":
+        return TrackedRunnable(self._tracked_target().bind_tools(*args, **kwargs), self.provider, self.health)
+
+    def with_structured_output(self, *args, **kwargs) -> "TrackedRunnable":
+        schema = args[0] if args else kwargs.get("schema")
+        return TrackedRunnable(self._tracked_target().with_structured_output(*args, **kwargs),
+                               self.provider, self.health, output_type=schema)
+
+
+class TrackedRunnable(_HealthTracked):
+    """Havuzdaki istemciden türeyen runnable (bind_tools, with_structured_output) - sağlık ortak"""
+
+    def __init__(self, inner: Any, provider: str, health: ClientHealth, output_type: Any = None):
+        self.inner = inner
+        self.provider = provider
+        self.health = health
+        self.output_type = output_type
+
+    def _tracked_target(self):
+        return self.inner
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+
+class PooledLLM(_HealthTracked, LazyLLM):
+    """Havuzdaki lazy istemci: gerçek istemci ilk kullanımda bir kez kurulur"""
+
+    def __init__(self, factory, name: str, provider: str, health: ClientHealth):
+        LazyLLM.__init__(self, factory, name=name)
+        self.provider = provider
+        self.health = health
+
+    def _tracked_target(self):
+        return self.get()
+
+
+class LLMClientRegistry:
+    """Süreç genelindeki istemci havuzu + sağlayıcı sağlık tablosu"""
+
+    def __init__(self):
+        self._clients: Dict[Tuple, PooledLLM] = {}
+        self._health: Dict[str, ClientHealth] = {}
+        self._lock = threading.Lock()
+
+    def is_configured(self, provider: str) -> bool:
+        """Paket kurulu ve API key tanımlı mı (ağ çağrısı yok) - stub modunda anahtar gerekmez"""
+        package, key_env, _ = PROVIDERS[provider]
+        cassette = active_cassette()
+        if cassette is not None and cassette.replaying:
+            # 📼 Oynatmada kayıttaki sağlayıcılar seçilir - aynı istekler, aynı kaset anahtarları
+            return provider in cassette.providers
+        stub = stub_url() is not None
+        if stub and provider != "groq":
+            package = "langchain_openai"
+        try:
+            installed = importlib.util.find_spec(package) is not None
+        except (ImportError, ValueError):
+            installed = False
+        return installed and (stub or bool(os.getenv(key_env)))
+
+    def health(self, provider: str) -> ClientHealth:
+        with self._lock:
+            health = self._health.get(provider)
+            if health is None:
+                health = self._health[provider] = ClientHealth()
+            return health
+
+    def client(self, provider: str, model: Optional[str] = None, temperature: float = 0.1,
+               api_key: Optional[str] = None, name: Optional[str] = None, **options) -> PooledLLM:
+        """Aynı parametrelerle her çağrıda aynı (lazy) istemciyi döndür"""
+        if provider not in PROVIDERS:
+            raise ValueError(f"Bilinmeyen LLM sağlayıcısı: {provider}")
+        model = model or PROVIDERS[provider][2]
+        url = stub_url()
+        key = (provider, model, temperature, api_key, url, tuple(sorted(options.items())))
+        health = self.health(provider)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = PooledLLM(
+                    lambda: _build_client(provider, model, temperature, api_key, dict(options), url),
+                    name=name or f"{provider}:{model}" + (" (stub)" if url else ""), provider=provider,
+                    health=health)
+            return client
+
+    def best_available(self, preference: Iterable[str] = ("gemini", "openai", "groq"),
+                       exclude: Iterable[str] = (), models: Optional[Dict[str, str]] = None,
+                       **client_options) -> Optional[PooledLLM]:
+        """Tercih sırasındaki ilk yapılandırılmış ve sağlıklı sağlayıcının istemcisi"""
+        models = models or {}
+        for provider in preference:
+            if provider in exclude or not self.is_configured(provider):
+                continue
+            if not self.health(provider).available:
+                continue
+            return self.client(provider, model=models.get(provider), **client_options)
+        return None
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            clients = [{"provider": key[0], "model": key[1], "temperature": key[2], "initialized": c.is_initialized}
+                       for key, c in self._clients.items()]
+            providers = list(self._health)
+        return {"clients": clients, "health": {p: self.health(p).snapshot() for p in providers}}
+
+    def summary_line(self) -> str:
+        report = self.report()
+        created = sum(1 for c in report["clients"] if c["initialized"])
+        parts = []
+        for provider, h in sorted(report["health"].items()):
+            state = "kota dolu" if h["quota_exhausted"] else "sağlıklı" if h["available"] else "hatalı"
+            latency = f", EWMA {h['latency_ewma_ms']:.0f} ms" if h["latency_ewma_ms"] is not None else ""
+            parts.append(f"{provider} {state} ({h['successes']} başarılı, {h['failures']} hata{latency})")
+        return (f"🏊 LLM istemci havuzu: {len(report['clients'])} istemci ({created} oluşturuldu)"
+                + (" - " + "; ".join(parts) if parts else ""))
+
+
+_default_registry: Optional[LLMClientRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_registry() -> LLMClientRegistry:
+    """Süreç genelindeki istemci havuzu (lazy)"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = LLMClientRegistry()
+        return _default_registry
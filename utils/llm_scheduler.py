@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+🚦 LLM SCHEDULER - Süreç Geneli Hız Sınırı Farkında İstek Planlayıcı
+Sağlayıcı başına iki token kovası (dakikalık istek ve dakikalık token) tutar;
+bekleyen çağrılar öncelik sırasıyla (etkileşimli sohbet > toplu iş) kova dolunca
+geçer. 429 / kota hatasında sağlayıcı Retry-After süresince herkes için durdurulur,
+çağrı jitter'lı üstel geri çekilmeyle yeniden denenir. Kuyruk derinliği ve bekleme
+süreleri metrik olarak tutulur.
+
+Ortam değişkenleri (sağlayıcı adı büyük harfle):
+    LLM_RPM_GROQ, LLM_TPM_GROQ     dakikalık istek / token sınırı (0: sınırsız)
+"""
+
+import os
+import re
+import time
+import heapq
+import random
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Optional
+
+from utils.history_manager import estimate_tokens
+from utils.tracing import percentile
+from utils.llm_accounting import llm_attempt
+from utils.deadline import current_deadline
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# Sağlayıcıların ücretsiz katman sınırlarına yakın varsayılanlar: (istek/dk, token/dk)
+DEFAULT_LIMITS = {
+    "groq": (30, 6000),
+    "gemini": (15, 1_000_000),
+    "openai": (500, 60_000),
+}
+DEFAULT_OUTPUT_TOKENS = 512  # çıktı için rezerv; gerçek kullanım gelince düzeltilir
+
+_PRIORITY: "contextvars.ContextVar[int]" = contextvars.ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+_RATE_LIMIT_WORDS = ("429", "rate limit", "rate_limit", "ratelimit", "too many requests", "quota")
+_RETRY_IN = re.compile(r"try again in (?:(\d+)m)?([\d.]+)s", re.IGNORECASE)
+_RETRY_AFTER = re.compile(r"retry[-_ ]after[\"':= ]+([\d.]+)", re.IGNORECASE)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """Blok içindeki LLM çağrılarının önceliği (küçük sayı önce geçer)"""
+    token = _PRIORITY.set(priority)
+    try:
+        yield priority
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority() -> int:
+    return _PRIORITY.get()
+
+
+def provider_of(llm: Any) -> str:
+    """Model sınıfından sağlayıcı adı: groq | gemini | openai | default"""
+    # Havuz istemcisi (PooledLLM) sağlayıcısını bilir - gerçek istemciyi oluşturmaya gerek yok
+    provider = getattr(llm, "__dict__", {}).get("provider")
+    if isinstance(provider, str):
+        return provider
+    name = type(llm).__name__.lower()
+    for key, provider in (("groq", "groq"), ("google", "gemini"), ("gemini", "gemini"), ("openai", "openai")):
+        if key in name:
+            return provider
+    return "default"
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    if getattr(error, "status_code", None) == 429 or getattr(getattr(error, "response", None), "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return any(word in message for word in _RATE_LIMIT_WORDS)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Hatadaki Retry-After (başlık, öznitelik veya mesaj metni) - yoksa None"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for value in (headers.get("retry-after") if hasattr(headers, "get") else None, getattr(error, "retry_after", None)):
+        try:
+            if value is not None:
+                return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+    message = str(error)
+    match = _RETRY_IN.search(message)
+    if match:
+        return int(match.group(1) or 0) * 60 + float(match.group(2))
+    match = _RETRY_AFTER.search(message)
+    return float(match.group(1)) if match else None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Yeniden deneme beklemesi: Retry-After varsa ona küçük jitter eklenir,
+    yoksa eşit-jitter'lı üstel geri çekilme (aynı anda düşen çağrılar dağılsın).
+    """
+    if retry_after is not None:
+        return min(cap, retry_after) + random.uniform(0, min(1.0, 0.1 * retry_after + 0.1))
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class TokenBucket:
+    """Dakikalık sınır için kova - kilitsiz, planlayıcının kilidi altında kullanılır"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """amount kadar yer açılana kadar saniye (kova kapasitesini aşan istek tam kovayla geçer)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """Tahmin ile gerçek kullanım farkı (negatif: iade) - kova borca girebilir"""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class _ProviderState:
+    def __init__(self, rpm: Optional[float], tpm: Optional[float]):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.waiting = []  # (öncelik, sıra) min-heap
+        self.blocked_until = 0.0
+        self.waits_ms = deque(maxlen=1000)
+        self.stats = {"requests": 0, "queue_depth": 0, "max_queue_depth": 0, "queued": 0,
+                      "rate_limited": 0, "retries": 0, "tokens_reserved": 0, "tokens_used": 0}
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        wait = max(0.0, self.blocked_until - now)
+        if self.requests:
+            wait = max(wait, self.requests.time_until(1, now))
+        if self.tokens:
+            wait = max(wait, self.tokens.time_until(tokens, now))
+        return wait
+
+
+class LLMScheduler:
+    """Tüm sağlayıcılar için tek kilit + koşul değişkeni; kuyruğun başındaki çağrı kovayı bekler"""
+
+    def __init__(self, limits: Optional[Dict[str, tuple]] = None, max_retries: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        # 🧪 Stub sunucuda (LLM_STUB_URL) sağlayıcı kotası yok - ölçülen verim kovalarla sınırlanmasın
+        if limits is None:
+            limits = {} if os.getenv("LLM_STUB_URL") else DEFAULT_LIMITS
+        self.limits = dict(limits)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._providers: Dict[str, _ProviderState] = {}
+        self._condition = threading.Condition()
+        self._sequence = 0
+
+    def _state(self, provider: str) -> _ProviderState:
+        state = self._providers.get(provider)
+        if state is None:
+            rpm, tpm = self.limits.get(provider, (None, None))
+            rpm = float(os.getenv(f"LLM_RPM_{provider.upper()}", rpm or 0)) or None
+            tpm = float(os.getenv(f"LLM_TPM_{provider.upper()}", tpm or 0)) or None
+            state = self._providers[provider] = _ProviderState(rpm, tpm)
+        return state
+
+    def configure(self, provider: str, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        """Sağlayıcı sınırlarını değiştir (kovalar sıfırdan dolu başlar)"""
+        with self._condition:
+            self.limits[provider] = (rpm, tpm)
+            self._providers.pop(provider, None)
+
+    def acquire(self, provider: str, tokens: int = 0, priority: Optional[int] = None) -> float:
+        """
+        Sıra ve kova uygun olana kadar bekle, kotayı düş. Beklenen süreyi (sn) döndürür.
+        Daha yüksek öncelikli bir çağrı gelirse sıradaki yerini ona bırakır.
+        Görev süresi dolar veya iptal edilirse sıradan çıkar ve ToolCancelled fırlatır (kota harcanmaz).
+        """
+        priority = current_priority() if priority is None else priority
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+        start = time.monotonic()
+        with self._condition, (deadline.on_cancel(self._wake) if deadline is not None else nullcontext()):
+            state = self._state(provider)
+            self._sequence += 1
+            entry = (priority, self._sequence)
+            heapq.heappush(state.waiting, entry)
+            state.stats["queue_depth"] = len(state.waiting)
+            state.stats["max_queue_depth"] = max(state.stats["max_queue_depth"], len(state.waiting))
+            try:
+                while True:
+                    if deadline is not None:
+                        deadline.check()
+                    now = time.monotonic()
+                    wait = state.wait_time(tokens, now)
+                    if state.waiting[0] == entry and wait <= 0:
+                        heapq.heappop(state.waiting)
+                        break
+                    # Sıradaki değilsek haber bekle; başındaysak kova dolana kadar - en fazla kalan görev süresi
+                    timeout = wait if state.waiting[0] == entry else max(wait, 0.05)
+                    remaining = deadline.remaining() if deadline is not None else None
+                    self._condition.wait(timeout=timeout if remaining is None else min(timeout, remaining))
+            except BaseException:
+                state.waiting.remove(entry)
+                heapq.heapify(state.waiting)
+                raise
+            finally:
+                state.stats["queue_depth"] = len(state.waiting)
+                self._condition.notify_all()
+
+            if state.requests:
+                state.requests.consume(1)
+            if state.tokens:
+                state.tokens.consume(tokens)
+            waited = time.monotonic() - start
+            state.stats["requests"] += 1
+            state.stats["tokens_reserved"] += tokens
+            state.waits_ms.append(waited * 1000)
+            if waited > 0.001:
+                state.stats["queued"] += 1
+            return waited
+
+    def _wake(self):
+        """Görev iptalinde bekleyenleri uyandır - iptal edilen çağrı sıradan hemen çıksın"""
+        with self._condition:
+            self._condition.notify_all()
+
+    def record_usage(self, provider: str, reserved: int, used: Optional[int]):
+        """Gerçek token kullanımı gelince kovayı düzelt"""
+        if used is None:
+            return
+        with self._condition:
+            state = self._state(provider)
+            state.stats["tokens_used"] += used
+            if state.tokens:
+                state.tokens.adjust(used - reserved)
+            self._condition.notify_all()
+
+    def penalize(self, provider: str, delay: float):
+        """Sağlayıcı hız sınırı verdi - bekleyen herkes delay süresince durur"""
+        with self._condition:
+            state = self._state(provider)
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+            state.stats["rate_limited"] += 1
+
+    def _on_error(self, provider: str, error: Exception, attempt: int, max_retries: int) -> float:
+        """Hız sınırı hatasında bekleme süresini döndür; yeniden denenmeyecekse hatayı fırlat"""
+        if not is_rate_limit_error(error):
+            raise error
+        delay = backoff_delay(attempt, retry_after_seconds(error), self.base_delay, self.max_delay)
+        self.penalize(provider, delay)
+        if attempt >= max_retries:
+            raise error
+        with self._condition:
+            self._state(provider).stats["retries"] += 1
+        print(f"🚦 {provider} hız sınırı - {delay:.1f} sn sonra yeniden deneniyor (deneme {attempt + 2}/{max_retries + 1})")
+        return delay
+
+    def call(self, provider: str, function: Callable[[], Any], tokens: int = 0,
+             priority: Optional[int] = None, max_retries: Optional[int] = None) -> Any:
+        """Sıra + kova + hız sınırı yeniden denemesiyle senkron çağrı"""
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            # Penalize sonrası beklemeyi de acquire yapar (blocked_until) - ayrı sleep yok
+            self.acquire(provider, tokens, priority)
+            try:
+                with llm_attempt(attempt):
+                    result = function()
+            except Exception as e:
+                self._on_error(provider, e, attempt, max_retries)
+                attempt += 1
+                continue
+            self.record_usage(provider, tokens, usage_tokens(result))
+            return result
+
+    async def acall(self, provider: str, function: Callable[[], Any], tokens: int = 0,
+                    priority: Optional[int] = None, max_retries: Optional[int] = None) -> Any:
+        """Async çağrı - sıra beklemesi event loop'u bloklamaz (to_thread bağlamı kopyalar)"""
+        max_retries = self.max_retries if max_retries is None else max_retries
+        priority = current_priority() if priority is None else priority
+        attempt = 0
+        while True:
+            await asyncio.to_thread(self.acquire, provider, tokens, priority)
+            try:
+                with llm_attempt(attempt):
+                    result = await function()
+            except Exception as e:
+                self._on_error(provider, e, attempt, max_retries)
+                attempt += 1
+                continue
+            self.record_usage(provider, tokens, usage_tokens(result))
+            return result
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._condition:
+            return {provider: dict(state.stats,
+                                   wait_p50_ms=round(percentile(list(state.waits_ms), 50), 3),
+                                   wait_p95_ms=round(percentile(list(state.waits_ms), 95), 3),
+                                   blocked_for_s=round(max(0.0, state.blocked_until - time.monotonic()), 3))
+                    for provider, state in self._providers.items()}
+
+    def report(self) -> str:
+        lines = []
+        for provider, m in sorted(self.metrics().items()):
+            lines.append(f"🚦 {provider}: {m['requests']} istek, {m['queued']} sırada bekledi "
+                         f"(p50 {m['wait_p50_ms']:.0f} ms, p95 {m['wait_p95_ms']:.0f} ms), "
+                         f"en derin kuyruk {m['max_queue_depth']}, {m['rate_limited']} hız sınırı, "
+                         f"{m['retries']} yeniden deneme")
+        return "\n".join(lines) or "🚦 LLM planlayıcı: henüz istek yok"
+
+
+def usage_tokens(result: Any) -> Optional[int]:
+    """Cevaptaki gerçek toplam token (LangChain usage_metadata / token_usage)"""
+    usage = getattr(result, "usage_metadata", None)
+    if isinstance(usage, dict) and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    metadata = getattr(result, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or metadata.get("usage") or {}
+    total = token_usage.get("total_tokens") if isinstance(token_usage, dict) else None
+    return int(total) if total else None
+
+
+def request_tokens(messages: Any, output_tokens: int = DEFAULT_OUTPUT_TOKENS) -> int:
+    """İstek için rezerve edilecek token: giriş tahmini + çıktı payı"""
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    if isinstance(messages, str):
+        return estimate_tokens(messages) + output_tokens
+    total = 0
+    for message in messages:
+        content = getattr(message, "content", message if isinstance(message, str) else "")
+        total += estimate_tokens(content if isinstance(content, str) else str(content)) + 4
+    return total + output_tokens
+
+
+_default_scheduler: Optional[LLMScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Süreç genelindeki planlayıcı (lazy)"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = LLMScheduler()
+        return _default_scheduler
+
+
+def _replaying() -> bool:
+    """📼 Kaset oynatılıyorsa sağlayıcıya istek gitmez - kota/kuyruk atlanır"""
+    from utils.llm_cassette import active_cassette
+
+    cassette = active_cassette()
+    return cassette is not None and cassette.replaying
+
+
+class ScheduledChatModel:
+    """
+    Sohbet modeli sarmalayıcısı: invoke/ainvoke/stream planlayıcıdan geçer.
+    Önbelleğin (CachedChatModel) altında kullanılır - önbellek hit'leri kota harcamaz.
+    max_retries=0: hız sınırında beklemeden hata (başka sağlayıcıya geçecek çağıranlar için),
+    sağlayıcı yine de diğer çağıranlar için durdurulur.
+    """
+
+    def __init__(self, llm: Any, provider: Optional[str] = None, scheduler: Optional[LLMScheduler] = None,
+                 max_retries: Optional[int] = None):
+        self.inner = llm
+        self._provider = provider
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    @property
+    def provider(self) -> str:
+        if self._provider is None:
+            from utils.lazy_llm import LazyLLM
+            self._provider = provider_of(self.inner)
+            if self._provider == "default" and isinstance(self.inner, LazyLLM):
+                self._provider = provider_of(self.inner.get())
+        return self._provider
+
+    def _scheduler(self) -> LLMScheduler:
+        return self.scheduler if self.scheduler is not None else get_scheduler()
+
+    def bind_tools(self, *args, **kwargs) -> "ScheduledChatModel":
+        return ScheduledChatModel(self.inner.bind_tools(*args, **kwargs), self.provider, self.scheduler,
+                                  self.max_retries)
+
+    def invoke(self, messages: Any, *args, **kwargs) -> Any:
+        if _replaying():
+            return self.inner.invoke(messages, *args, **kwargs)
+        return self._scheduler().call(self.provider, lambda: self.inner.invoke(messages, *args, **kwargs),
+                                      request_tokens(messages), max_retries=self.max_retries)
+
+    async def ainvoke(self, messages: Any, *args, **kwargs) -> Any:
+        if _replaying():
+            return await self.inner.ainvoke(messages, *args, **kwargs)
+        return await self._scheduler().acall(self.provider, lambda: self.inner.ainvoke(messages, *args, **kwargs),
+                                             request_tokens(messages), max_retries=self.max_retries)
+
+    def stream(self, messages: Any, *args, **kwargs):
+        """Akış tek istek sayılır - sıra alındıktan sonra parçalar doğrudan gelir"""
+        if _replaying():
+            yield from self.inner.stream(messages, *args, **kwargs)
+            return
+        try:
+            self._scheduler().acquire(self.provider, request_tokens(messages))
+            yield from self.inner.stream(messages, *args, **kwargs)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self._scheduler().penalize(self.provider, backoff_delay(0, retry_after_seconds(e)))
+            raise
+
+
+def scheduled_llm(llm: Any, provider: Optional[str] = None, **options) -> Any:
+    """Modeli planlayıcıya bağla (None ise None)"""
+    if llm is None or isinstance(llm, ScheduledChatModel):
+        return llm
+    return ScheduledChatModel(llm, provider, **options)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+📦 OBSERVATION STORE - Büyük Araç Çıktılarını Diske Alma
+Sınırı aşan gözlemler içerik-adresli (sha256) dosyaya yazılır; LLM'e sadece baş/son
+önizlemesi ve bir handle gider. Tam veri handle ile satır aralığı olarak okunabilir,
+execute_local_python da dosya yoluna scratchpad üzerinden ulaşır.
+"""
+
+import os
+import re
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_OBSERVATION_DIR = os.path.join("logs", "observations")
+_HANDLE = re.compile(r"^obs_[0-9a-f]{12}$")
+
+
+def _clip_lines(lines: List[str], budget: int) -> str:
+    """Satırları eşit pay ile kısalt, toplamı yaklaşık budget karakterde tut"""
+    per_line = max(40, budget // max(1, len(lines)))
+    clipped = [line if len(line) <= per_line else f"{line[:per_line]}… (+{len(line) - per_line} karakter)"
+               for line in lines]
+    joined = "\n".join(clipped)
+    return joined if len(joined) <= budget else joined[:budget] + "…"
+
+
+class ObservationStore:
+    """İçerik-adresli gözlem deposu - aynı çıktı iki kez yazılmaz"""
+
+    def __init__(self, directory: str = DEFAULT_OBSERVATION_DIR, spill_chars: int = 4000,
+                 head_lines: int = 20, tail_lines: int = 10):
+        self.directory = directory
+        self.spill_chars = spill_chars
+        self.head_lines = head_lines
+        self.tail_lines = tail_lines
+        self._lock = threading.Lock()
+        self.stats = {"spilled": 0, "chars_in": 0, "chars_out": 0, "reads": 0}
+
+    def path(self, handle: str) -> str:
+        if not _HANDLE.match(handle or ""):
+            raise ValueError(f"Geçersiz gözlem handle'ı: {handle}")
+        return os.path.join(self.directory, f"{handle}.txt")
+
+    def put(self, text: str) -> str:
+        """Metni kaydet ve handle döndür (içerik zaten varsa yeniden yazılmaz)"""
+        handle = "obs_" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        target = self.path(handle)
+        with self._lock:
+            if not os.path.exists(target):
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, target)
+        return handle
+
+    def spill(self, text: str, tool_name: str = "") -> Tuple[str, Optional[str]]:
+        """
+        Sınırın altındaki metni aynen, üstündekini önizleme + handle olarak döndür.
+
+        Returns:
+            (LLM'e gidecek metin, handle veya None)
+        """
+        if self.spill_chars is None or len(text) <= self.spill_chars:
+            return text, None
+
+        handle = self.put(text)
+        lines = text.splitlines()
+        half = self.spill_chars // 2
+        if len(lines) > self.head_lines + self.tail_lines:
+            # Satırlar da kısaltılır - birkaç dev satır (minified JSON, log) önizlemeyi şişirmesin
+            head = _clip_lines(lines[:self.head_lines], half)
+            tail = _clip_lines(lines[-self.tail_lines:], half)
+            body = (head
+                    + f"\n... ({len(lines) - self.head_lines - self.tail_lines} satır atlandı) ...\n"
+                    + tail)
+        else:
+            # Az ama çok uzun satır: karakter bazında baş/son
+            body = text[:half] + f"\n... ({len(text) - 2 * half} karakter atlandı) ...\n" + text[-half:]
+
+        preview = (f"📦 Büyük gözlem diske alındı ({tool_name or 'araç'}): handle={handle}, "
+                   f"{len(lines)} satır, {len(text)} karakter\n"
+                   f"{body}\n"
+                   f"💡 Tamamı için: read_observation(handle='{handle}', start_line, end_line) "
+                   f"veya execute_local_python'da open(scratchpad['observation_files']['{handle}'])")
+        self.stats["spilled"] += 1
+        self.stats["chars_in"] += len(text)
+        self.stats["chars_out"] += len(preview)
+        return preview, handle
+
+    def read_lines(self, handle: str, start_line: int = 1, end_line: Optional[int] = None) -> str:
+        """1 tabanlı, uçlar dahil satır aralığı"""
+        with open(self.path(handle), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.stats["reads"] += 1
+        start = max(1, int(start_line))
+        end = len(lines) if end_line is None else min(len(lines), int(end_line))
+        if start > end:
+            return f"⚠️ Aralık boş: {handle} toplam {len(lines)} satır"
+        numbered = "\n".join(f"{number}: {lines[number - 1]}" for number in range(start, end + 1))
+        return f"📄 {handle} satır {start}-{end} / {len(lines)}:\n{numbered}"
+
+    def files(self, handles) -> Dict[str, str]:
+        """handle -> mutlak dosya yolu (scratchpad için)"""
+        return {handle: os.path.abspath(self.path(handle)) for handle in handles}
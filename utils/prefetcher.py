@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+⚡ PREFETCHER - Görev Kelimelerinden Okuma Aracı Tahmini
+Görev metnindeki anahtar kelimelere göre modelin ilk adımlarda hangi okuma
+araçlarını isteyeceğini tahmin eder. İstatistikler her görevden sonra güncellenir
+ve isteğe bağlı olarak JSON dosyasında saklanır.
+"""
+
+import os
+import re
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.tool_cache import normalize_tool_input
+
+# Başlangıç bilgisi (sıfır görevde bile işe yarasın): kelime -> olası çağrılar
+_PRIOR_CALLS = {
+    "list_files_recursive": ["dosya", "klasör", "dizin", "listele", "proje", "yapı", "file", "files", "folder", "list"],
+    "get_git_status": ["git", "commit", "branch", "değişiklik", "durum", "status", "repo"],
+}
+_PRIOR_WEIGHT = 1.0
+_WORD = re.compile(r"[a-zA-ZçğıöşüÇĞİÖŞÜ_]{3,}")
+
+
+def task_keywords(user_task: str) -> List[str]:
+    """Görev metnindeki (tekil) anahtar kelimeler"""
+    return sorted({word.lower() for word in _WORD.findall(user_task or "")})
+
+
+class ToolPredictor:
+    """Anahtar kelime -> (araç, girdi) frekans tablosu"""
+
+    def __init__(self, stats_path: Optional[str] = None, min_score: float = 0.5, max_predictions: int = 2):
+        self.stats_path = stats_path
+        self.min_score = min_score
+        self.max_predictions = max_predictions
+        self._lock = threading.Lock()
+        self._keyword_tasks: Dict[str, int] = {}
+        self._keyword_calls: Dict[str, Dict[str, int]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return
+        try:
+            with open(self.stats_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._keyword_tasks = data.get("keyword_tasks", {})
+            self._keyword_calls = data.get("keyword_calls", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ön-yükleme istatistikleri okunamadı: {e}")
+
+    def _save(self):
+        if not self.stats_path:
+            return
+        os.makedirs(os.path.dirname(self.stats_path) or ".", exist_ok=True)
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"keyword_tasks": self._keyword_tasks, "keyword_calls": self._keyword_calls},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.stats_path)
+
+    @staticmethod
+    def _call_key(tool_name: str, tool_input: Any) -> str:
+        return json.dumps({"tool": tool_name, "tool_input": json.loads(normalize_tool_input(tool_input))},
+                          ensure_ascii=False, sort_keys=True)
+
+    def predict(self, user_task: str) -> List[Tuple[str, Any]]:
+        """En olası (araç, girdi) çağrıları - skor = kelimelerde görülme oranı toplamı"""
+        keywords = task_keywords(user_task)
+        scores: Dict[str, float] = {}
+
+        for tool_name, words in _PRIOR_CALLS.items():
+            # Türkçe ekler için önek eşleşmesi: "klasöründeki" -> "klasör"
+            hits = sum(1 for word in keywords if any(word.startswith(prior) for prior in words))
+            if hits:
+                key = self._call_key(tool_name, {"directory_path": "."})
+                scores[key] = scores.get(key, 0.0) + hits * _PRIOR_WEIGHT
+
+        with self._lock:
+            for word in keywords:
+                seen = self._keyword_tasks.get(word, 0)
+                if not seen:
+                    continue
+                for key, count in self._keyword_calls.get(word, {}).items():
+                    scores[key] = scores.get(key, 0.0) + count / seen
+
+        ranked = sorted((item for item in scores.items() if item[1] >= self.min_score),
+                        key=lambda item: -item[1])[:self.max_predictions]
+        predictions = []
+        for key, _ in ranked:
+            call = json.loads(key)
+            tool_input = {k: v for k, v in call["tool_input"].items() if k != "_"} or call["tool_input"].get("_", {})
+            predictions.append((call["tool"], tool_input))
+        return predictions
+
+    def learn(self, user_task: str, calls: List[Tuple[str, Any]]):
+        """Görevde gerçekten istenen okuma çağrılarıyla istatistikleri güncelle"""
+        keywords = task_keywords(user_task)
+        unique_calls = {self._call_key(tool_name, tool_input) for tool_name, tool_input in calls}
+        with self._lock:
+            for word in keywords:
+                self._keyword_tasks[word] = self._keyword_tasks.get(word, 0) + 1
+                word_calls = self._keyword_calls.setdefault(word, {})
+                for key in unique_calls:
+                    word_calls[key] = word_calls.get(key, 0) + 1
+            try:
+                self._save()
+            except OSError as e:
+                print(f"⚠️ Ön-yükleme istatistikleri kaydedilemedi: {e}")
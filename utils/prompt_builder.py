@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+🧩 PROMPT BUILDER - Araç Farkındalıklı Sistem Prompt'u Derleme
+Sistem prompt'u bölümlerden kurulur; her bölüm hangi araç(lar)a ve hangi moda
+(metin-JSON / yerel function-calling) ait olduğunu bilir. Sadece etkin araçların
+bölümleri eklenir, token sayısı yerel tahminle ölçülür ve ajan başına bütçe aşılırsa
+en düşük öncelikli isteğe bağlı bölümler (örnekler) çıkarılır.
+
+Sabit önek: bölümler her zaman tanım sırasıyla birleştirilir ve aynı (mod, araç kümesi,
+bütçe) için sonuç önbellekten aynı string olarak döner - sağlayıcı tarafı prompt
+önbelleği (prefix caching) istekler ve görevler arasında yeniden kullanabilir.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from utils.history_manager import estimate_tokens
+
+MODES = ("text", "native")
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """
+    name: rapor için bölüm adı
+    tools: bölüm bu araçlardan en az biri etkinse eklenir (boş: her zaman)
+    all_tools: bölüm bu araçların hepsi etkinse eklenir (örnekler birden fazla araç kullanır)
+    min_tools: bölüm için gereken etkin araç sayısı (tools içinden) - ör. çoklu eylem için 2
+    priority: None ise zorunlu; sayı ise bütçe aşımında küçükten büyüğe çıkarılır
+    """
+    name: str
+    text: str
+    modes: Tuple[str, ...] = MODES
+    tools: FrozenSet[str] = frozenset()
+    all_tools: FrozenSet[str] = frozenset()
+    min_tools: int = 1
+    priority: Optional[int] = None
+
+    def applies(self, mode: str, enabled: FrozenSet[str]) -> bool:
+        if mode not in self.modes:
+            return False
+        if self.tools and len(self.tools & enabled) < self.min_tools:
+            return False
+        return self.all_tools <= enabled
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class BuiltPrompt:
+    text: str
+    tokens: int
+    budget: Optional[int]
+    sections: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.tokens > self.budget
+
+    def summary_line(self) -> str:
+        budget = f"/{self.budget}" if self.budget else ""
+        dropped = f", bütçe için çıkarılan: {', '.join(self.dropped)}" if self.dropped else ""
+        warning = " ⚠️ zorunlu bölümler bütçeyi aşıyor" if self.over_budget else ""
+        return f"🧩 Sistem prompt'u: {self.tokens}{budget} token, {len(self.sections)} bölüm{dropped}{warning}"
+
+
+class SystemPromptBuilder:
+    """Bölüm listesinden (mod, etkin araçlar, bütçe) için sistem prompt'u derler - sonuçlar önbelleklenir"""
+
+    def __init__(self, sections: Iterable[PromptSection], all_tools: Iterable[str]):
+        self.sections = list(sections)
+        self.all_tools = frozenset(all_tools)
+        self._cache: Dict[Tuple, BuiltPrompt] = {}
+        self._lock = threading.Lock()
+
+    def build(self, mode: str = "text", enabled_tools: Optional[Iterable[str]] = None,
+              budget: Optional[int] = None) -> BuiltPrompt:
+        """enabled_tools=None: tüm araçlar. budget=None: sınırsız"""
+        if mode not in MODES:
+            raise ValueError(f"Geçersiz prompt modu: {mode} (seçenekler: {', '.join(MODES)})")
+        enabled = self.all_tools if enabled_tools is None else frozenset(enabled_tools)
+        unknown = enabled - self.all_tools
+        if unknown:
+            raise ValueError(f"Bilinmeyen araç(lar): {', '.join(sorted(unknown))}")
+        key = (mode, enabled, budget)
+        with self._lock:
+            built = self._cache.get(key)
+        if built is not None:
+            return built
+
+        chosen = [section for section in self.sections if section.applies(mode, enabled)]
+        tokens = estimate_tokens("".join(section.text for section in chosen))
+        dropped = []
+        if budget is not None and tokens > budget:
+            # İsteğe bağlı bölümler öncelik sırasıyla (eşitlikte sondan) çıkarılır - kalanların sırası değişmez
+            optional = sorted((s for s in chosen if s.priority is not None),
+                              key=lambda s: (s.priority, -chosen.index(s)))
+            for section in optional:
+                if tokens <= budget:
+                    break
+                chosen.remove(section)
+                dropped.append(section.name)
+                tokens = estimate_tokens("".join(s.text for s in chosen))
+
+        text = "".join(section.text for section in chosen)
+        built = BuiltPrompt(text, estimate_tokens(text), budget, [s.name for s in chosen], dropped)
+        with self._lock:
+            self._cache[key] = built
+        return built
+
+    def report(self, mode: str = "text") -> Dict[str, int]:
+        """Bölüm başına token (bu modda) - prompt'un nereye harcandığını görmek için"""
+        return {section.name: section.tokens for section in self.sections if mode in section.modes}
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+🔥 PYTHON WORKER - Sıcak (warm) Python Yürütme Süreci
+execute_local_python için uzun ömürlü alt süreç: scratchpad bellekte tutulur,
+her adımda sadece kod + scratchpad farkı (delta) pipe üzerinden gönderilir.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import threading
+import subprocess
+from contextlib import ExitStack
+from typing import Dict, Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from utils.deadline import Deadline
+
+
+class PersistentPythonWorker:
+    """ReAct oturumu boyunca yaşayan tek bir Python alt süreci"""
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Worker'a en son gönderilen scratchpad değerlerinin JSON hali (delta hesabı için)
+        self._synced: Dict[str, str] = {}
+        self.stats = {"runs": 0, "restarts": 0, "timeouts": 0, "last_duration_ms": 0.0}
+
+    def _start(self):
+        """Worker sürecini başlat ve stdout okuyucu thread'ini kur"""
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._responses = queue.Queue()
+        self._synced = {}
+
+        def _reader(stream, responses):
+            for line in stream:
+                responses.put(line)
+            responses.put(None)  # EOF - süreç öldü
+
+        threading.Thread(target=_reader, args=(self.process.stdout, self._responses), daemon=True).start()
+
+    def _kill(self):
+        """Takılan veya ölen worker'ı temizle - bir sonraki çağrıda yeniden doğar"""
+        if self.process is not None:
+            try:
+                self.process.kill()
+                self.process.wait(timeout=2)
+            except Exception:
+                pass
+        self.process = None
+        self._synced = {}
+
+    def interrupt(self, process: Optional[subprocess.Popen] = None):
+        """Çalışan kodu dışarıdan durdur (görev iptali) - kilit beklemez, execute() hata döndürür"""
+        process = process or self.process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def _scratchpad_delta(self, scratchpad: dict) -> tuple:
+        """Son senkronizasyondan bu yana değişen ve silinen anahtarları bul"""
+        changed = {}
+        serialized = {}
+        for key, value in scratchpad.items():
+            encoded = json.dumps(value, ensure_ascii=False, default=str)
+            serialized[key] = encoded
+            if self._synced.get(key) != encoded:
+                changed[key] = json.loads(encoded)
+        deleted = [key for key in self._synced if key not in scratchpad]
+        return changed, deleted, serialized
+
+    def execute(self, code: str, scratchpad: dict, timeout: Optional[float] = None,
+                deadline: Optional["Deadline"] = None) -> Dict[str, Any]:
+        """
+        Kodu sıcak worker'da çalıştırır.
+
+        deadline verilirse bütçe kontrolü ve iptal kaydı kilit alındıktan sonra yapılır: worker
+        paylaşılır, kilidi bekleyen bir görevin iptali başka görevin çalışan kodunu öldürmemeli.
+        Bütçe kilit beklenirken bittiyse veya görev iptal edildiyse ToolCancelled fırlar.
+
+        Returns:
+            {"status": "success" | "error" | "timeout", "output": str, "error": str, "duration_ms": float}
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        with self._lock, ExitStack() as cancel_scope:
+            if deadline is not None:
+                timeout = deadline.timeout_for(timeout)
+            if self.process is None or self.process.poll() is not None:
+                if self.process is not None:
+                    self.stats["restarts"] += 1
+                self._kill()
+                self._start()
+            if deadline is not None:
+                # Bu çağrının sürecine bağlı - iptal geç tetiklense de sonraki çağrının worker'ına dokunmaz
+                process = self.process
+                cancel_scope.enter_context(deadline.on_cancel(lambda: self.interrupt(process)))
+
+            changed, deleted, serialized = self._scratchpad_delta(scratchpad)
+            request = {"code": code, "set": changed, "delete": deleted, "cwd": os.getcwd()}
+
+            start = time.perf_counter()
+            try:
+                self.process.stdin.write(json.dumps(request, ensure_ascii=False) + "\n")
+                self.process.stdin.flush()
+                line = self._responses.get(timeout=timeout)
+            except queue.Empty:
+                line = "timeout"
+            except (BrokenPipeError, OSError) as e:
+                line = None
+                self._kill()
+                return {"status": "error", "output": "", "error": f"Worker pipe hatası: {e}",
+                        "duration_ms": (time.perf_counter() - start) * 1000}
+
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.stats["runs"] += 1
+            self.stats["last_duration_ms"] = duration_ms
+
+            if line == "timeout":
+                # Takılan worker'ı öldür - scratchpad bir sonraki çağrıda tamamen yeniden gönderilir
+                self.stats["timeouts"] += 1
+                self.stats["restarts"] += 1
+                self._kill()
+                return {"status": "timeout", "output": "", "error": f"Kod {timeout:g} saniyede tamamlanamadı",
+                        "duration_ms": duration_ms}
+
+            if line is None:
+                # Kullanıcı kodu süreci sonlandırdı (örn. os._exit)
+                self._kill()
+                return {"status": "error", "output": "", "error": "Worker süreci beklenmedik şekilde sonlandı",
+                        "duration_ms": duration_ms}
+
+            try:
+                response = json.loads(line)
+            except ValueError:
+                # Protokol akışı bozuldu - sonraki cevaplar kayar, worker'ı yeniden doğur
+                self.stats["restarts"] += 1
+                self._kill()
+                return {"status": "error", "output": "",
+                        "error": f"Worker protokol hatası (beklenmeyen çıktı: {line[:200]!r}) - worker yeniden başlatılacak",
+                        "duration_ms": duration_ms}
+            self._synced = serialized
+            response["duration_ms"] = duration_ms
+            return response
+
+    def close(self):
+        """Worker sürecini kapat"""
+        with self._lock:
+            if self.process is not None and self.process.poll() is None:
+                try:
+                    self.process.stdin.close()
+                    self.process.wait(timeout=2)
+                except Exception:
+                    pass
+            self._kill()
+
+
+def _worker_main():
+    """Alt süreç tarafı: stdin'den istek oku, kodu çalıştır, stdout'a JSON cevap yaz"""
+    import io
+    import copy
+    import tempfile
+    import traceback
+    from contextlib import redirect_stdout, redirect_stderr
+
+    protocol_in = sys.stdin
+    # Cevaplar fd 1'in özel bir kopyasından gider; fd 1 ise bir yakalama dosyasına bağlanır -
+    # alt süreçlerin (os.system) ve C uzantılarının çıktısı protokol akışına karışmaz, çıktıya eklenir
+    protocol_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    fd_capture = tempfile.TemporaryFile()
+    sys.stdout.flush()
+    os.dup2(fd_capture.fileno(), 1)
+    # Kullanıcı kodu input() çağırırsa protokol satırlarını yutmasın
+    sys.stdin = io.StringIO("")
+
+    def read_fd_output() -> str:
+        os.lseek(fd_capture.fileno(), 0, os.SEEK_SET)
+        chunks = []
+        while True:
+            chunk = os.read(fd_capture.fileno(), 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        os.lseek(fd_capture.fileno(), 0, os.SEEK_SET)
+        os.ftruncate(fd_capture.fileno(), 0)
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    scratchpad: Dict[str, Any] = {}
+
+    for line in protocol_in:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        scratchpad.update(request.get("set", {}))
+        for key in request.get("delete", []):
+            scratchpad.pop(key, None)
+
+        try:
+            os.chdir(request.get("cwd") or os.getcwd())
+        except OSError:
+            pass
+
+        # Kullanıcı kodu ana scratchpad'i bozmasın - eski subprocess davranışı gibi kopya ver
+        namespace = {"__name__": "__main__", "json": json, "os": os, "scratchpad": copy.deepcopy(scratchpad)}
+        captured = io.StringIO()
+        captured_err = io.StringIO()
+        try:
+            with redirect_stdout(captured), redirect_stderr(captured_err):
+                exec(compile(request.get("code", ""), "<execute_local_python>", "exec"), namespace)
+            response = {"status": "success", "output": captured.getvalue(), "error": captured_err.getvalue()}
+        except BaseException:
+            response = {"status": "error", "output": captured.getvalue(), "error": traceback.format_exc()}
+        response["output"] += read_fd_output()
+
+        protocol_out.write(json.dumps(response, ensure_ascii=False) + "\n")
+        protocol_out.flush()
+
+
+if __name__ == "__main__":
+    _worker_main()
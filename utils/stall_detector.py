@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+🔁 STALL DETECTOR - Tekrarlanan / Döngüye Giren ReAct Adımları
+Her adımın (araç, girdi, gözlem) parmak izini çıkarır; aynı adımın tekrarını
+veya iki adım arasında gidip gelmeyi (A-B-A-B) yakalar. İlk tespitte düzeltici
+gözlem önerir, devam ederse görevin erken bitirilmesini ister.
+"""
+
+import re
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from utils.tool_cache import normalize_tool_input
+
+# Değişken ama anlamsız kısımlar: süreler, sayaçlar, zaman damgaları
+_NUMBERS = re.compile(r"\d+(?:[.,]\d+)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize_observation(observation: str, tool_input: Any = None, limit: int = 2000) -> str:
+    """"⏱️ Süre: 12 ms" ile "⏱️ Süre: 15 ms" aynı gözlem sayılsın; gözlemde yankılanan girdi ("./src" / "src") silinir"""
+    text = observation or ""
+    values = tool_input.values() if isinstance(tool_input, dict) else [tool_input]
+    for value in values:
+        if isinstance(value, str) and value.strip():
+            text = text.replace(value, "<girdi>")
+    text = _NUMBERS.sub("#", text)
+    return _WHITESPACE.sub(" ", text).strip()[:limit]
+
+
+def step_fingerprint(actions: List[Dict[str, Any]], observations: List[str]) -> str:
+    """Bir adımdaki tüm (araç, normalize girdi, normalize gözlem) üçlülerinin özeti"""
+    parts = []
+    for action, observation in zip(actions, observations):
+        parts.append("|".join([str(action.get("tool")),
+                               normalize_tool_input(action.get("tool_input", {})),
+                               _normalize_observation(observation, action.get("tool_input"))]))
+    return hashlib.sha1("\n".join(sorted(parts)).encode("utf-8")).hexdigest()
+
+
+class StallDetector:
+    """Görev başına tekrar dedektörü - "warn" sonrası tekrar "stop" döner"""
+
+    def __init__(self, max_iterations: int = 10, window: int = 6):
+        self.max_iterations = max_iterations
+        self.window = window
+        self._history: List[str] = []
+        self._warned = False
+        self.stats = {"repeats": 0, "cycles": 0, "warnings": 0, "early_stops": 0, "iterations_saved": 0}
+
+    def _kind(self, fingerprint: str) -> Optional[str]:
+        recent = self._history[-self.window:]
+        if recent and recent[-1] == fingerprint:
+            return "repeat"
+        # A-B-A-B: son üç adım + bu adım iki periyotlu döngü
+        if len(recent) >= 3 and recent[-2] == fingerprint and recent[-3] == recent[-1] and recent[-1] != fingerprint:
+            return "cycle"
+        if fingerprint in recent:
+            return "repeat"
+        return None
+
+    def check(self, actions: List[Dict[str, Any]], observations: List[str], iteration: int) -> Optional[str]:
+        """
+        Tamamlanan adımı değerlendir.
+
+        Returns:
+            None (sorun yok), "warn" (düzeltici gözlem ekle) veya "stop" (erken bitir)
+        """
+        if not actions:
+            return None
+        fingerprint = step_fingerprint(actions, observations)
+        kind = self._kind(fingerprint)
+        self._history.append(fingerprint)
+        if kind is None:
+            return None
+
+        self.stats["repeats" if kind == "repeat" else "cycles"] += 1
+        if not self._warned:
+            self._warned = True
+            self.stats["warnings"] += 1
+            return "warn"
+
+        self.stats["early_stops"] += 1
+        self.stats["iterations_saved"] += max(0, self.max_iterations - iteration)
+        return "stop"
+
+    @staticmethod
+    def corrective_message(actions: List[Dict[str, Any]]) -> str:
+        """LLM'e gidecek düzeltici gözlem metni"""
+        tools = ", ".join(str(a.get("tool")) for a in actions)
+        return ("⚠️ TEKRAR TESPİT EDİLDİ: Az önce yaptığın adımı ({}) aynı girdiyle tekrarladın ve aynı "
+                "gözlemi aldın. Bu bilgi zaten hafızada (scratchpad). Aynı aracı tekrar çağırma; "
+                "farklı bir adım at veya elindeki bilgilerle final_answer ver.").format(tools)
+
+    def report(self) -> str:
+        s = self.stats
+        return (f"🔁 Tekrar dedektörü: {s['repeats']} tekrar, {s['cycles']} döngü, "
+                f"{s['warnings']} uyarı, {s['early_stops']} erken bitiş "
+                f"(~{s['iterations_saved']} iterasyon tasarruf)")
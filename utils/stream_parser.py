@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+🌊 STREAM PARSER - Akan LLM Cevabında Erken Eylem Tespiti
+Token akışını parça parça okur; Thought metnini canlı gösterilebilir hale getirir
+ve satır başındaki "Action:" sonrasındaki JSON nesnesi/listesi kapanıp parse edildiği anda
+tamamlandı der. Başlıktan sonra JSON (veya ```json bloğu) gelmiyorsa ya da kapanan değer
+parse edilemiyorsa başlık düşünce metni sayılır ve arama devam eder.
+"""
+
+import re
+import json
+from typing import Optional
+
+# Satır başındaki "Action:" / "Eylem:" başlığı - düşünce metni bu noktaya kadar canlı basılır
+# (büyük/küçük harf duyarlı: "Sonraki eylem: ..." gibi düşünce cümleleri başlık sayılmaz)
+_ACTION_HEADER = re.compile(r'^\s*(?:Action|Eylem)\s*:', re.MULTILINE)
+# Başlıktan sonra JSON'un başladığı yer: doğrudan { / [ veya ```json bloğu içinde
+_JSON_OPENING = re.compile(r'\s*(?:```(?:json)?\s*)?[\[{]')
+# Henüz kararsız önek: boşluk veya yarım ```json açılışı - sonraki parçayı bekle
+_PARTIAL_OPENING = re.compile(r'\s*(?:`{1,3}(?:j(?:s(?:o(?:n)?)?)?)?\s*)?')
+# Başlık parça sınırında bölünebilir; bu kadar karakter basılmadan bekletilir
+_HOLD_BACK = len("Action:") + 1
+
+
+def _is_action(candidate: str) -> bool:
+    """Kapanan değer eylem mi: JSON nesnesi veya nesne listesi (kod içeren string'lerde ham satır sonuna izin)"""
+    try:
+        value = json.loads(candidate, strict=False)
+    except ValueError:
+        return False
+    if isinstance(value, list):
+        return bool(value) and all(isinstance(item, dict) for item in value)
+    return isinstance(value, dict)
+
+
+class StreamingActionParser:
+    """ReAct metin formatı için artımlı ayrıştırıcı - JSON dengesi string/escape farkındalıklı"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.complete = False
+        self._shown = 0                         # buffer'da canlı gösterilen son index
+        self._action_start: Optional[int] = None
+        self._search_pos = 0                    # reddedilen başlıklardan sonra aramanın başladığı yer
+        self._json_start: Optional[int] = None
+        self._action_end: Optional[int] = None
+        self._scan_pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Yeni parçayı ekle.
+
+        Returns:
+            Canlı gösterilecek yeni düşünce metni (Action başlığından öncesi)
+        """
+        if self.complete or not chunk:
+            return ""
+        self.buffer += chunk
+
+        while not self.complete:
+            if self._action_start is None:
+                match = _ACTION_HEADER.search(self.buffer, max(self._search_pos, self._shown - _HOLD_BACK))
+                if not match:
+                    break
+                self._action_start = match.start()
+                self._scan_pos = match.end()
+            if self._scan():
+                break
+            self._reject()
+
+        limit = self._action_start if self._action_start is not None else len(self.buffer) - _HOLD_BACK
+        visible = ""
+        if limit > self._shown:
+            visible = self.buffer[self._shown:limit]
+            self._shown = limit
+
+        return visible
+
+    def _reject(self):
+        """Başlıktan sonra geçerli eylem JSON'u yok - başlık düşünce metnidir, sonrasından aramaya devam"""
+        self._search_pos = self._scan_pos
+        self._action_start = self._json_start = None
+        self._depth = 0
+        self._in_string = self._escape = False
+
+    def _scan(self) -> bool:
+        """
+        Action başlığından sonraki JSON değerinin kapanışını ara.
+
+        Returns:
+            False: başlıktan sonra JSON yok veya kapanan değer eylem olarak parse edilemedi (reddet)
+        """
+        text = self.buffer
+        if self._json_start is None:
+            match = _JSON_OPENING.match(text, self._scan_pos)
+            if not match:
+                # Yarım açılış (ör. "``" veya sadece boşluk) tampon sonundaysa bekle, değilse reddet
+                return _PARTIAL_OPENING.match(text, self._scan_pos).end() == len(text)
+            self._json_start = match.end() - 1
+            self._depth = 1
+            self._scan_pos = match.end()
+        i = self._scan_pos
+        while i < len(text):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._scan_pos = i + 1
+                    if not _is_action(text[self._json_start:i + 1]):
+                        return False
+                    self._action_end = i + 1
+                    self.complete = True
+                    return True
+            i += 1
+        self._scan_pos = i
+        return True
+
+    def result_text(self) -> str:
+        """parse_llm_response'a verilecek metin - eylem kapanışında kesilmiş, açık ```json bloğu kapatılmış"""
+        if not self.complete:
+            return self.buffer
+        text = self.buffer[:self._action_end]
+        if "```" in self.buffer[self._action_start:self._json_start]:
+            text += "\n```"
+        return text
+
+    @property
+    def thought_text(self) -> str:
+        """Şimdiye kadar görülen düşünce kısmı"""
+        end = self._action_start if self._action_start is not None else len(self.buffer)
+        return self.buffer[:end]
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+🧪 STUB LLM SERVER - Çevrimdışı Benchmark için Yerel OpenAI Uyumlu Sunucu
+/v1/chat/completions (OpenAI) ve /openai/v1/chat/completions (Groq SDK) uçlarını
+taklit eder; senaryo dosyasındaki veya kaydedilmiş cevapları sırayla döndürür.
+Gecikme, token/sn hızı ve hata enjeksiyonu (429, 503, zaman aşımı) ayarlanabilir.
+
+LLM_STUB_URL ortam değişkeni tanımlıysa istemci havuzu (utils/llm_registry) tüm
+sağlayıcıları bu sunucuya bağlar: ReactAgent, TerminalAgent ve test sistemleri
+API anahtarı ve ağ olmadan uçtan uca çalışır.
+
+Kullanım:
+    python -m utils.stub_llm_server --port 8089 --script senaryo.jsonl --latency 0.3 --tps 80
+    LLM_STUB_URL=http://127.0.0.1:8089 python core_agent_react.py
+
+Senaryo satırı (JSONL veya JSON liste):
+    {"content": "..."}                                   sıradaki cevap
+    {"tool_calls": [{"name": "araç", "arguments": {...}}]} native function-calling cevabı
+    {"match": "metin", "content": "..."}                 son kullanıcı mesajı metni içeriyorsa (tekrar kullanılır)
+    {"error": 429 | 503 | "timeout"}                     o istekte hata
+    {"response": {...}}                                  kaydedilmiş tam chat.completion gövdesi
+    {"latency": 1.5, ...}                                bu cevap için ilk token gecikmesi
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.history_manager import estimate_tokens
+
+STUB_URL_ENV = "LLM_STUB_URL"
+STUB_API_KEY = "stub-key"
+# Senaryo bitince: ReAct metin modunda görevi kapatan cevap
+DEFAULT_CONTENT = ('Thought: Stub sunucu cevabı\n'
+                   'Action: {"tool": "final_answer", "tool_input": {"answer": "stub cevap"}}')
+
+
+def stub_url() -> Optional[str]:
+    """Aktif stub sunucu adresi (LLM_STUB_URL) - tanımlı değilse None"""
+    url = os.getenv(STUB_URL_ENV, "").strip()
+    return url.rstrip("/") or None
+
+
+def load_script(path: Optional[str]) -> List[Dict[str, Any]]:
+    """Senaryo dosyası: JSONL (satır başına bir cevap) veya JSON liste"""
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+class StubBehaviour:
+    """Sunucunun cevap seçimi, gecikme ve hata enjeksiyonu ayarları (thread-safe)"""
+
+    def __init__(self, script: Optional[List[Dict[str, Any]]] = None, latency: float = 0.0,
+                 tokens_per_second: float = 0.0, error_429: float = 0.0, error_503: float = 0.0,
+                 timeout_rate: float = 0.0, hang_seconds: float = 30.0, default_content: str = DEFAULT_CONTENT,
+                 seed: Optional[int] = None):
+        script = list(script or [])
+        self.rules = [item for item in script if "match" in item]
+        self.queue = [item for item in script if "match" not in item]
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_429 = error_429
+        self.error_503 = error_503
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.default_content = default_content
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "streamed": 0, "errors_429": 0, "errors_503": 0, "timeouts": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0, "started_at": time.time()}
+
+    def next_item(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bu istek için senaryo öğesi: eşleşen kural > sıradaki öğe > rastgele hata > varsayılan"""
+        last_user = next((str(m.get("content", "")) for m in reversed(messages) if m.get("role") == "user"), "")
+        with self._lock:
+            self.stats["requests"] += 1
+            for rule in self.rules:
+                if rule["match"] in last_user:
+                    return rule
+            if self.queue:
+                return self.queue.pop(0)
+            roll = self._random.random()
+            if roll < self.error_429:
+                return {"error": 429}
+            if roll < self.error_429 + self.error_503:
+                return {"error": 503}
+            if roll < self.error_429 + self.error_503 + self.timeout_rate:
+                return {"error": "timeout"}
+            return {"content": self.default_content}
+
+    def count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        elapsed = max(time.time() - stats.pop("started_at"), 1e-9)
+        stats["requests_per_second"] = round(stats["requests"] / elapsed, 3)
+        stats["completion_tokens_per_second"] = round(stats["completion_tokens"] / elapsed, 3)
+        return stats
+
+
+def _prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(estimate_tokens(m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content")))
+               + 4 for m in messages)
+
+
+def _tool_calls(item: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Senaryodaki {"name", "arguments"} listesini OpenAI tool_calls biçimine çevir"""
+    if not item.get("tool_calls"):
+        return None
+    calls = []
+    for call in item["tool_calls"]:
+        arguments = call.get("arguments", {})
+        calls.append({"id": call.get("id") or f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                      "function": {"name": call["name"],
+                                   "arguments": arguments if isinstance(arguments, str) else json.dumps(arguments)}})
+    return calls
+
+
+def _chunks(text: str, size: int = 16) -> List[str]:
+    """Akış parçaları (~4 token) - gerçek sağlayıcı gibi küçük delta'lar"""
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: istemcilerin bağlantı havuzu gerçekten kullanılır
+    behaviour: StubBehaviour = None
+
+    def log_message(self, format, *args):
+        pass  # benchmark çıktısını kirletmesin
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+        elif self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.behaviour.report())
+        else:
+            self._send_json(404, {"error": {"message": f"Bilinmeyen uç: {self.path}"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Bilinmeyen uç: {self.path}"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        messages = request.get("messages", [])
+        behaviour = self.behaviour
+        item = behaviour.next_item(messages)
+
+        time.sleep(item.get("latency", behaviour.latency))
+        error = item.get("error")
+        if error == "timeout":
+            behaviour.count("timeouts")
+            time.sleep(item.get("hang_seconds", behaviour.hang_seconds))
+            self.close_connection = True
+            return
+        if error == 429:
+            behaviour.count("errors_429")
+            retry_after = item.get("retry_after", 1)
+            self._send_json(429, {"error": {"message": f"Rate limit reached. Please try again in {retry_after}s.",
+                                            "type": "rate_limit_exceeded", "code": "rate_limit_exceeded"}},
+                            {"retry-after": str(retry_after)})
+            return
+        if error is not None:
+            behaviour.count("errors_503")
+            self._send_json(int(error), {"error": {"message": "Service unavailable (stub)", "type": "server_error"}})
+            return
+
+        model = request.get("model") or "stub-model"
+        if "response" in item:
+            # Kaydedilmiş cevap aynen döner (akış istenirse içerik tek parça yollanır)
+            body = item["response"]
+            message = body["choices"][0]["message"]
+            content, tool_calls = message.get("content") or "", message.get("tool_calls")
+        else:
+            body = None
+            content, tool_calls = item.get("content", "" if item.get("tool_calls") else behaviour.default_content), \
+                _tool_calls(item)
+
+        prompt_tokens = _prompt_tokens(messages)
+        completion_tokens = estimate_tokens(content) + sum(estimate_tokens(c["function"]["arguments"])
+                                                           for c in tool_calls or [])
+        behaviour.count("prompt_tokens", prompt_tokens)
+        behaviour.count("completion_tokens", completion_tokens)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        tps = item.get("tokens_per_second", behaviour.tokens_per_second)
+
+        if request.get("stream"):
+            behaviour.count("streamed")
+            self._stream(completion_id, model, content, tool_calls, usage, tps)
+            return
+
+        if tps:
+            time.sleep(completion_tokens / tps)
+        if body is None:
+            message = {"role": "assistant", "content": content}
+            if tool_calls:
+                message.update(content=content or None, tool_calls=tool_calls)
+            body = {"id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "message": message,
+                                 "finish_reason": "tool_calls" if tool_calls else "stop"}],
+                    "usage": usage}
+        self._send_json(200, body)
+
+    def _write_chunk(self, data: Dict[str, Any]):
+        payload = f"data: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+        self.wfile.write(f"{len(payload):X}\r\n".encode() + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, completion_id: str, model: str, content: str, tool_calls, usage, tps: float):
+        """SSE akışı (chunked) - parçalar tps hızında gelir"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+        pieces = _chunks(content)
+        delay = (usage["completion_tokens"] / tps) / len(pieces) if tps else 0
+        for index, piece in enumerate(pieces):
+            delta = {"role": "assistant", "content": piece} if index == 0 else {"content": piece}
+            self._write_chunk({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            if delay:
+                time.sleep(delay)
+        if tool_calls:
+            deltas = [{"index": i, **call} for i, call in enumerate(tool_calls)]
+            self._write_chunk({**base, "choices": [{"index": 0, "delta": {"tool_calls": deltas},
+                                                    "finish_reason": None}]})
+        self._write_chunk({**base, "choices": [{"index": 0, "delta": {},
+                                                "finish_reason": "tool_calls" if tool_calls else "stop"}],
+                           "usage": usage})
+        payload = b"data: [DONE]\n\n"
+        self.wfile.write(f"{len(payload):X}\r\n".encode() + payload + b"\r\n0\r\n\r\n")
+        self.wfile.flush()
+
+
+class StubLLMServer:
+    """Arka plan thread'inde çalışan stub sunucu - with bloğunda LLM_STUB_URL ayarlanır"""
+
+    def __init__(self, behaviour: Optional[StubBehaviour] = None, host: str = "127.0.0.1", port: int = 0):
+        self.behaviour = behaviour or StubBehaviour()
+        handler = type("StubHandler", (_StubHandler,), {"behaviour": self.behaviour})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._previous_env: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        self.start()
+        self._previous_env = os.environ.get(STUB_URL_ENV)
+        os.environ[STUB_URL_ENV] = self.url
+        return self
+
+    def __exit__(self, *exc):
+        if self._previous_env is None:
+            os.environ.pop(STUB_URL_ENV, None)
+        else:
+            os.environ[STUB_URL_ENV] = self._previous_env
+        self.stop()
+
+
+def add_behaviour_arguments(parser: argparse.ArgumentParser, prefix: str = ""):
+    """Stub davranış seçenekleri (sunucu CLI'ı ve batch_runner ortak kullanır)"""
+    parser.add_argument(f"--{prefix}latency", type=float, default=0.0, help="İlk token gecikmesi (sn)")
+    parser.add_argument(f"--{prefix}tps", type=float, default=0.0, help="Çıktı hızı token/sn (0: anında)")
+    parser.add_argument(f"--{prefix}error-429", type=float, default=0.0, help="429 hata oranı (0-1)")
+    parser.add_argument(f"--{prefix}error-503", type=float, default=0.0, help="503 hata oranı (0-1)")
+    parser.add_argument(f"--{prefix}timeout-rate", type=float, default=0.0, help="Cevapsız kalma oranı (0-1)")
+    parser.add_argument(f"--{prefix}seed", type=int, default=None, help="Hata enjeksiyonu için rastgele tohum")
+
+
+def behaviour_from_args(args: argparse.Namespace, script_path: Optional[str], prefix: str = "") -> StubBehaviour:
+    option = lambda name: getattr(args, prefix.replace("-", "_") + name)
+    return StubBehaviour(load_script(script_path), latency=option("latency"), tokens_per_second=option("tps"),
+                         error_429=option("error_429"), error_503=option("error_503"),
+                         timeout_rate=option("timeout_rate"), seed=option("seed"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çevrimdışı benchmark için OpenAI uyumlu stub LLM sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--script", default=None, help="Senaryo dosyası (JSONL / JSON liste)")
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+
+    server = StubLLMServer(behaviour_from_args(args, args.script), host=args.host, port=args.port)
+    print(f"🧪 Stub LLM sunucusu: {server.url}  (istatistik: {server.url}/stats)")
+    print(f"💡 Ajanları bağlamak için: export {STUB_URL_ENV}={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"📊 {json.dumps(server.behaviour.report(), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
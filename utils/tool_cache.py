@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+♻️ TOOL CACHE - Görev Başına Araç Sonucu Önbelleği
+Yan etkisiz okuma araçlarının sonuçlarını (araç adı + normalize girdi) anahtarıyla
+saklar. Dosya sistemini değiştirebilecek bir araç çalıştığında tamamen temizlenir.
+Spekülatif ön-yükleme (prefetch) sonuçları da burada Future olarak bekler.
+"""
+
+import os
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def normalize_tool_input(tool_input: Any) -> str:
+    """Araç girdisini kararlı bir anahtara çevir - "./src/" ve "src" aynı yolu gösterir"""
+    if isinstance(tool_input, str):
+        tool_input = {"_": tool_input}
+    if not isinstance(tool_input, dict):
+        return json.dumps(tool_input, ensure_ascii=False, sort_keys=True, default=str)
+
+    normalized = {}
+    for key, value in tool_input.items():
+        if isinstance(value, str) and (key.endswith("_path") or key in ("path", "directory", "_")):
+            value = os.path.normpath(value.strip() or ".")
+        normalized[key] = value
+    return json.dumps(normalized, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class ToolResultCache:
+    """Thread-safe memo tablosu - paralel okuma araçları aynı anda kullanabilir"""
+
+    def __init__(self):
+        self._entries: Dict[str, Any] = {}
+        self._pending: Dict[str, Future] = {}   # arka planda çalışan ön-yüklemeler
+        self._lock = threading.Lock()
+        self.requested: List[Tuple[str, Any]] = []  # görevde istenen (araç, girdi) çağrıları
+        self.stats: Dict[str, Any] = {"hits": 0, "misses": 0, "invalidations": 0, "per_tool": {},
+                                      "prefetched": 0, "prefetch_hits": 0, "prefetch_wasted": 0}
+
+    def _count(self, tool_name: str, field: str):
+        per_tool = self.stats["per_tool"].setdefault(tool_name, {"hits": 0, "misses": 0})
+        per_tool[field] += 1
+        self.stats[field] += 1
+
+    def get_or_compute(self, tool_name: str, tool_input: Any, compute: Callable[[], Any]) -> Any:
+        """Önbellekte varsa döndür (hit), yoksa hesapla ve sakla (miss)"""
+        key = f"{tool_name}:{normalize_tool_input(tool_input)}"
+        with self._lock:
+            self.requested.append((tool_name, tool_input))
+            if key in self._entries:
+                self._count(tool_name, "hits")
+                return self._entries[key]
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                self.stats["prefetch_hits"] += 1
+            else:
+                self._count(tool_name, "misses")
+            generation = self.stats["invalidations"]
+
+        # Ön-yükleme sürüyorsa baştan başlatmak yerine onu bekle
+        value = pending.result() if pending is not None else compute()
+
+        with self._lock:
+            # Hesaplama sırasında geçersiz kılındıysa eski sonucu saklama
+            if generation == self.stats["invalidations"]:
+                self._entries[key] = value
+        return value
+
+    def prefetch(self, tool_name: str, tool_input: Any, compute: Callable[[], Any], executor) -> bool:
+        """Sonucu henüz yoksa hesaplamayı executor'da başlat - model isteyince get_or_compute bekler"""
+        key = f"{tool_name}:{normalize_tool_input(tool_input)}"
+        with self._lock:
+            if key in self._entries or key in self._pending:
+                return False
+            self._pending[key] = executor.submit(compute)
+            self.stats["prefetched"] += 1
+            return True
+
+    def drop_pending(self):
+        """Kullanılmayan ön-yüklemeleri at (görev sonu veya geçersiz kılma)"""
+        with self._lock:
+            self._drop_pending_locked()
+
+    def _drop_pending_locked(self):
+        for future in self._pending.values():
+            future.cancel()
+        self.stats["prefetch_wasted"] += len(self._pending)
+        self._pending.clear()
+
+    def invalidate(self, reason: Optional[str] = None):
+        """Yazma/çalıştırma sonrası tüm kayıtları (ve bayat ön-yüklemeleri) at"""
+        with self._lock:
+            if self._entries or self._pending:
+                print(f"♻️ Araç önbelleği temizlendi ({reason or 'dosya sistemi değişmiş olabilir'})")
+            self._entries.clear()
+            self._drop_pending_locked()
+            self.stats["invalidations"] += 1
+
+    def report(self) -> str:
+        """Görev sonu hit/miss özeti"""
+        s = self.stats
+        total = s["hits"] + s["misses"]
+        ratio = (s["hits"] / total * 100) if total else 0.0
+        text = (f"♻️ Araç önbelleği: {s['hits']} hit / {s['misses']} miss "
+                f"(%{ratio:.1f}), {s['invalidations']} temizleme")
+        if s["prefetched"]:
+            hit_rate = s["prefetch_hits"] / s["prefetched"] * 100
+            text += (f" | ⚡ Ön-yükleme: {s['prefetched']} başlatıldı, {s['prefetch_hits']} kullanıldı "
+                     f"(%{hit_rate:.1f}), {s['prefetch_wasted']} atıldı")
+        return text
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+⏱️ TRACING - ReAct Adım Süre Ölçümü (Span)
+Her iterasyonun LLM çağrısı, ayrıştırma, araç çalıştırma (araç başına) ve hafıza
+refleksi sürelerini monotonik saatle ölçer. Görev raporu sözlük olarak döner,
+JSONL dosyasına eklenir; çok görevli p50/p95 özetleri stdout kazımadan çıkarılır.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_TRACE_PATH = os.path.join("logs", "react_traces.jsonl")
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Doğrusal ara değerli yüzdelik (p: 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def phase_stats(spans: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Faz başına adet, toplam, p50, p95 ve maksimum süre (ms)"""
+    durations: Dict[str, List[float]] = {}
+    for span in spans:
+        durations.setdefault(span["phase"], []).append(span["duration_ms"])
+    return {phase: {"count": len(values),
+                    "total_ms": round(sum(values), 3),
+                    "p50_ms": round(percentile(values, 50), 3),
+                    "p95_ms": round(percentile(values, 95), 3),
+                    "max_ms": round(max(values), 3)}
+            for phase, values in durations.items()}
+
+
+class TaskTrace:
+    """Tek görevin span listesi - paralel araç thread'lerinden güvenle yazılabilir"""
+
+    def __init__(self, task_id: Optional[str] = None, user_task: str = ""):
+        self.task_id = task_id
+        self.user_task = user_task
+        self.iteration = 0  # döngü her adımda günceller; span'ler bu adımla etiketlenir
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+
+    @contextmanager
+    def span(self, phase: str, name: Optional[str] = None):
+        """with trace.span("tool", "get_git_status"): ... - hata olsa da süre kaydedilir"""
+        iteration = self.iteration
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            record = {"iteration": iteration, "phase": phase,
+                      "start_ms": round((start - self._start) * 1000, 3),
+                      "duration_ms": round((end - start) * 1000, 3)}
+            if name:
+                record["name"] = name
+            with self._lock:
+                self.spans.append(record)
+
+    def finish(self):
+        if self._end is None:
+            self._end = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        """Görev raporu: toplam süre, faz istatistikleri, araç bazında istatistikler ve ham span'ler"""
+        end = self._end if self._end is not None else time.perf_counter()
+        with self._lock:
+            spans = list(self.spans)
+        tool_spans = [dict(span, phase=span["name"]) for span in spans if span["phase"] == "tool" and "name" in span]
+        return {"task_id": self.task_id,
+                "user_task": self.user_task,
+                "total_ms": round((end - self._start) * 1000, 3),
+                "iterations": self.iteration,
+                "phases": phase_stats(spans),
+                "tools": phase_stats(tool_spans),
+                "spans": spans}
+
+    def write_jsonl(self, path: str = DEFAULT_TRACE_PATH):
+        """Raporu JSONL dosyasına tek satır olarak ekle"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.report(), ensure_ascii=False) + "\n")
+
+    def summary_line(self) -> str:
+        report = self.report()
+        parts = [f"{phase} {stats['total_ms']:.0f}ms" for phase, stats in
+                 sorted(report["phases"].items(), key=lambda item: -item[1]["total_ms"])]
+        return f"⏱️ Süre dağılımı ({report['total_ms']:.0f} ms): " + ", ".join(parts)
+
+
+def maybe_span(trace: Optional[TaskTrace], phase: str, name: Optional[str] = None):
+    """trace None ise hiçbir şey ölçmeyen bağlam"""
+    return trace.span(phase, name) if trace is not None else nullcontext()
+
+
+def load_reports(path: str = DEFAULT_TRACE_PATH) -> List[Dict[str, Any]]:
+    """JSONL'deki görev raporlarını oku (bozuk satırları atla)"""
+    reports = []
+    if not os.path.exists(path):
+        return reports
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                reports.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return reports
+
+
+def summarize_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Çok görevli özet: faz ve araç başına p50/p95, görev süresi dağılımı"""
+    spans = [span for report in reports for span in report.get("spans", [])]
+    tool_spans = [dict(span, phase=span["name"]) for span in spans if span["phase"] == "tool" and "name" in span]
+    task_totals = [report.get("total_ms", 0.0) for report in reports]
+    return {"tasks": len(reports),
+            "task_p50_ms": round(percentile(task_totals, 50), 3),
+            "task_p95_ms": round(percentile(task_totals, 95), 3),
+            "phases": phase_stats(spans),
+            "tools": phase_stats(tool_spans)}
+
+
+if __name__ == "__main__":
+    # python utils/tracing.py [logs/react_traces.jsonl] - faz bazında p50/p95 tablosu
+    import sys
+
+    summary = summarize_reports(load_reports(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TRACE_PATH))
+    print(f"📊 {summary['tasks']} görev | görev p50 {summary['task_p50_ms']:.0f} ms, p95 {summary['task_p95_ms']:.0f} ms")
+    for title, table in (("Faz", summary["phases"]), ("Araç", summary["tools"])):
+        for name, stats in sorted(table.items()):
+            print(f"  {title:<5} {name:<24} n={stats['count']:<5} p50={stats['p50_ms']:>9.1f} ms  "
+                  f"p95={stats['p95_ms']:>9.1f} ms  toplam={stats['total_ms']:>10.1f} ms")